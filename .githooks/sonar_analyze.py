@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Run `sonar analyze` for a push, splitting large change sets across processes.
+
+Prints one analyze result (the JSON `sonar_gate.py` reads) on stdout. Pushes
+touching fewer than PARALLEL_MIN_FILES files run the single
+`sonar analyze --base REF --format json` call unchanged. Larger ones split the
+changed files into `--jobs` chunks of roughly equal total size (largest file
+first onto the lightest chunk) and analyse the chunks concurrently with the
+same `--base` call, limited to the chunk's paths, so a chunk reports what the
+single call would for those files. The results are merged: secrets and
+per-file issues are concatenated, failures are de-duplicated. Acknowledged
+secrets and infra-failure classification stay in `sonar_gate.py`.
+
+Whether the CLI honours the trailing `-- <paths>` is not documented, so the
+first chunk runs alone as a probe. The other chunks run only if the probe names
+at least one file and every file it names is in that chunk. A clean probe
+proves nothing either way. If the probe fails that test, or any chunk prints no
+JSON result or reports a file outside its own paths, the chunks are discarded
+and the single call runs instead. A large push is never checked less than a
+small one, and a CLI that ignores the paths costs one extra analysis, not
+`--jobs` of them.
+
+`--sonar PATH` (or SONAR_BIN) selects the executable, so the orchestration can
+be exercised with a stub that prints canned JSON.
+"""
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+PARALLEL_MIN_FILES = 40
+MIN_FILES_PER_CHUNK = 10
+DEFAULT_JOBS = min(4, os.cpu_count() or 1)
+
+
+def changed_files(base: str) -> list[str]:
+    """Files that differ between `base` and the working tree and still exist."""
+    result = subprocess.run(
+        ["git", "diff", "--name-only", "--diff-filter=d", "-z", base],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return []
+    return [path for path in result.stdout.split("\0") if path]
+
+
+def balanced_chunks(paths: list[str], count: int) -> list[list[str]]:
+    """`paths` in `count` chunks of near-equal total size, each in path order."""
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError:
+            sizes[path] = 0
+    # Ties (empty files) go to the chunk with the fewest files.
+    heap = [(0, 0, index) for index in range(count)]
+    chunks: list[list[str]] = [[] for _ in range(count)]
+    for path in sorted(paths, key=lambda item: (-sizes[item], item)):
+        total, files, index = heapq.heappop(heap)
+        chunks[index].append(path)
+        heapq.heappush(heap, (total + sizes[path], files + 1, index))
+    return [sorted(chunk) for chunk in chunks if chunk]
+
+
+def analyze_args(sonar: str, base: str, paths: list[str] | None = None) -> list[str]:
+    """The `sonar analyze` command line for changes since `base`, optionally limited to `paths`."""
+    args = [sonar, "analyze", "--base", base, "--format", "json"]
+    return [*args, "--", *paths] if paths else args
+
+
+def run_analyze(args: list[str]) -> dict | None:
+    """One analyze result, or None when the run printed no JSON object."""
+    result = subprocess.run(args, capture_output=True, text=True)
+    try:
+        parsed = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        parsed = None
+    if isinstance(parsed, dict):
+        return parsed
+    detail = (result.stderr or result.stdout).strip().splitlines()
+    message = f"sonar analyze exited {result.returncode}" + (f": {detail[0]}" if detail else "")
+    print(f"sonar: {message}", file=sys.stderr)
+    return None
+
+
+def reported_files(result: dict) -> set[str]:
+    """Every file a result names in a secret, a per-file issue list or a per-file failure."""
+    files = {
+        issue.get("file") or issue.get("path")
+        for issue in (result.get("secrets") or {}).get("issues", [])
+    }
+    agentic = result.get("agentic") or {}
+    files.update(entry.get("file") for entry in agentic.get("files", []))
+    files.update(failure.get("path") for failure in agentic.get("failures", []))
+    return {path for path in files if path}
+
+
+def within_chunk(result: dict | None, chunk: list[str]) -> bool:
+    """Whether `result` exists and names no file outside `chunk`; says why not."""
+    if result is None:
+        return False
+    strays = reported_files(result) - set(chunk)
+    if strays:
+        print(
+            f"sonar: a chunk reported {len(strays)} file(s) outside its paths "
+            f"(e.g. {sorted(strays)[0]}); path arguments look unsupported",
+            file=sys.stderr,
+        )
+    return not strays
+
+
+def analyze_chunks(sonar: str, base: str, chunks: list[list[str]]) -> list[dict] | None:
+    """Per-chunk results, or None if the first-chunk probe or any later chunk falls short."""
+    probe = run_analyze(analyze_args(sonar, base, chunks[0]))
+    if not within_chunk(probe, chunks[0]):
+        return None
+    if not reported_files(probe):
+        print("sonar: the probe chunk named no files, so path limiting is unconfirmed", file=sys.stderr)
+        return None
+    with ThreadPoolExecutor(max_workers=len(chunks) - 1) as pool:
+        rest = list(pool.map(lambda chunk: run_analyze(analyze_args(sonar, base, chunk)), chunks[1:]))
+    if not all(within_chunk(result, chunk) for chunk, result in zip(chunks[1:], rest)):
+        return None
+    return [probe, *rest]
+
+
+def merge_results(results: list[dict]) -> dict:
+    """One analyze result in the shape `sonar_gate.py` reads, from per-chunk results."""
+    merged: dict = {"secrets": {"issues": []}}
+    files: list[dict] = []
+    failures: list[dict] = []
+    seen_failures = set()
+    has_agentic = False
+    for result in results:
+        merged["secrets"]["issues"].extend((result.get("secrets") or {}).get("issues", []))
+        agentic = result.get("agentic")
+        if agentic is None:
+            continue
+        has_agentic = True
+        files.extend(agentic.get("files", []))
+        for failure in agentic.get("failures", []):
+            # Plan-level failures (Agentic Analysis not enabled) repeat once per chunk.
+            key = (failure.get("path"), failure.get("message"))
+            if key not in seen_failures:
+                seen_failures.add(key)
+                failures.append(failure)
+    if has_agentic:
+        merged["agentic"] = {"files": files, "failures": failures}
+    return merged
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base", required=True, help="Revision the push is compared against.")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Concurrent analyze processes.")
+    parser.add_argument("--sonar", default=os.environ.get("SONAR_BIN", "sonar"), help="sonar executable.")
+    args = parser.parse_args(argv)
+
+    paths = changed_files(args.base)
+    count = min(args.jobs, len(paths) // MIN_FILES_PER_CHUNK)
+    if len(paths) >= PARALLEL_MIN_FILES and count >= 2:
+        chunks = balanced_chunks(paths, count)
+        print(f"sonar: {len(paths)} changed files in {len(chunks)} parallel analyses", file=sys.stderr)
+        results = analyze_chunks(args.sonar, args.base, chunks)
+        if results is not None:
+            json.dump(merge_results(results), sys.stdout)
+            return 0
+        print("sonar: falling back to one analysis of the whole push", file=sys.stderr)
+
+    single = subprocess.run(
+        analyze_args(args.sonar, args.base),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    sys.stdout.write(single.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
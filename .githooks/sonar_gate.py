@@ -9,12 +9,50 @@ Secrets are scanned locally. Quality analysis runs server-side ("Agentic
 Analysis"); when that feature is not available on the org's plan the CLI either
 omits it or returns a 403 failure, which is an infrastructure gap rather than a
 code defect, so it is warned, never blocked on.
+
+The report is read incrementally: only the elements of the secrets, issues and
+failures arrays are decoded, one at a time, so a large analysis is never held
+in memory whole. `--sarif PATH` / `--json PATH` also write the verdict as a
+SARIF 2.1.0 log and as compact JSON.
+
+With `--base REF --head REF` the verdict is also cached, keyed by both trees and
+the ACKNOWLEDGED_SECRETS entries, so `--lookup` can replay it for a repeat push
+of the same range without re-running the analysis (exit 3 when there is no
+usable entry). Entries expire after CACHE_TTL_SECONDS; a head other than the
+checked-out tree, uncommitted changes to tracked files, `--no-cache` or
+SONAR_GATE_NO_CACHE=1 bypass the cache.
 """
+import argparse
+import hashlib
 import json
+import os
+import subprocess
 import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
 
 INFRA_MARKERS = ("not activated", "not configured", "not enabled")
 
+CACHE_PATH = Path(".cache", "sonar-gate", "verdicts.json")
+CACHE_VERSION = 2
+CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHE_MAX_ENTRIES = 64
+CACHE_MISS = 3
+
+# Arrays of the analyze report whose elements are decoded one at a time, and
+# the event each element becomes; "*" is any element of an enclosing array.
+STREAMED_ARRAYS = {
+    ("secrets", "issues"): "secret",
+    ("agentic", "files", "*", "issues"): "issue",
+    ("agentic", "failures"): "failure",
+}
+_CONTAINERS = {path[:depth] for path in STREAMED_ARRAYS for depth in range(len(path))}
+_DECODER = json.JSONDecoder()
+READ_CHUNK_CHARS = 64 * 1024
+NUMBER_CHARS = "0123456789+-.eE"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
 # Findings that are published test fixtures rather than credentials. Keyed by file and the
 # CLI's masked rendering of the value, never by line number — lines move whenever the file is
 # edited, and a stale entry would silence a real finding. A different secret in the same file
@@ -36,47 +74,375 @@ def is_infra_failure(message: str) -> bool:
     return any(marker in lowered for marker in INFRA_MARKERS)
 
 
-def main() -> int:
-    raw = sys.stdin.read().strip()
-    if not raw:
-        return 0
+def _stream_events(reader: "_StreamReader", path: tuple[str, ...]) -> Iterator[tuple[str, dict]]:
+    """Walk the value at `path`, decoding only the elements of STREAMED_ARRAYS one at a time."""
+    kind = STREAMED_ARRAYS.get(path)
+    char = reader.peek()
+    if kind is not None and char == "[":
+        for _ in reader.elements("]"):
+            element = reader.decode()
+            if isinstance(element, dict):
+                yield kind, element
+    elif path in _CONTAINERS and char == "{":
+        for _ in reader.elements("}"):
+            key = reader.decode()
+            reader.take(":")
+            yield from _stream_events(reader, (*path, str(key)))
+    elif path in _CONTAINERS and char == "[":
+        for _ in reader.elements("]"):
+            yield from _stream_events(reader, (*path, "*"))
+    else:
+        reader.decode()
+
+
+class _StreamReader:
+    """Just enough of a JSON tokenizer to walk containers of a document read in chunks."""
+
+    def __init__(self, stream: TextIO, chunk_size: int = READ_CHUNK_CHARS) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+        self.head = ""
+
+    def _fill(self, size: int = 0) -> bool:
+        chunk = self.stream.read(max(self.chunk_size, size))
+        if not chunk:
+            self.eof = True
+            return False
+        if not self.head:
+            self.head = chunk[:2000]
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" at end of input."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def take(self, expected: str) -> None:
+        if self.peek() != expected:
+            raise ValueError(f"expected {expected!r} at offset {self.offset + self.pos}")
+        self.pos += 1
+
+    def elements(self, closing: str) -> Iterator[None]:
+        """Step into the container at the cursor; yields once per element, cursor on it."""
+        self.pos += 1
+        if self.peek() == closing:
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.take(closing)
+            return
 
+    def decode(self) -> object:
+        """Decode the complete value at the cursor, reading more input until it is whole."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Probably cut off by the chunk boundary; read at least as much
+                # again so a large value costs linear, not quadratic, time.
+                if self._fill(len(self.buffer) - self.pos):
+                    continue
+                raise
+            # A number cut by the chunk boundary still decodes ("12" of
+            # "12.5e3"), so read on while only number characters follow it.
+            if not self.eof and not self.buffer[end:].strip(NUMBER_CHARS) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def stream_events(reader: _StreamReader) -> Iterator[tuple[str, dict]]:
+    """`(kind, item)` for each secret, quality issue and failure, as the input is read.
+
+    Only one element of the large arrays is held at a time; anything else in
+    the report is decoded and dropped. Raises ValueError on malformed input.
+    """
     try:
-        result = json.loads(raw)
-    except json.JSONDecodeError:
-        print(f"sonar gate: could not parse analyze output:\n{raw}", file=sys.stderr)
-        return 0
-
-    reported_secrets = result.get("secrets", {}).get("issues", [])
-    secret_issues = [issue for issue in reported_secrets if not is_acknowledged(issue)]
-    acknowledged_count = len(reported_secrets) - len(secret_issues)
+        yield from _stream_events(reader, ())
+        if reader.peek() != "":
+            raise ValueError(f"trailing data at offset {reader.offset + reader.pos}")
+    except ValueError as error:
+        raise ValueError(f"{error}\n{reader.head}") from error
+
+
+def result_events(result: dict) -> Iterator[tuple[str, dict]]:
+    """The same events as `stream_events`, for an already-parsed analyze result."""
+    for issue in (result.get("secrets") or {}).get("issues", []):
+        yield "secret", issue
     agentic = result.get("agentic") or {}
-    quality_issues = [
-        issue
-        for entry in agentic.get("files", [])
-        for issue in entry.get("issues", [])
-    ]
-    failures = agentic.get("failures", [])
+    for entry in agentic.get("files", []):
+        for issue in entry.get("issues", []):
+            yield "issue", issue
+    for failure in agentic.get("failures", []):
+        yield "failure", failure
 
-    blocking = bool(secret_issues) or bool(quality_issues)
 
-    if acknowledged_count:
-        print(f"  (skipped {acknowledged_count} acknowledged test fixture(s); see ACKNOWLEDGED_SECRETS)", file=sys.stderr)
+def evaluate(events: Iterable[tuple[str, dict]]) -> dict:
+    """Fold analyze events into a verdict.
 
-    for issue in secret_issues:
-        location = issue.get("file") or issue.get("path") or "?"
-        print(f"  secret: {location} - {issue.get('ruleName', issue.get('rule', 'hardcoded secret'))}", file=sys.stderr)
-    for issue in quality_issues:
-        print(f"  issue: {issue.get('file', '?')}:{issue.get('line', '?')} - {issue.get('message', '')}", file=sys.stderr)
+    Returns `{"status", "complete", "acknowledged", "secrets", "issues",
+    "failures"}`: the exit code, whether every analysis ran (only infra gaps
+    are tolerated), the number of acknowledged fixtures, and compact records of
+    everything reported.
+    """
+    verdict = {
+        "status": 0,
+        "complete": True,
+        "acknowledged": 0,
+        "secrets": [],
+        "issues": [],
+        "failures": [],
+    }
+    for kind, item in events:
+        if kind == "secret":
+            if is_acknowledged(item):
+                verdict["acknowledged"] += 1
+                continue
+            verdict["secrets"].append(
+                {
+                    "file": item.get("file") or item.get("path"),
+                    "line": item.get("line"),
+                    "rule": item.get("ruleName", item.get("rule", "hardcoded secret")),
+                }
+            )
+        elif kind == "issue":
+            verdict["issues"].append(
+                {
+                    "file": item.get("file"),
+                    "line": item.get("line"),
+                    "rule": item.get("rule"),
+                    "message": item.get("message", ""),
+                }
+            )
+        elif kind == "failure":
+            message = item.get("message", "")
+            infra = is_infra_failure(message)
+            verdict["complete"] = verdict["complete"] and infra
+            verdict["failures"].append(
+                {"path": item.get("path"), "message": message, "infra": infra}
+            )
+    verdict["status"] = 1 if verdict["secrets"] or verdict["issues"] else 0
+    return verdict
 
-    for failure in failures:
-        message = failure.get("message", "")
-        if is_infra_failure(message):
-            print(f"  (skipped quality analysis: {message.splitlines()[0]})", file=sys.stderr)
+
+def report_lines(verdict: dict) -> list[str]:
+    lines = []
+    if verdict["acknowledged"]:
+        lines.append(f"  (skipped {verdict['acknowledged']} acknowledged test fixture(s); see ACKNOWLEDGED_SECRETS)")
+    for secret in verdict["secrets"]:
+        lines.append(f"  secret: {secret['file'] or '?'} - {secret['rule']}")
+    for issue in verdict["issues"]:
+        lines.append(f"  issue: {issue['file'] or '?'}:{issue['line'] or '?'} - {issue['message']}")
+    for failure in verdict["failures"]:
+        message = failure["message"]
+        if failure["infra"]:
+            lines.append(f"  (skipped quality analysis: {message.splitlines()[0]})")
         else:
-            print(f"  analyze failure: {failure.get('path', '?')} - {message}", file=sys.stderr)
+            lines.append(f"  analyze failure: {failure['path'] or '?'} - {message}")
+    return lines
+
+
+def to_sarif(verdict: dict) -> dict:
+    """SARIF 2.1.0 log of the blocking findings, for editors and CI annotations."""
+    findings = [
+        ("secret", secret["rule"] or "hardcoded secret", f"Hardcoded secret: {secret['rule']}", secret)
+        for secret in verdict["secrets"]
+    ] + [
+        ("issue", issue["rule"] or "sonar-issue", issue["message"], issue)
+        for issue in verdict["issues"]
+    ]
+    results = []
+    for _, rule, message, finding in findings:
+        location = {"artifactLocation": {"uri": finding["file"] or "?"}}
+        if isinstance(finding["line"], int) and finding["line"] > 0:
+            location["region"] = {"startLine": finding["line"]}
+        results.append(
+            {
+                "ruleId": str(rule),
+                "level": "error",
+                "message": {"text": message or str(rule)},
+                "locations": [{"physicalLocation": location}],
+            }
+        )
+    notifications = [
+        {
+            "level": "note" if failure["infra"] else "error",
+            "message": {"text": failure["message"]},
+        }
+        for failure in verdict["failures"]
+    ]
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {
+                    "driver": {
+                        "name": "sonar-gate",
+                        "informationUri": "https://cli.sonarqube.com",
+                        "rules": [{"id": rule} for rule in sorted({str(f[1]) for f in findings})],
+                    }
+                },
+                "invocations": [
+                    {
+                        "executionSuccessful": verdict["complete"],
+                        "toolExecutionNotifications": notifications,
+                    }
+                ],
+                "results": results,
+            }
+        ],
+    }
+
+
+def to_verdict_json(verdict: dict) -> dict:
+    """Compact machine-readable verdict: what blocked, what was skipped and why."""
+    return {"blocked": verdict["status"] == 1, **verdict}
+
+
+def write_json(path: str, document: dict) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def git(*args: str) -> str | None:
+    result = subprocess.run(["git", *args], capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def cache_key(base: str, head: str) -> str | None:
+    """`<base tree>:<head tree>:<acknowledged hash>`, or None when the range cannot be cached.
+
+    The analysis reads the working tree, so the key only stands for it when
+    `head` is what is checked out (by tree) and no tracked file has
+    uncommitted changes; otherwise caching is disabled.
+    """
+    base_tree = git("rev-parse", "--verify", "--quiet", f"{base}^{{tree}}")
+    head_tree = git("rev-parse", "--verify", "--quiet", f"{head}^{{tree}}")
+    checked_out = git("rev-parse", "--verify", "--quiet", "HEAD^{tree}")
+    dirty = git("status", "--porcelain", "--untracked-files=no")
+    if not base_tree or not head_tree or head_tree != checked_out or dirty != "":
+        return None
+    acknowledged = hashlib.sha256(repr(sorted(ACKNOWLEDGED_SECRETS)).encode()).hexdigest()
+    return f"{base_tree}:{head_tree}:{acknowledged[:16]}"
+
+
+def cache_file() -> Path | None:
+    root = git("rev-parse", "--show-toplevel")
+    return Path(root, CACHE_PATH) if root else None
+
+
+def load_cache(path: Path) -> dict[str, dict]:
+    """Unexpired entries of the verdict cache; missing or unreadable caches are empty."""
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    now = time.time()
+    return {
+        key: entry
+        for key, entry in cache.get("entries", {}).items()
+        if now - entry.get("created", 0) < CACHE_TTL_SECONDS
+    }
+
+
+def save_cache(path: Path, entries: dict[str, dict]) -> None:
+    newest = sorted(entries.items(), key=lambda item: item[1]["created"])[-CACHE_MAX_ENTRIES:]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    temporary.write_text(
+        json.dumps({"version": CACHE_VERSION, "entries": dict(newest)}), encoding="utf-8"
+    )
+    temporary.replace(path)
+
+
+def lookup(key: str | None, path: Path | None) -> dict | None:
+    """The cached verdict for `key`, announced on stderr; None when there is none."""
+    if key is None or path is None:
+        return None
+    entry = load_cache(path).get(key)
+    if entry is None:
+        return None
+    age = int((time.time() - entry["created"]) / 60)
+    print(
+        f"sonar gate: unchanged range, reusing the verdict from {age} min ago "
+        "(SONAR_GATE_NO_CACHE=1 to re-scan)",
+        file=sys.stderr,
+    )
+    return entry["verdict"]
+
+
+def record(key: str | None, path: Path | None, verdict: dict) -> None:
+    if key is None or path is None:
+        return
+    entries = load_cache(path)
+    entries[key] = {"verdict": verdict, "created": time.time()}
+    try:
+        save_cache(path, entries)
+    except OSError:
+        pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base", help="Base revision of the analysed range (enables the cache).")
+    parser.add_argument("--head", default="HEAD", help="Head revision of the analysed range.")
+    parser.add_argument(
+        "--lookup",
+        action="store_true",
+        help=f"Only replay a cached verdict for the range; exit {CACHE_MISS} if there is none.",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the cache.")
+    parser.add_argument("--sarif", metavar="PATH", help="Also write the verdict as a SARIF 2.1.0 log.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the verdict as compact JSON.")
+    args = parser.parse_args(argv)
+
+    use_cache = args.base and not args.no_cache and not os.environ.get("SONAR_GATE_NO_CACHE")
+    key = cache_key(args.base, args.head) if use_cache else None
+    path = cache_file() if key else None
+    if args.lookup:
+        verdict = lookup(key, path)
+        if verdict is None:
+            return CACHE_MISS
+    else:
+        reader = _StreamReader(sys.stdin)
+        if reader.peek() == "":
+            return 0
+        try:
+            verdict = evaluate(stream_events(reader))
+        except ValueError as error:
+            print(f"sonar gate: could not parse analyze output: {error}", file=sys.stderr)
+            return 0
+        if verdict["complete"]:
+            record(key, path, verdict)
 
-    return 1 if blocking else 0
+    for line in report_lines(verdict):
+        print(line, file=sys.stderr)
+    if args.sarif:
+        write_json(args.sarif, to_sarif(verdict))
+    if args.json:
+        write_json(args.json, to_verdict_json(verdict))
+    return verdict["status"]
 
 
 if __name__ == "__main__":
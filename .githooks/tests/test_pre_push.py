@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+HOOKS = HERE.parent
+
+ZERO = "0" * 40
+
+# Stand-ins for the sonar CLI and ledger_check.py that log their arguments;
+# the sonar one reports a clean analysis.
+SONAR_STUB = """\
+#!{python}
+import json, os, sys
+with open(os.environ["STUB_LOG"], "a", encoding="utf-8") as log:
+    log.write(json.dumps(["sonar", *sys.argv[1:]]) + "\\n")
+print(json.dumps({{"secrets": {{"issues": []}}}}))
+"""
+LEDGER_STUB = """\
+import json, os, sys
+with open(os.environ["STUB_LOG"], "a", encoding="utf-8") as log:
+    log.write(json.dumps(["ledger", *sys.argv[1:]]) + "\\n")
+"""
+
+
+def _git(root: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(root), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(root: Path, path: str, text: str) -> str:
+    (root / path).write_text(text, encoding="utf-8")
+    _git(root, "add", path)
+    _git(root, "commit", "-q", "-n", "-m", path)
+    return _git(root, "rev-parse", "HEAD")
+
+
+class PrePushTests(unittest.TestCase):
+    """The hook, copied into a scratch repo, fed `git push`'s ref lines on stdin."""
+
+    def setUp(self):
+        self.root = HERE / "_tmp_pre_push"
+        shutil.rmtree(self.root, ignore_errors=True)
+        (self.root / "bin").mkdir(parents=True)
+        (self.root / "Scripts").mkdir()
+        _git(self.root, "init", "-q", "-b", "main")
+        (self.root / ".gitignore").write_text("/bin/\n/.cache/\n/.githooks/\n/Scripts/\n", encoding="utf-8")
+        self.main = _commit(self.root, "readme.md", "x\n")
+        _git(self.root, "update-ref", "refs/remotes/origin/main", self.main)
+        _git(self.root, "checkout", "-q", "-b", "other")
+        self.other = _commit(self.root, "other.cs", "o\n")
+        _git(self.root, "checkout", "-q", "-b", "feature", "main")
+        self.feature = _commit(self.root, "feature.cs", "f\n")
+
+        shutil.copytree(HOOKS, self.root / ".githooks", ignore=shutil.ignore_patterns("tests", "__pycache__"))
+        (self.root / "Scripts" / "ledger_check.py").write_text(LEDGER_STUB, encoding="utf-8")
+        sonar = self.root / "bin" / "sonar"
+        sonar.write_text(SONAR_STUB.format(python=sys.executable), encoding="utf-8")
+        sonar.chmod(0o755)
+        self.log = self.root / "calls.log"
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def push(self, *lines: str) -> list:
+        env = dict(
+            os.environ,
+            PATH=f"{self.root / 'bin'}{os.pathsep}{os.environ['PATH']}",
+            STUB_LOG=str(self.log),
+            SONAR_GATE_NO_CACHE="1",
+        )
+        result = subprocess.run(
+            ["bash", str(self.root / ".githooks" / "pre-push"), "origin", "url"],
+            cwd=self.root,
+            input="".join(f"{line}\n" for line in lines),
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        if not self.log.exists():
+            return []
+        return [json.loads(line) for line in self.log.read_text(encoding="utf-8").splitlines()]
+
+    def test_deletions_tags_and_commits_the_remote_has_check_nothing(self):
+        calls = self.push(
+            f"(delete) {ZERO} refs/heads/gone {self.main}",
+            f"refs/tags/v1 {self.feature} refs/tags/v1 {ZERO}",
+            f"refs/heads/main {self.main} refs/heads/main {self.main}",
+            f"refs/heads/old {self.main} refs/heads/old {ZERO}",
+        )
+        self.assertEqual(calls, [])
+
+    def test_each_branch_is_range_checked_once(self):
+        calls = self.push(
+            f"refs/heads/feature {self.feature} refs/heads/feature {ZERO}",
+            f"refs/heads/feature {self.feature} refs/heads/review {ZERO}",
+            f"refs/heads/other {self.other} refs/heads/other {self.main}",
+        )
+        ranges = [call[2] for call in calls if call[0] == "ledger"]
+        self.assertEqual(ranges, [f"{self.main}...{self.feature}", f"{self.main}...{self.other}"])
+
+    def test_sonar_analyses_the_checked_out_head_once(self):
+        calls = self.push(
+            f"refs/heads/feature {self.feature} refs/heads/feature {ZERO}",
+            f"refs/heads/other {self.other} refs/heads/other {ZERO}",
+            f"refs/tags/v1 {self.feature} refs/tags/v1 {ZERO}",
+        )
+        analyses = [call for call in calls if call[0] == "sonar"]
+        self.assertEqual(analyses, [["sonar", "analyze", "--base", self.main, "--format", "json"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import sonar_analyze  # noqa: E402
+
+# Logs each call and reports one secret per analysed file: every changed file
+# for a plain --base call, only the listed paths after "--". STUB_MODE=fail
+# fails the chunk holding f00.cs; STUB_MODE=ignore-paths analyses everything anyway;
+# STUB_MODE=clean reports nothing for a chunk.
+STUB = """\
+#!{python}
+import json, os, subprocess, sys
+args = sys.argv[1:]
+with open(os.environ["STUB_LOG"], "a", encoding="utf-8") as log:
+    log.write(json.dumps(args) + "\\n")
+mode = os.environ.get("STUB_MODE", "")
+base = args[args.index("--base") + 1]
+paths = args[args.index("--") + 1:] if "--" in args else []
+if paths and mode == "fail" and "f00.cs" in paths:
+    print("error: unknown argument --", file=sys.stderr)
+    sys.exit(2)
+if paths and mode == "clean":
+    paths = []
+elif not paths or mode == "ignore-paths":
+    paths = subprocess.run(
+        ["git", "diff", "--name-only", base], capture_output=True, text=True
+    ).stdout.split()
+issues = [{{"file": path, "line": 1, "ruleName": "key"}} for path in paths]
+print(json.dumps({{"secrets": {{"issues": issues}}}}))
+"""
+
+
+def _git(root: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(root), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+class StubSonarTests(unittest.TestCase):
+    def setUp(self):
+        self.root = HERE / "_tmp_sonar_analyze"
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.root.mkdir()
+        _git(self.root, "init", "-q", "-b", "main")
+        (self.root / "readme.md").write_text("x\n", encoding="utf-8")
+        _git(self.root, "add", ".")
+        _git(self.root, "commit", "-q", "-m", "base")
+        self.base = _git(self.root, "rev-parse", "HEAD")
+        self.sonar = self.root / "sonar"
+        self.sonar.write_text(STUB.format(python=sys.executable), encoding="utf-8")
+        self.sonar.chmod(0o755)
+        self.log = self.root / "calls.log"
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+        os.environ["STUB_LOG"] = str(self.log)
+        os.environ.pop("STUB_MODE", None)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        os.environ.pop("STUB_LOG", None)
+        os.environ.pop("STUB_MODE", None)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def change(self, count: int) -> list[str]:
+        paths = [f"f{index:02}.cs" for index in range(count)]
+        for index, path in enumerate(paths):
+            (self.root / path).write_text("x" * (index + 1), encoding="utf-8")
+        _git(self.root, "add", *paths)
+        return paths
+
+    def analyse(self, mode: str = "") -> tuple[dict, list[list[str]]]:
+        if mode:
+            os.environ["STUB_MODE"] = mode
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            status = sonar_analyze.main(
+                ["--base", self.base, "--jobs", "4", "--sonar", str(self.sonar)]
+            )
+        self.assertEqual(status, 0)
+        calls = [json.loads(line) for line in self.log.read_text(encoding="utf-8").splitlines()]
+        return json.loads(stdout.getvalue()), calls
+
+    def secret_files(self, result: dict) -> list[str]:
+        return sorted(issue["file"] for issue in result["secrets"]["issues"])
+
+    def test_small_push_runs_the_single_base_call(self):
+        paths = self.change(5)
+        result, calls = self.analyse()
+        self.assertEqual(calls, [["analyze", "--base", self.base, "--format", "json"]])
+        self.assertEqual(self.secret_files(result), paths)
+
+    def test_large_push_is_split_into_base_limited_chunks(self):
+        paths = self.change(45)
+        result, calls = self.analyse()
+        self.assertEqual(len(calls), 4)
+        chunked = []
+        for call in calls:
+            separator = call.index("--")
+            self.assertEqual(call[:separator], ["analyze", "--base", self.base, "--format", "json"])
+            chunked.extend(call[separator + 1:])
+        self.assertEqual(sorted(chunked), paths)
+        self.assertEqual(self.secret_files(result), paths)
+
+    def test_large_push_probes_the_first_chunk_before_the_rest(self):
+        self.change(45)
+        _, calls = self.analyse()
+        chunks = sonar_analyze.balanced_chunks(sonar_analyze.changed_files(self.base), 4)
+        self.assertEqual(calls[0], sonar_analyze.analyze_args(str(self.sonar), self.base, chunks[0])[1:])
+
+    def test_failed_chunk_falls_back_to_the_single_call(self):
+        paths = self.change(45)
+        result, calls = self.analyse("fail")
+        chunks = sonar_analyze.balanced_chunks(paths, 4)
+        # A failing probe stops the fan-out; a later failing chunk is found after it.
+        self.assertEqual(len(calls), 2 if "f00.cs" in chunks[0] else 5)
+        self.assertEqual(calls[-1], ["analyze", "--base", self.base, "--format", "json"])
+        self.assertEqual(self.secret_files(result), paths)
+
+    def test_cli_ignoring_path_arguments_costs_one_probe(self):
+        paths = self.change(45)
+        result, calls = self.analyse("ignore-paths")
+        self.assertEqual(len(calls), 2)
+        self.assertIn("--", calls[0])
+        self.assertNotIn("--", calls[1])
+        self.assertEqual(self.secret_files(result), paths)
+
+    def test_clean_probe_cannot_confirm_path_limiting(self):
+        self.change(45)
+        _, calls = self.analyse("clean")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[-1], ["analyze", "--base", self.base, "--format", "json"])
+
+    def test_agentic_failures_name_their_files(self):
+        result = {"agentic": {"files": [], "failures": [{"path": "a.ts"}, {"path": None}]}}
+        self.assertEqual(sonar_analyze.reported_files(result), {"a.ts"})
+
+
+class MergeTests(unittest.TestCase):
+    def test_balanced_chunks_spread_empty_files(self):
+        paths = [f"missing{index}" for index in range(7)]
+        chunks = sonar_analyze.balanced_chunks(paths, 3)
+        self.assertEqual(sorted(len(chunk) for chunk in chunks), [2, 2, 3])
+        self.assertEqual(sorted(sum(chunks, [])), paths)
+
+    def test_merge_concatenates_findings_and_dedupes_failures(self):
+        infra = {"path": None, "message": "Agentic Analysis is not enabled"}
+        merged = sonar_analyze.merge_results(
+            [
+                {
+                    "secrets": {"issues": [{"file": "a"}]},
+                    "agentic": {"files": [{"file": "a"}], "failures": [infra]},
+                },
+                {
+                    "secrets": {"issues": [{"file": "b"}]},
+                    "agentic": {"files": [], "failures": [infra]},
+                },
+            ]
+        )
+        self.assertEqual(merged["secrets"]["issues"], [{"file": "a"}, {"file": "b"}])
+        self.assertEqual(merged["agentic"], {"files": [{"file": "a"}], "failures": [infra]})
+
+    def test_merge_without_agentic_results_omits_the_section(self):
+        merged = sonar_analyze.merge_results([{"secrets": {"issues": []}}, {}])
+        self.assertEqual(merged, {"secrets": {"issues": []}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from unittest import mock
+
+HERE = Path(__file__).resolve().parent
+FIXTURES = HERE / "fixtures"
+sys.path.insert(0, str(HERE.parent))
+
+import sonar_gate  # noqa: E402
+
+SECRET_REPORT = json.dumps(
+    {"secrets": {"issues": [{"file": "app.cs", "line": 3, "ruleName": "AWS key"}]}}
+)
+CLEAN_REPORT = json.dumps({"secrets": {"issues": []}})
+
+
+# Numbers, escapes and brackets inside strings are where a chunk boundary can
+# land mid-token; "secr\\u0065ts" is the key "secrets" spelled with an escape.
+TRICKY_REPORT = r"""{
+ "version": 1500.0, "ratio": -2.5e-3, "big": 12345678901234567890,
+ "meta": {"ok": true, "none": null, "nested": [1, [2, {"x": "]}\"{["}]]},
+ "secr\u0065ts": {"issues": [
+   {"file": "a\\\"q.cs", "line": 12345, "ruleName": "AWS key \u00e9\n", "secret": "vTa***"},
+   {"path": "b/c.yml", "line": -7, "rule": "token", "extra": [true, false, null, 0.25]}]},
+ "agentic": {"files": [
+   {"file": "x.ts", "issues": [{"file": "x.ts", "line": 3, "rule": "S1", "message": "tab\there"}]},
+   {"file": "y.ts", "issues": []}],
+  "failures": [{"path": "x", "message": "Agentic Analysis is not enabled"}]}
+}
+"""
+
+
+def _events(text: str, chunk_size: int = sonar_gate.READ_CHUNK_CHARS) -> list:
+    reader = sonar_gate._StreamReader(io.StringIO(text), chunk_size=chunk_size)
+    return list(sonar_gate.stream_events(reader))
+
+
+def _git(root: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(root), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(root: Path, path: str, text: str) -> str:
+    (root / path).write_text(text, encoding="utf-8")
+    _git(root, "add", path)
+    _git(root, "commit", "-q", "-m", path)
+    return _git(root, "rev-parse", "HEAD")
+
+
+class StreamReaderTests(unittest.TestCase):
+    def test_matches_the_parsed_report_at_every_chunk_size(self):
+        expected = list(sonar_gate.result_events(json.loads(TRICKY_REPORT)))
+        self.assertEqual([kind for kind, _ in expected], ["secret", "secret", "issue", "failure"])
+        for size in range(1, 64):
+            self.assertEqual(_events(TRICKY_REPORT, size), expected, size)
+
+    def test_decodes_escapes_in_keys_and_strings(self):
+        events = _events(TRICKY_REPORT, 3)
+        self.assertEqual(events[0][1]["file"], 'a\\"q.cs')
+        self.assertEqual(events[0][1]["ruleName"], "AWS key \u00e9\n")
+        self.assertEqual(events[2][1]["message"], "tab\there")
+
+    def test_number_split_before_its_fraction_is_read_whole(self):
+        # Scalars the walker skips are decoded on their own, so "1500" is
+        # already a valid number when the chunk ends.
+        pieces = iter(['{"version": 1500', ".", '25e1, "secrets": {"issues": [{"line": 1}]}}'])
+        stream = mock.Mock(read=lambda size: next(pieces, ""))
+        reader = sonar_gate._StreamReader(stream, chunk_size=1)
+        self.assertEqual(list(sonar_gate.stream_events(reader)), [("secret", {"line": 1})])
+
+    def test_truncated_input_raises_value_error(self):
+        for end in range(1, len(TRICKY_REPORT.rstrip())):
+            for size in (1, 7, 4096):
+                with self.assertRaises(ValueError, msg=(end, size)):
+                    _events(TRICKY_REPORT[:end], size)
+
+    def test_malformed_input_raises_value_error(self):
+        for text in (
+            '{"secrets": {"issues": [{"a": 1} {"b": 2}]}}',
+            '{"secrets" {"issues": []}}',
+            '{"secrets": {"issues": [}}',
+            '{"secrets": {"issues": []}} trailing',
+            "not json",
+        ):
+            with self.assertRaises(ValueError, msg=text):
+                _events(text, 5)
+
+    def test_unparseable_output_is_reported_without_blocking(self):
+        stderr = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO('{"secrets": {"issues": [{')), redirect_stderr(
+            stderr
+        ):
+            self.assertEqual(sonar_gate.main([]), 0)
+        self.assertIn("could not parse analyze output", stderr.getvalue())
+
+
+class VerdictOutputTests(unittest.TestCase):
+    def setUp(self):
+        self.out = HERE / "_tmp_sonar_gate_out"
+        shutil.rmtree(self.out, ignore_errors=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.out, ignore_errors=True)
+
+    def test_writes_golden_sarif_and_json(self):
+        report = (FIXTURES / "analyze_report.json").read_text(encoding="utf-8")
+        sarif = self.out / "verdict.sarif"
+        verdict = self.out / "verdict.json"
+        stderr = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO(report)), redirect_stderr(stderr):
+            status = sonar_gate.main(["--sarif", str(sarif), "--json", str(verdict)])
+        self.assertEqual(status, 1)
+        for written, golden in ((sarif, "verdict.sarif"), (verdict, "verdict.json")):
+            self.assertEqual(
+                written.read_text(encoding="utf-8"),
+                (FIXTURES / golden).read_text(encoding="utf-8"),
+                golden,
+            )
+        self.assertIn("skipped 1 acknowledged test fixture", stderr.getvalue())
+
+    def test_streamed_and_parsed_reports_give_the_same_verdict(self):
+        report = (FIXTURES / "analyze_report.json").read_text(encoding="utf-8")
+        self.assertEqual(
+            sonar_gate.evaluate(_events(report, 16)),
+            sonar_gate.evaluate(sonar_gate.result_events(json.loads(report))),
+        )
+
+
+class VerdictCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.root = HERE / "_tmp_sonar_gate_cache"
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.root.mkdir()
+        _git(self.root, "init", "-q", "-b", "main")
+        self.base = _commit(self.root, "a.cs", "a\n")
+        self.head = _commit(self.root, "b.cs", "b\n")
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop("SONAR_GATE_NO_CACHE", None)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def gate(self, *args: str, report: str = "") -> int:
+        with mock.patch("sys.stdin", io.StringIO(report)), redirect_stderr(io.StringIO()):
+            return sonar_gate.main(list(args))
+
+    def analyse(self, report: str, head: str | None = None, *extra: str) -> int:
+        return self.gate("--base", self.base, "--head", head or self.head, *extra, report=report)
+
+    def lookup(self, head: str | None = None, *extra: str) -> int:
+        return self.gate("--lookup", "--base", self.base, "--head", head or self.head, *extra)
+
+    def test_key_is_both_trees_and_the_acknowledged_hash(self):
+        key = sonar_gate.cache_key(self.base, self.head)
+        base_tree = _git(self.root, "rev-parse", f"{self.base}^{{tree}}")
+        head_tree = _git(self.root, "rev-parse", f"{self.head}^{{tree}}")
+        self.assertTrue(key.startswith(f"{base_tree}:{head_tree}:"))
+        with mock.patch.object(sonar_gate, "ACKNOWLEDGED_SECRETS", {("x.yml", "abc***")}):
+            self.assertNotEqual(sonar_gate.cache_key(self.base, self.head), key)
+
+    def test_no_key_unless_head_is_what_is_checked_out_and_clean(self):
+        self.assertIsNone(sonar_gate.cache_key(self.base, self.base))
+        self.assertIsNone(sonar_gate.cache_key(self.base, "no-such-ref"))
+        (self.root / "a.cs").write_text("changed\n", encoding="utf-8")
+        self.assertIsNone(sonar_gate.cache_key(self.base, self.head))
+
+    def test_replays_a_recorded_verdict_for_the_same_range(self):
+        self.assertEqual(self.lookup(), sonar_gate.CACHE_MISS)
+        self.assertEqual(self.analyse(SECRET_REPORT), 1)
+        self.assertEqual(self.lookup(), 1)
+
+    def test_other_base_or_unchecked_out_head_misses(self):
+        self.analyse(CLEAN_REPORT)
+        self.assertEqual(self.lookup(), 0)
+        self.assertEqual(
+            self.gate("--lookup", "--base", self.head, "--head", self.head),
+            sonar_gate.CACHE_MISS,
+        )
+        _git(self.root, "checkout", "-q", self.base)
+        self.assertEqual(self.lookup(), sonar_gate.CACHE_MISS)
+
+    def test_entries_expire(self):
+        self.analyse(SECRET_REPORT)
+        later = sonar_gate.time.time() + sonar_gate.CACHE_TTL_SECONDS + 1
+        with mock.patch.object(sonar_gate.time, "time", return_value=later):
+            self.assertEqual(self.lookup(), sonar_gate.CACHE_MISS)
+
+    def test_incomplete_analysis_is_not_recorded(self):
+        report = json.dumps({"agentic": {"failures": [{"path": "x", "message": "boom"}]}})
+        self.assertEqual(self.analyse(report), 0)
+        self.assertEqual(self.lookup(), sonar_gate.CACHE_MISS)
+
+    def test_no_cache_flag_and_environment_bypass_the_cache(self):
+        self.analyse(SECRET_REPORT, None, "--no-cache")
+        self.assertEqual(self.lookup(), sonar_gate.CACHE_MISS)
+        self.analyse(SECRET_REPORT)
+        self.assertEqual(self.lookup(None, "--no-cache"), sonar_gate.CACHE_MISS)
+        os.environ["SONAR_GATE_NO_CACHE"] = "1"
+        self.assertEqual(self.lookup(), sonar_gate.CACHE_MISS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,33 +1,32 @@
 import requests
 import base64
 import argparse
-from datetime import datetime, timezone
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
 import random
+import time
+from email.utils import parsedate_to_datetime
 
 # --- Configuration ---
 organization_url = "https://dev.azure.com/LetPeopleWork"
 project_name = "Lighthouse Demo"
 dry_run = False  # Set to True to test without making real changes
+batch_limit = 200  # Most sub-requests one _apis/wit/$batch call accepts
+max_retries = 6  # Attempts per request after a 429/503 before giving up
+max_backoff_seconds = 300
 
-# --- Parse token ---
-parser = argparse.ArgumentParser()
-parser.add_argument(
-    "personal_access_token", type=str, help="Azure DevOps Personal Access Token"
-)
-args = parser.parse_args()
+# One keep-alive session for every call, instead of a new TLS connection each;
+# main() adds the token.
+session = requests.Session()
 
-token_bytes = f":{args.personal_access_token}".encode("ascii")
-base64_encoded_token = base64.b64encode(token_bytes).decode("ascii")
-
-# Different content types for different operations
-query_headers = {
-    "Authorization": f"Basic {base64_encoded_token}",
-}
-
-patch_headers = {
-    "Content-Type": "application/json-patch+json",
-    "Authorization": f"Basic {base64_encoded_token}",
-}
+# ADO rate limits by TSTUs (throughput units) and reports it in response headers:
+# Retry-After once a request is delayed or rejected, and X-RateLimit-Limit /
+# -Remaining / -Delay while a user nears the limit. `pause` is the wait applied
+# before the next request; it grows while ADO pushes back and halves otherwise.
+throttle = {"requests": 0, "retries": 0, "throttled_seconds": 0.0, "pause": 0.0}
 
 # --- Area Path Targets ---
 area_path_targets = {
@@ -38,117 +37,534 @@ area_path_targets = {
     "Lighthouse Demo\\Portfolio": [0, 0, 0, 1, 0, 1, 0, 1, 0, 0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 1, 0, 1, 0, 0, 1, 0, 0]
 }
 
-today = datetime.now(timezone.utc)
-today_index = today.day - 1
-formatted_date = today.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-display_date = today.strftime("%Y-%m-%d")
+def retry_after_seconds(value):
+    """Seconds a Retry-After header asks for (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
 
-print(f"🔄 Running ADO System Updater on {display_date} (day index: {today_index})")
 
+def next_pause(response):
+    """Wait before the next request, from ADO's rate-limit headers on `response`."""
+    headers = response.headers
+    retry_after = retry_after_seconds(headers.get("Retry-After"))
+    if retry_after is not None:
+        return min(retry_after, max_backoff_seconds)
+    try:
+        limit = float(headers["X-RateLimit-Limit"])
+        remaining = float(headers["X-RateLimit-Remaining"])
+        if limit > 0 and remaining / limit < 0.1:
+            delay = float(headers.get("X-RateLimit-Delay") or 0)
+            return min(max(delay, throttle["pause"] * 2, 0.5), max_backoff_seconds)
+    except (KeyError, ValueError):
+        pass
+    return throttle["pause"] / 2 if throttle["pause"] > 0.05 else 0.0
 
-def create_work_item(title, area_path, work_item_type):
-    fields = [
-        {"op": "add", "path": "/fields/System.Title", "value": title},
-        {"op": "add", "path": "/fields/System.AreaPath", "value": area_path},
-        {"op": "add", "path": "/fields/System.State", "value": "New"},
-    ]
+
+def wait(seconds):
+    if seconds > 0:
+        time.sleep(seconds)
+        throttle["throttled_seconds"] += seconds
+
+
+def send_request(method, url, **kwargs):
+    """`session.request`, paced by ADO's rate-limit headers and retried on 429/503."""
+    kwargs.setdefault("timeout", 60)
+    for attempt in range(max_retries + 1):
+        wait(throttle["pause"])
+        throttle["requests"] += 1
+        response = session.request(method, url, **kwargs)
+        throttle["pause"] = next_pause(response)
+        if response.status_code not in (429, 503) or attempt == max_retries:
+            return response
+        if "Retry-After" not in response.headers:
+            throttle["pause"] = min(max(throttle["pause"], 1.0) * 2 ** attempt, max_backoff_seconds)
+        throttle["retries"] += 1
+        print(f"⏳ {response.status_code} from ADO, retrying in {throttle['pause']:.1f}s")
+    return response
+
+
+def send_batch(operations):
+    """Send work item requests through `_apis/wit/$batch`, `batch_limit` at a time.
+
+    Yields one (status code, body) per operation, in order, each batch's results
+    before the next batch is sent. The batch is not transactional: each
+    operation succeeds or fails on its own. Operations a reply leaves
+    unanswered are yielded as failures with a None code.
+    """
+    for start in range(0, len(operations), batch_limit):
+        chunk = operations[start : start + batch_limit]
+        response = send_request(
+            "POST",
+            f"{organization_url}/_apis/wit/$batch?api-version=6.0",
+            json=chunk,
+        )
+        if response.status_code != 200:
+            print(f"❌ Batch of {len(chunk)} failed: {response.status_code} - {response.text}")
+            yield from ((response.status_code, response.text) for _ in chunk)
+            continue
+        values = response.json().get("value", [])
+        if len(values) != len(chunk):
+            print(f"❌ $batch answered {len(values)} of {len(chunk)} request(s)")
+        for entry in values[: len(chunk)]:
+            body = entry.get("body")
+            try:
+                body = json.loads(body) if isinstance(body, str) else body
+            except ValueError:
+                pass
+            yield entry.get("code"), body
+        yield from ((None, "no response in the $batch reply") for _ in chunk[len(values) :])
+
+
+def batch_failure(body):
+    return body.get("message", body) if isinstance(body, dict) else body
+
+
+def patch_operation(uri, fields):
+    """One $batch sub-request setting `fields` on the work item at `uri`."""
+    return {
+        "method": "PATCH",
+        "uri": uri,
+        "headers": {"Content-Type": "application/json-patch+json"},
+        "body": [{"op": "add", "path": f"/fields/{name}", "value": value} for name, value in fields.items()],
+    }
+
+
+def create_work_items(items):
+    """Create (title, area_path, work_item_type) items in "New"; returns the new IDs."""
     if dry_run:
-        print(f"🔍 [DRY-RUN] Would create {work_item_type} '{title}' in {area_path}")
-        return None
-    response = requests.post(
-        f"{organization_url}/{project_name}/_apis/wit/workitems/${work_item_type}?api-version=6.0",
-        headers=patch_headers,
-        json=fields,
-    )
-    if response.status_code in [200, 201]:
-        item = response.json()
-        print(f"✅ Created {work_item_type} {item['id']} - {title}")
-        return item["id"]
-    else:
-        print(
-            f"❌ Failed to create {work_item_type}: {response.status_code} - {response.text}"
+        for title, area_path, work_item_type in items:
+            print(f"🔍 [DRY-RUN] Would create {work_item_type} '{title}' in {area_path}")
+        return []
+    operations = [
+        patch_operation(
+            f"/{quote(project_name)}/_apis/wit/workitems/${quote(work_item_type)}?api-version=6.0",
+            {"System.Title": title, "System.AreaPath": area_path, "System.State": "New"},
         )
-        return None
+        for title, area_path, work_item_type in items
+    ]
+    created = []
+    for (title, _, work_item_type), (code, body) in zip(items, send_batch(operations)):
+        if code in [200, 201]:
+            print(f"✅ Created {work_item_type} {body['id']} - {title}")
+            created.append(body["id"])
+        else:
+            print(f"❌ Failed to create {work_item_type} '{title}': {code} - {batch_failure(body)}")
+    return created
+
 
+def query_open_work_items(plans):
+    """IDs of each plan's generated items, as {area_path: {"New": [...], "Active": [...]}}.
 
-def query_work_items(state, area_path, title_prefix, work_item_type):
-    print(f"🔍 Querying {work_item_type}s in '{state}' state for {area_path}")
+    One WIQL query matches every plan's area path, type and title prefix; the
+    states come from a `workitemsbatch` read of the few fields needed to group.
+    """
+    print(f"🔍 Querying open work items across {len(plans)} area path(s)")
+    plan_clauses = " OR ".join(
+        f"([System.AreaPath] = '{plan['area_path']}'"
+        f" AND [System.WorkItemType] = '{plan['work_item_type']}'"
+        f" AND [System.Title] CONTAINS '{plan['title_prefix']}')"
+        for plan in plans
+    )
     wiql = {
         "query": f"""
         SELECT [System.Id]
         FROM WorkItems
         WHERE [System.TeamProject] = '{project_name}'
-          AND [System.WorkItemType] = '{work_item_type}'
-          AND [System.State] = '{state}'
-          AND [System.AreaPath] = '{area_path}'
-          AND [System.Title] CONTAINS '{title_prefix}'
+          AND [System.State] IN ('New', 'Active')
+          AND ({plan_clauses})
         """
     }
 
-    response = requests.post(
+    grouped = {plan["area_path"]: {"New": [], "Active": []} for plan in plans}
+    response = send_request(
+        "POST",
         f"{organization_url}/{project_name}/_apis/wit/wiql?api-version=6.0",
-        headers=query_headers,
         json=wiql,
     )
     if response.status_code != 200:
         print(f"❌ WIQL query failed: {response.status_code} - {response.text}")
-        return []
-    results = [item["id"] for item in response.json().get("workItems", [])]
-    print(f"📊 Found {len(results)} {work_item_type}(s) in '{state}' state")
-    return results
+        return grouped
+    ids = [item["id"] for item in response.json().get("workItems", [])]
+
+    for item in fetch_work_items(ids, ["System.State", "System.AreaPath", "System.Title"]):
+        fields = item.get("fields", {})
+        states = grouped.get(fields.get("System.AreaPath"))
+        if states is not None and fields.get("System.State") in states:
+            states[fields["System.State"]].append(item["id"])
+    for area_path, states in grouped.items():
+        print(f"📊 Found {len(states['New'])} 'New' and {len(states['Active'])} 'Active' in {area_path}")
+    return grouped
 
 
-def update_work_item_state(work_item_id, new_state):
-    payload = [{"op": "add", "path": "/fields/System.State", "value": new_state}]
+def fetch_work_items(ids, fields):
+    """Read `fields` of the given work items, `batch_limit` IDs per workitemsbatch call."""
+    items = []
+    for start in range(0, len(ids), batch_limit):
+        response = send_request(
+            "POST",
+            f"{organization_url}/{project_name}/_apis/wit/workitemsbatch?api-version=6.0",
+            json={"ids": ids[start : start + batch_limit], "fields": fields, "errorPolicy": "omit"},
+        )
+        if response.status_code != 200:
+            print(f"❌ Work item batch read failed: {response.status_code} - {response.text}")
+            continue
+        # errorPolicy=omit returns null for items deleted since the query ran.
+        items.extend(item for item in response.json().get("value", []) if item)
+    return items
+
+
+def update_work_item_states(work_item_ids, new_state):
+    """Move work items to `new_state`; returns the IDs that moved."""
     if dry_run:
-        print(f"🔍 [DRY-RUN] Would update work item {work_item_id} to '{new_state}'")
-        return
-    response = requests.patch(
-        f"{organization_url}/_apis/wit/workitems/{work_item_id}?api-version=6.0",
-        headers=patch_headers,
-        json=payload,
+        for work_item_id in work_item_ids:
+            print(f"🔍 [DRY-RUN] Would update work item {work_item_id} to '{new_state}'")
+        return list(work_item_ids)
+    operations = [
+        patch_operation(f"/_apis/wit/workitems/{work_item_id}?api-version=6.0", {"System.State": new_state})
+        for work_item_id in work_item_ids
+    ]
+    updated = []
+    for work_item_id, (code, body) in zip(work_item_ids, send_batch(operations)):
+        if code == 200:
+            print(f"➡️ Updated Work item {work_item_id} → {new_state}")
+            updated.append(work_item_id)
+        else:
+            print(f"❌ Failed to update {work_item_id}: {code} - {batch_failure(body)}")
+    return updated
+
+
+# --- Backfill ---
+# Mean days from "New" to "Active", and from "Active" to "Closed", per work item type.
+backfill_lead_days = {"User Story": (2, 5), "Epic": (7, 30)}
+
+
+def backfill_items(plans, start, end, scale):
+    """Every item a backfill from `start` to `end` (exclusive) creates, with its history.
+
+    Each day creates `pattern[day - 1] * scale` items per area path, like the daily
+    update. Items go "Active", then "Closed", after random lead times; timestamps
+    past `end` are None, leaving the item in its earlier state. Seeded by the window,
+    so a resumed run rebuilds the same items.
+    """
+    rng = random.Random(f"{project_name}|{start.isoformat()}|{end.isoformat()}|{scale}")
+    items = []
+    day = start
+    while day < end:
+        for plan in plans:
+            to_active, to_closed = backfill_lead_days[plan["work_item_type"]]
+            for i in range(plan["pattern"][day.day - 1] * scale):
+                created = day + timedelta(hours=8, seconds=rng.randint(0, 9 * 3600))
+                activated = created + timedelta(
+                    days=int(rng.expovariate(1 / to_active)), minutes=rng.randint(5, 240)
+                )
+                # Closed on a later day than activated, so no item changes twice in one day's batch.
+                closed = datetime.combine(
+                    activated.date() + timedelta(days=1 + int(rng.expovariate(1 / to_closed))),
+                    created.timetz(),
+                )
+                items.append(
+                    {
+                        "key": f"{plan['area_path']}|{day.date()}|{i + 1}",
+                        "title": f"{plan['title_prefix']} {day.date()} #{i + 1}",
+                        "area_path": plan["area_path"],
+                        "work_item_type": plan["work_item_type"],
+                        "New": created,
+                        "Active": activated if activated < end else None,
+                        "Closed": closed if closed < end else None,
+                    }
+                )
+        day += timedelta(days=1)
+    return items
+
+
+def read_progress(path, header):
+    """What an earlier run with `header` wrote, from its progress file.
+
+    Returns created IDs by item key, the (key, state) moves done, and the
+    (key, state) writes of the batch that was in flight when the file ends.
+    """
+    created, moved, pending = {}, set(), []
+    if not os.path.exists(path):
+        return created, moved, pending
+    with open(path, encoding="utf-8") as progress:
+        lines = progress.read().splitlines()
+    if lines and json.loads(lines[0]) != header:
+        print(f"❌ {path} belongs to a different backfill ({lines[0]}); remove it or pass --progress-file")
+        sys.exit(1)
+    for line in lines[1:]:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # Cut short by an interrupted run
+        if "pending" in entry:
+            pending = [tuple(write) for write in entry["pending"]]
+        elif "id" in entry:
+            created[entry["key"]] = entry["id"]
+        else:
+            moved.add((entry["key"], entry["state"]))
+    return created, moved, pending
+
+
+def timestamp(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def backfill_operation(item, state, created):
+    """The $batch sub-request that moves `item` into `state` at its backdated time."""
+    moment = timestamp(item[state])
+    if state == "New":
+        return patch_operation(
+            f"/{quote(project_name)}/_apis/wit/workitems/${quote(item['work_item_type'])}"
+            "?api-version=6.0&bypassRules=true",
+            {
+                "System.Title": item["title"],
+                "System.AreaPath": item["area_path"],
+                "System.State": "New",
+                "System.CreatedDate": moment,
+                "System.ChangedDate": moment,
+            },
+        )
+    date_field = "ActivatedDate" if state == "Active" else "ClosedDate"
+    return patch_operation(
+        f"/_apis/wit/workitems/{created[item['key']]}?api-version=6.0&bypassRules=true",
+        {"System.State": state, "System.ChangedDate": moment, f"Microsoft.VSTS.Common.{date_field}": moment},
     )
-    if response.status_code == 200:
-        print(f"➡️ Updated Work item {work_item_id} → {new_state}")
+
+
+def record(progress, created, moved, key, state, work_item_id=None):
+    if state == "New":
+        created[key] = work_item_id
+        progress.write(json.dumps({"key": key, "id": work_item_id}) + "\n")
     else:
-        print(
-            f"❌ Failed to update {work_item_id}: {response.status_code} - {response.text}"
+        moved.add((key, state))
+        progress.write(json.dumps({"key": key, "state": state}) + "\n")
+
+
+def send_backfill_writes(writes, progress, created, moved):
+    """Send (item, state) writes in batches, each announced in the progress file first.
+
+    Returns the number that failed.
+    """
+    failures = 0
+    for start in range(0, len(writes), batch_limit):
+        chunk = writes[start : start + batch_limit]
+        progress.write(json.dumps({"pending": [[item["key"], state] for item, state in chunk]}) + "\n")
+        operations = [backfill_operation(item, state, created) for item, state in chunk]
+        for (item, state), (code, body) in zip(chunk, send_batch(operations)):
+            if code in [200, 201]:
+                record(progress, created, moved, item["key"], state, body.get("id"))
+            else:
+                failures += 1
+                print(f"❌ Failed to set '{item['title']}' to '{state}': {code} - {batch_failure(body)}")
+    return failures
+
+
+def recover_pending(pending, items_by_key, progress, created, moved):
+    """Record the writes of an interrupted run's last batch that ADO applied anyway.
+
+    Creates are found by title and matched on area path and exact CreatedDate;
+    moves count as done when the item is already in the target state.
+    """
+    creates = [items_by_key[key] for key, state in pending if state == "New" and key not in created]
+    if creates:
+        titles = ", ".join(sorted({f"'{item['title']}'" for item in creates}))
+        response = send_request(
+            "POST",
+            f"{organization_url}/{project_name}/_apis/wit/wiql?api-version=6.0",
+            json={
+                "query": f"SELECT [System.Id] FROM WorkItems "
+                f"WHERE [System.TeamProject] = '{project_name}' AND [System.Title] IN ({titles})"
+            },
         )
+        ids = [item["id"] for item in response.json().get("workItems", [])] if response.status_code == 200 else []
+        wanted = {(item["area_path"], item["title"], item["New"]): item["key"] for item in creates}
+        for found in fetch_work_items(ids, ["System.Title", "System.AreaPath", "System.CreatedDate"]):
+            fields = found.get("fields", {})
+            try:
+                created_at = datetime.fromisoformat(fields["System.CreatedDate"].replace("Z", "+00:00"))
+            except (KeyError, AttributeError, ValueError):
+                continue
+            key = wanted.pop((fields.get("System.AreaPath"), fields.get("System.Title"), created_at), None)
+            if key:
+                record(progress, created, moved, key, "New", found["id"])
+
+    moves = [(key, state) for key, state in pending if state != "New" and key in created and (key, state) not in moved]
+    if moves:
+        states = {
+            found["id"]: found.get("fields", {}).get("System.State")
+            for found in fetch_work_items([created[key] for key, _ in moves], ["System.State"])
+        }
+        for key, state in moves:
+            if states.get(created[key]) == state:
+                record(progress, created, moved, key, state)
+
+
+def backfill(plans, days, scale, progress_path, end):
+    """Create `days` days of backdated history up to midnight `end`, resuming from `progress_path`.
+
+    Writes go through $batch with bypassRules, which lets System.CreatedDate and
+    System.ChangedDate be set, so every state change is a revision dated in the
+    past, as the connector reads them. Each day sends its creates, then its state
+    changes. Every batch and every success is appended to the progress file, so a
+    rerun skips finished work and reconciles the batch that was in flight.
+    """
+    header = {"project": project_name, "end": end.date().isoformat(), "days": days, "scale": scale}
+    if os.path.exists(progress_path):
+        with open(progress_path, encoding="utf-8") as progress:
+            first = progress.readline()
+        if first:
+            # A resumed run keeps the window it started with, even on a later day.
+            end = datetime.fromisoformat(json.loads(first)["end"]).replace(tzinfo=timezone.utc)
+            header["end"] = end.date().isoformat()
+    start = end - timedelta(days=days)
+
+    items = backfill_items(plans, start, end, scale)
+    print(f"\n🗓️ Backfilling {len(items)} work item(s) from {start.date()} to {(end - timedelta(days=1)).date()}")
+    if dry_run:
+        for state in ("Active", "Closed"):
+            print(f"🔍 [DRY-RUN] Would move {sum(1 for item in items if item[state])} of them to '{state}'")
+        return
+
+    created, moved, pending = read_progress(progress_path, header)
+    by_day = {}
+    for item in items:
+        for state in ("New", "Active", "Closed"):
+            if item[state]:
+                by_day.setdefault(item[state].date(), {}).setdefault(state, []).append(item)
+
+    # Line-buffered, so each success is on disk before the next batch is sent.
+    with open(progress_path, "a", encoding="utf-8", buffering=1) as progress:
+        if progress.tell() == 0:
+            progress.write(json.dumps(header) + "\n")
+        if pending:
+            recover_pending(pending, {item["key"]: item for item in items}, progress, created, moved)
+        if created:
+            print(f"⏩ Resuming: {len(created)} created and {len(moved)} state change(s) already done")
+        for day in sorted(by_day):
+            creates = [(item, "New") for item in by_day[day].get("New", []) if item["key"] not in created]
+            failures = send_backfill_writes(creates, progress, created, moved)
+            moves = [
+                (item, state)
+                for state in ("Active", "Closed")
+                for item in by_day[day].get(state, [])
+                if item["key"] in created and (item["key"], state) not in moved
+            ]
+            failures += send_backfill_writes(moves, progress, created, moved)
+            print(
+                f"📅 {day}: {len(creates)} created, {len(moves)} moved"
+                + (f", {failures} failed" if failures else "")
+                + f" ({len(created)}/{len(items)} items)"
+            )
 
 
-# --- Main loop ---
-for area_path, throughput_pattern in area_path_targets.items():
-    throughput = throughput_pattern[today_index]
-    is_portfolio = "Portfolio" in area_path
-    work_item_type = "Epic" if is_portfolio else "User Story"
-    title_prefix = "Auto-Generated Epic" if is_portfolio else "Auto-Generated"
+def print_summary():
+    print(
+        f"\n📈 {throttle['requests']} request(s), {throttle['retries']} retry(ies), "
+        f"{throttle['throttled_seconds']:.1f}s throttled"
+    )
+
 
-    print(f"\n📂 Processing area path: {area_path}")
-    print(f"📊 Target throughput for today: {throughput} {work_item_type}(s)")
+def build_plans(today_index):
+    """One plan per area path: its pattern, today's throughput and what it creates."""
+    plans = []
+    for area_path, throughput_pattern in area_path_targets.items():
+        is_portfolio = "Portfolio" in area_path
+        plans.append(
+            {
+                "area_path": area_path,
+                "pattern": throughput_pattern,
+                "throughput": throughput_pattern[today_index],
+                "work_item_type": "Epic" if is_portfolio else "User Story",
+                "title_prefix": "Auto-Generated Epic" if is_portfolio else "Auto-Generated",
+            }
+        )
+    return plans
 
+
+def daily_update(plans, display_date):
+    """Today's update. Each step covers every area path, so its writes go out as one batch."""
     # 1. Create items in "New"
-    print(f"🆕 Creating {throughput} new {work_item_type}(s)")
-    for i in range(throughput):
-        title = f"{title_prefix} {display_date} #{i + 1}"
-        create_work_item(title, area_path, work_item_type)
+    to_create = []
+    for plan in plans:
+        print(f"\n📂 {plan['area_path']}: target throughput for today: {plan['throughput']} {plan['work_item_type']}(s)")
+        for i in range(plan["throughput"]):
+            to_create.append((f"{plan['title_prefix']} {display_date} #{i + 1}", plan["area_path"], plan["work_item_type"]))
+    print(f"\n🆕 Creating {len(to_create)} new work item(s)")
+    create_work_items(to_create)
 
     # 2. Move some "New" to "Active"
-    new_items = query_work_items("New", area_path, title_prefix, work_item_type)
+    open_items = query_open_work_items(plans)
+    to_activate = {}
+    for plan in plans:
+        new_items = open_items[plan["area_path"]]["New"]
+        chosen = random.sample(new_items, random.randint(0, len(new_items)))
+        print(f"🔄 Moving {len(chosen)}/{len(new_items)} {plan['work_item_type']}(s) in {plan['area_path']} from 'New' to 'Active'")
+        to_activate[plan["area_path"]] = chosen
+    activated = set(update_work_item_states([i for chosen in to_activate.values() for i in chosen], "Active"))
+
+    # 3. Move some "Active" to "Closed" (including those activated just now)
+    to_close = []
+    for plan in plans:
+        just_activated = [i for i in to_activate[plan["area_path"]] if i in activated]
+        active_items = open_items[plan["area_path"]]["Active"] + just_activated
+        chosen = random.sample(active_items, random.randint(0, len(active_items)))
+        print(f"✅ Moving {len(chosen)}/{len(active_items)} {plan['work_item_type']}(s) in {plan['area_path']} from 'Active' to 'Closed'")
+        to_close.extend(chosen)
+    update_work_item_states(to_close, "Closed")
 
-    random_count = random.randint(0, len(new_items))
-    to_activate = random.sample(new_items, random_count)
-    print(f"🔄 Moving {len(to_activate)}/{len(new_items)} {work_item_type}(s) from 'New' to 'Active'")
 
-    for item_id in to_activate:
-        update_work_item_state(item_id, "Active")
+def main(argv=None):
+    global organization_url
+
+    # --- Parse token ---
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "personal_access_token", type=str, help="Azure DevOps Personal Access Token"
+    )
+    parser.add_argument(
+        "--backfill", type=int, metavar="DAYS", help="Generate DAYS days of backdated history instead of today's update"
+    )
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Multiply each day's throughput in --backfill mode (default: 1)"
+    )
+    parser.add_argument(
+        "--progress-file", default="ado_backfill_progress.jsonl", help="Where --backfill records progress, to resume after a failure"
+    )
+    parser.add_argument(
+        "--organization-url", default=organization_url, help="Organization URL, e.g. ado_stand_in.py"
+    )
+    args = parser.parse_args(argv)
+    organization_url = args.organization_url.rstrip("/")
+
+    token_bytes = f":{args.personal_access_token}".encode("ascii")
+    base64_encoded_token = base64.b64encode(token_bytes).decode("ascii")
+    session.headers.update({"Authorization": f"Basic {base64_encoded_token}"})
+
+    today = datetime.now(timezone.utc)
+    today_index = today.day - 1
+    display_date = today.strftime("%Y-%m-%d")
+    print(f"🔄 Running ADO System Updater on {display_date} (day index: {today_index})")
+
+    plans = build_plans(today_index)
+    if args.backfill:
+        midnight = today.replace(hour=0, minute=0, second=0, microsecond=0)
+        backfill(plans, args.backfill, args.scale, args.progress_file, midnight)
+        print_summary()
+        print("\n🏁 ADO backfill complete!")
+        return
 
-    # 3. Move some "Active" to "Closed"
-    active_items = query_work_items("Active", area_path, title_prefix, work_item_type)
-    random_count = random.randint(0, len(active_items))
-    to_close = random.sample(active_items, random_count)
-    print(f"✅ Moving {len(to_close)}/{len(active_items)} {work_item_type}(s) from 'Active' to 'Closed'")
+    daily_update(plans, display_date)
+    print_summary()
+    print("\n🏁 ADO System Update complete!")
 
-    for item_id in to_close:
-        update_work_item_state(item_id, "Closed")
 
-print("\n🏁 ADO System Update complete!")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""A minimal local stand-in for the Azure DevOps work item REST calls ADOSystemUpdater.py makes.
+
+Serves `_apis/wit/$batch` (creates and updates), the two WIQL queries the updater
+sends, and `workitemsbatch`, keeping work items and their revisions in memory.
+Like ADO, it rejects writes to System.CreatedDate / System.ChangedDate unless the
+request carries `bypassRules=true`.
+
+    python3 ado_stand_in.py 8089
+    python3 ADOSystemUpdater.py any-token --organization-url http://127.0.0.1:8089 --backfill 30
+
+Tests start it in-process with `start()`; `drop_batch_after` makes it apply one
+$batch and then drop the connection without replying (an interrupted run),
+`short_replies` leaves the last sub-requests of a $batch reply unanswered,
+`throttled` holds (status, headers) replies, such as a 429 with Retry-After,
+sent instead of serving the next requests, and `rate_limit` adds headers
+such as X-RateLimit-Delay to every served reply.
+"""
+
+import json
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+DATED_FIELDS = ("System.CreatedDate", "System.ChangedDate")
+
+
+class StandIn:
+    def __init__(self):
+        self.items = {}
+        self.revisions = {}
+        self.batches = []
+        self.next_id = 1000
+        self.drop_batch_after = None
+        self.short_replies = 0
+        self.throttled = []
+        self.rate_limit = {}
+        self.lock = threading.Lock()
+
+    def write(self, uri, operations):
+        """Apply one create or update sub-request; returns (code, body)."""
+        parsed = urlparse(uri)
+        path = unquote(parsed.path)
+        bypass = parse_qs(parsed.query).get("bypassRules") == ["true"]
+        fields = {operation["path"].rsplit("/", 1)[-1]: operation["value"] for operation in operations}
+        if not bypass and any(field in fields for field in DATED_FIELDS):
+            return 400, {"message": "TF401326: Invalid field status 'ReadOnly' for a dated field; bypassRules is required"}
+        created = re.search(r"/workitems/\$(.+)$", path)
+        if created:
+            self.next_id += 1
+            work_item_id = self.next_id
+            self.items[work_item_id] = {"System.WorkItemType": created.group(1)}
+            self.revisions[work_item_id] = []
+        else:
+            work_item_id = int(path.rsplit("/", 1)[-1])
+            if work_item_id not in self.items:
+                return 404, {"message": f"TF401232: Work item {work_item_id} does not exist"}
+        self.items[work_item_id].update(fields)
+        self.revisions[work_item_id].append(dict(self.items[work_item_id]))
+        return 200, {"id": work_item_id, "fields": self.items[work_item_id]}
+
+    def query(self, wiql):
+        """IDs for the title lookup or the open-items query the updater sends."""
+        if "[System.Title] IN" in wiql:
+            titles = set(re.findall(r"'([^']*)'", wiql.split("[System.Title] IN", 1)[1]))
+            return [i for i, fields in self.items.items() if fields.get("System.Title") in titles]
+        states = re.findall(r"'([^']*)'", wiql.split("[System.State] IN", 1)[1].split(")", 1)[0])
+        plans = re.findall(
+            r"\[System.AreaPath\] = '([^']*)' AND \[System.WorkItemType\] = '([^']*)'"
+            r" AND \[System.Title\] CONTAINS '([^']*)'",
+            wiql,
+        )
+        return [
+            i
+            for i, fields in self.items.items()
+            if fields.get("System.State") in states
+            and any(
+                fields.get("System.AreaPath") == area_path
+                and fields.get("System.WorkItemType") == work_item_type
+                and prefix in fields.get("System.Title", "")
+                for area_path, work_item_type, prefix in plans
+            )
+        ]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, code, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (self.server.state.rate_limit if headers is None else headers).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        state = self.server.state
+        path = unquote(urlparse(self.path).path)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+        with state.lock:
+            if state.throttled:
+                code, headers = state.throttled.pop(0)
+                self.reply(code, {"message": f"TF400733: Request throttled ({code})"}, headers)
+            elif path.endswith("/_apis/wit/$batch"):
+                state.batches.append(body)
+                values = []
+                for operation in body:
+                    code, result = state.write(operation["uri"], operation["body"])
+                    values.append({"code": code, "headers": {}, "body": json.dumps(result)})
+                if state.drop_batch_after is not None and len(state.batches) > state.drop_batch_after:
+                    state.drop_batch_after = None
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+                values = values[: len(values) - state.short_replies]
+                self.reply(200, {"count": len(values), "value": values})
+            elif path.endswith("/_apis/wit/wiql"):
+                self.reply(200, {"workItems": [{"id": i} for i in state.query(body["query"])]})
+            elif path.endswith("/_apis/wit/workitemsbatch"):
+                fields = body.get("fields", [])
+                value = [
+                    {"id": i, "fields": {field: state.items[i].get(field) for field in fields}}
+                    if i in state.items
+                    else None
+                    for i in body["ids"]
+                ]
+                self.reply(200, {"count": len(value), "value": value})
+            else:
+                self.reply(404, {"message": f"Not served by the stand-in: {path}"})
+
+
+def start(port=0):
+    """Serve on 127.0.0.1:`port` (0 picks one) from a daemon thread; returns the server.
+
+    `server.state` is the StandIn, `server.url` the organization URL to pass the
+    updater, and `server.shutdown()` stops it.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.state = StandIn()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", int(sys.argv[1]) if len(sys.argv) > 1 else 8089), Handler)
+    server.state = StandIn()
+    print(f"ADO stand-in on http://127.0.0.1:{server.server_address[1]}")
+    server.serve_forever()
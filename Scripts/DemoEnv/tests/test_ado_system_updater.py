@@ -0,0 +1,310 @@
+import io
+import json
+import shutil
+import sys
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import ADOSystemUpdater as updater  # noqa: E402
+import ado_stand_in  # noqa: E402
+
+END = datetime(2026, 3, 10, tzinfo=timezone.utc)
+DAYS = 6
+
+
+def _plans():
+    return [plan for plan in updater.build_plans(END.day - 1) if "Portfolio" not in plan["area_path"]][:2]
+
+
+class StandInTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = ado_stand_in.start()
+        self.ado = self.server.state
+        self.organization_url = updater.organization_url
+        updater.organization_url = self.server.url
+        updater.throttle.update(requests=0, retries=0, throttled_seconds=0.0, pause=0.0)
+        self.tmp = HERE / "_tmp_ado_updater"
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        self.tmp.mkdir()
+        self.progress_path = str(self.tmp / "progress.jsonl")
+
+    def tearDown(self):
+        updater.organization_url = self.organization_url
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def backfill(self, plans):
+        with redirect_stdout(io.StringIO()):
+            updater.backfill(plans, DAYS, 1, self.progress_path, END)
+
+    def expected_items(self, plans):
+        start = END - timedelta(days=DAYS)
+        return updater.backfill_items(plans, start, END, 1)
+
+    def stored(self):
+        """Stand-in work items by (area path, title), which is unique per backfill."""
+        return {(fields["System.AreaPath"], fields["System.Title"]): (i, fields) for i, fields in self.ado.items.items()}
+
+
+def _final_state(item):
+    return "Closed" if item["Closed"] else "Active" if item["Active"] else "New"
+
+
+class BackfillTests(StandInTestCase):
+    def test_writes_dated_revisions_through_bypass_rules(self):
+        plans = _plans()
+        self.backfill(plans)
+        operations = [operation for batch in self.ado.batches for operation in batch]
+        self.assertTrue(operations)
+        self.assertTrue(all("bypassRules=true" in operation["uri"] for operation in operations))
+
+        expected = self.expected_items(plans)
+        stored = self.stored()
+        self.assertEqual(len(self.ado.items), len(expected))
+        for item in expected:
+            work_item_id, fields = stored[item["area_path"], item["title"]]
+            self.assertEqual(fields["System.State"], _final_state(item))
+            dated = [revision["System.ChangedDate"] for revision in self.ado.revisions[work_item_id]]
+            states = ["New", "Active", "Closed"][: len(dated)]
+            self.assertEqual(dated, [updater.timestamp(item[state]) for state in states])
+            self.assertEqual(fields["System.CreatedDate"], updater.timestamp(item["New"]))
+
+    def test_stand_in_rejects_dated_writes_without_bypass_rules(self):
+        operation = updater.backfill_operation(self.expected_items(_plans())[0], "New", {})
+        operation["uri"] = operation["uri"].replace("&bypassRules=true", "")
+        with redirect_stdout(io.StringIO()):
+            ((code, body),) = list(updater.send_batch([operation]))
+        self.assertEqual(code, 400)
+        self.assertIn("bypassRules", body["message"])
+
+    def test_interrupted_run_resumes_from_the_progress_file_without_duplicates(self):
+        plans = _plans()
+        self.ado.drop_batch_after = 2
+        with self.assertRaises(requests.ConnectionError):
+            self.backfill(plans)
+        with open(self.progress_path, encoding="utf-8") as progress:
+            lines = [json.loads(line) for line in progress]
+        self.assertEqual(lines[0], {"project": updater.project_name, "end": "2026-03-10", "days": DAYS, "scale": 1})
+        # The dropped batch was applied by the stand-in but only announced in the file.
+        self.assertIn("pending", lines[-1])
+
+        self.backfill(plans)
+        expected = self.expected_items(plans)
+        stored = self.stored()
+        self.assertEqual(len(self.ado.items), len(expected))
+        for item in expected:
+            self.assertEqual(stored[item["area_path"], item["title"]][1]["System.State"], _final_state(item))
+
+        batches = len(self.ado.batches)
+        self.backfill(plans)
+        self.assertEqual(len(self.ado.batches), batches)
+
+    def test_progress_file_of_another_backfill_is_refused(self):
+        with open(self.progress_path, "w", encoding="utf-8") as progress:
+            progress.write(json.dumps({"project": "Other", "end": "2026-03-10", "days": 1, "scale": 1}) + "\n")
+        with self.assertRaises(SystemExit), redirect_stdout(io.StringIO()):
+            updater.read_progress(self.progress_path, {"project": updater.project_name})
+
+
+class SendBatchTests(StandInTestCase):
+    def test_sub_requests_missing_from_the_reply_are_failures(self):
+        self.ado.short_replies = 1
+        first, second = self.expected_items(_plans())[:2]
+        operations = [updater.backfill_operation(item, "New", {}) for item in (first, second)]
+        output = io.StringIO()
+        with redirect_stdout(output):
+            results = list(updater.send_batch(operations))
+        self.assertEqual([code for code, _ in results], [200, None])
+        self.assertIn("answered 1 of 2", output.getvalue())
+
+    def test_unanswered_backfill_writes_are_counted_and_not_recorded(self):
+        self.ado.short_replies = 1
+        first, second = self.expected_items(_plans())[:2]
+        created, moved, progress = {}, set(), io.StringIO()
+        with redirect_stdout(io.StringIO()):
+            failures = updater.send_backfill_writes([(first, "New"), (second, "New")], progress, created, moved)
+        self.assertEqual(failures, 1)
+        self.assertEqual(list(created), [first["key"]])
+
+
+class DailyUpdateTests(StandInTestCase):
+    def setUp(self):
+        super().setUp()
+        self.plans = _plans()
+        for plan in self.plans:
+            plan["throughput"] = 2
+        self.seeded = {}
+        for plan in self.plans:
+            for state in ("New", "New", "Active", "Active", "Closed"):
+                self.seeded.setdefault((plan["area_path"], state), []).append(
+                    self.seed(plan["area_path"], plan["work_item_type"], f"{plan['title_prefix']} seeded", state)
+                )
+        area_path, work_item_type = self.plans[0]["area_path"], self.plans[0]["work_item_type"]
+        self.untouched = [
+            self.seed(area_path, work_item_type, "Hand-made story", "New"),
+            self.seed(area_path, "Epic", f"{self.plans[0]['title_prefix']} epic", "Active"),
+            self.seed("Lighthouse Demo\\Elsewhere", work_item_type, "Auto-Generated elsewhere", "New"),
+        ]
+
+    def seed(self, area_path, work_item_type, title, state):
+        operation = updater.patch_operation(
+            f"/{updater.project_name}/_apis/wit/workitems/${work_item_type}?api-version=6.0",
+            {"System.Title": title, "System.AreaPath": area_path, "System.State": state},
+        )
+        code, body = self.ado.write(operation["uri"], operation["body"])
+        self.assertEqual(code, 200)
+        return body["id"]
+
+    def states(self, work_item_id):
+        """The states an item went through, one entry per change."""
+        states = []
+        for revision in self.ado.revisions[work_item_id]:
+            if not states or states[-1] != revision["System.State"]:
+                states.append(revision["System.State"])
+        return states
+
+    def test_open_items_are_grouped_by_area_path_and_state(self):
+        with redirect_stdout(io.StringIO()):
+            grouped = updater.query_open_work_items(self.plans)
+        self.assertEqual(
+            {area_path: {state: sorted(ids) for state, ids in states.items()} for area_path, states in grouped.items()},
+            {
+                plan["area_path"]: {state: self.seeded[plan["area_path"], state] for state in ("New", "Active")}
+                for plan in self.plans
+            },
+        )
+
+    def test_two_runs_move_items_forward_one_batch_per_step(self):
+        # Every draw moves all candidates, lowest IDs first, so each step has writes.
+        with mock.patch.object(updater.random, "randint", lambda low, high: high), mock.patch.object(
+            updater.random, "sample", lambda population, k: sorted(population)[:k]
+        ), redirect_stdout(io.StringIO()):
+            updater.daily_update(self.plans, "2026-03-09")
+            self.assertEqual(len(self.ado.batches), 3)
+            updater.daily_update(self.plans, "2026-03-10")
+        self.assertEqual(len(self.ado.batches), 6)
+        self.assertEqual([len(batch) for batch in self.ado.batches[::3]], [4, 4])
+
+        seeded_state = {i: state for (_, state), ids in self.seeded.items() for i in ids}
+        generated = [i for i in self.ado.items if i not in seeded_state and i not in self.untouched]
+        self.assertEqual(len(generated), 8)
+        order = ["New", "Active", "Closed"]
+        for work_item_id in self.ado.items:
+            states = self.states(work_item_id)
+            if work_item_id in self.untouched or seeded_state.get(work_item_id) == "Closed":
+                self.assertEqual(len(self.ado.revisions[work_item_id]), 1)
+                continue
+            self.assertEqual(states[0], seeded_state.get(work_item_id, "New"))
+            # Each change moves one state forward; the last run closes everything left open.
+            self.assertEqual(states, order[order.index(states[0]) :])
+
+
+class ThrottleTests(StandInTestCase):
+    def setUp(self):
+        super().setUp()
+        sleep = mock.patch.object(updater.time, "sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def create(self, count=1):
+        items = self.expected_items(_plans())[:count]
+        with redirect_stdout(io.StringIO()):
+            return list(updater.send_batch([updater.backfill_operation(item, "New", {}) for item in items]))
+
+    def slept(self):
+        return [call.args[0] for call in self.sleep.call_args_list]
+
+    def test_retry_after_is_waited_out_before_retrying(self):
+        self.ado.throttled = [(429, {"Retry-After": "2"}), (503, {"Retry-After": "1"})]
+        self.assertEqual([code for code, _ in self.create()], [200])
+        self.assertEqual(self.slept(), [2.0, 1.0])
+        self.assertEqual(len(self.ado.items), 1)
+        self.assertEqual(
+            {key: updater.throttle[key] for key in ("requests", "retries", "throttled_seconds")},
+            {"requests": 3, "retries": 2, "throttled_seconds": 3.0},
+        )
+
+    def test_throttling_without_retry_after_backs_off_exponentially(self):
+        self.ado.throttled = [(503, {}), (429, {}), (429, {})]
+        self.assertEqual([code for code, _ in self.create()], [200])
+        self.assertEqual(self.slept(), [1.0, 2.0, 4.0])
+        self.assertEqual(updater.throttle["retries"], 3)
+
+    def test_gives_up_after_max_retries(self):
+        self.ado.throttled = [(429, {"Retry-After": "1"})] * (updater.max_retries + 2)
+        results = self.create(2)
+        self.assertEqual([code for code, _ in results], [429, 429])
+        self.assertEqual(self.ado.items, {})
+        self.assertEqual(updater.throttle["requests"], updater.max_retries + 1)
+        self.assertEqual(updater.throttle["retries"], updater.max_retries)
+        self.assertEqual(updater.throttle["throttled_seconds"], float(updater.max_retries))
+
+    def test_rate_limit_delay_paces_the_next_request(self):
+        self.ado.rate_limit = {"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "5", "X-RateLimit-Delay": "3"}
+        self.create()
+        self.assertEqual(updater.throttle["pause"], 3.0)
+        self.ado.rate_limit = {}
+        self.create()
+        self.create()
+        # Paced by the delay once, then the pause halves while ADO stops pushing back.
+        self.assertEqual(self.slept(), [3.0, 1.5])
+        self.assertEqual(updater.throttle["retries"], 0)
+        self.assertEqual(len(self.ado.items), 3)
+
+    def test_retry_after_accepts_seconds_and_http_dates(self):
+        self.assertEqual(updater.retry_after_seconds("5"), 5.0)
+        self.assertEqual(updater.retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(updater.retry_after_seconds("soon"))
+        self.assertIsNone(updater.retry_after_seconds(None))
+
+
+class RecoverPendingTests(StandInTestCase):
+    def apply(self, item, state, created):
+        code, body = self.ado.write(
+            updater.backfill_operation(item, state, created)["uri"],
+            updater.backfill_operation(item, state, created)["body"],
+        )
+        self.assertEqual(code, 200)
+        return body["id"]
+
+    def test_records_the_writes_ado_applied_and_nothing_else(self):
+        first, second, third = [item for item in self.expected_items(_plans()) if item["Active"]][:3]
+        known = {third["key"]: self.apply(third, "New", {})}
+        applied_create = self.apply(first, "New", {})
+        self.apply(third, "Active", known)
+        # Same title in the same area path but another creation time: not this run's item.
+        stray = dict(second, New=second["New"] + timedelta(minutes=1))
+        self.apply(stray, "New", {})
+
+        created, moved = dict(known), set()
+        pending = [(first["key"], "New"), (second["key"], "New"), (third["key"], "Active"), (third["key"], "Closed")]
+        items_by_key = {item["key"]: item for item in (first, second, third)}
+        progress = io.StringIO()
+        updater.recover_pending(pending, items_by_key, progress, created, moved)
+
+        self.assertEqual(created, {**known, first["key"]: applied_create})
+        self.assertEqual(moved, {(third["key"], "Active")})
+        self.assertEqual(
+            [json.loads(line) for line in progress.getvalue().splitlines()],
+            [{"key": first["key"], "id": applied_create}, {"key": third["key"], "state": "Active"}],
+        )
+
+
+class MainTests(unittest.TestCase):
+    def test_importing_has_no_side_effects_and_main_parses_arguments(self):
+        self.assertNotIn("Authorization", updater.session.headers)
+        with self.assertRaises(SystemExit), mock.patch("sys.stderr", io.StringIO()):
+            updater.main([])
+
+
+if __name__ == "__main__":
+    unittest.main()
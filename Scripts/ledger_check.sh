@@ -2,6 +2,11 @@
 # PreToolUse hook wrapper: cheap prefilter so only `git commit` commands pay the
 # Python startup. The tool-call JSON arrives on stdin; forward it to the checker
 # only when it is a commit, otherwise allow immediately.
+#
+# When the resident checker is up (`python3 Scripts/ledger_check.py --serve`),
+# the commit is checked over its Unix socket instead, skipping interpreter
+# start-up. No daemon, no `nc`/`socat`, or no usable reply: run the one-shot
+# script as before.
 set -euo pipefail
 
 input=$(cat)
@@ -13,4 +18,29 @@ case "$input" in
 esac
 
 root="${CLAUDE_PROJECT_DIR:-$(git rev-parse --show-toplevel 2>/dev/null)}"
+socket="$root/.cache/ledger-check/daemon.sock"
+
+if [ -S "$socket" ]; then
+	reply=""
+	if command -v socat >/dev/null 2>&1; then
+		reply=$({ printf '%s' "$input"; printf '\0'; } | socat - "UNIX-CONNECT:$socket" 2>/dev/null) || reply=""
+	elif command -v nc >/dev/null 2>&1; then
+		reply=$({ printf '%s' "$input"; printf '\0'; } | nc -U "$socket" 2>/dev/null) || reply=""
+	fi
+	status=${reply%%$'\n'*}
+	case "$status" in
+	'' | *[!0-9]*) ;;
+	*)
+		message=""
+		case "$reply" in
+		*$'\n'*) message=${reply#*$'\n'} ;;
+		esac
+		if [ -n "$message" ]; then
+			printf '%s\n' "$message" >&2
+		fi
+		exit "$status"
+		;;
+	esac
+fi
+
 printf '%s' "$input" | python3 "$root/Scripts/ledger_check.py"
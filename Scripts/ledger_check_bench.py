@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Benchmark for ``ledger_check.py`` on synthetic diffs and rulesets.
+
+Generates unified diffs of ``--lines`` added lines spread over ``.cs``,
+``.ts`` and ``.tsx`` files, and ledgers of ``--rules`` patterns shaped like
+the real ones, then times each stage of the hook on its own:
+
+- ``load_checks``: parsing the ledger (cold), and the cached path (warm);
+- ``added_lines``: splitting the diff into added lines;
+- match loop: ``scan_line`` over every added line with a fresh matcher, so
+  bucket compilation is included.
+
+Peak Python heap per stage (``tracemalloc``) is taken in a second pass so
+tracing does not distort the timings; ``--no-memory`` skips it. Results go to
+a JSON file (default ``.cache/ledger-check/bench.json``); ``--compare`` prints
+each case's timings against an earlier one, so matcher changes are judged by
+numbers. The full default matrix (up to 1M lines x 500 rules) runs for a long
+time; pass a subset of ``--lines`` / ``--rules`` for a quick check.
+
+    python3 Scripts/ledger_check_bench.py --lines 1000 100000 --rules 10 500
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ledger_check  # noqa: E402
+
+DEFAULT_LINES = (1000, 10000, 100000, 1000000)
+DEFAULT_RULES = (10, 50, 200, 500)
+DEFAULT_OUTPUT = os.path.join(".cache", "ledger-check", "bench.json")
+LINES_PER_FILE = 2000
+# One added line in this many is built to hit a rule.
+HIT_EVERY = 97
+
+# Pattern shapes taken from the real ledger: literal member calls, negated
+# ternaries, anchored declarations and word-boundary property access.
+RULE_TEMPLATES = (
+    ("cs", r"Is\.EqualTo\(Value{n}\)", "Assert.That(x, Is.EqualTo(Value{n}));"),
+    ("cs", r"(Is|Does|Has)\.\w+{n}\(new\[\]", "Assert.That(y, Has.Member{n}(new[] {{ 1 }}));"),
+    ("cs", r"^\s*public\s+static\s+IEnumerable<Case{n}>", "    public static IEnumerable<Case{n}> Cases()"),
+    ("cs", r"Assert\.That\(\w+\.(Count|Length{n})\b", "Assert.That(items.Length{n}, Is.Zero);"),
+    ("ts,tsx", r"(!==|!=)\s*(undefined|null)\s*\?\s*flag{n}", "const a = b !== undefined ? flag{n} : c;"),
+    ("ts,tsx", r"\bwindow\.legacy{n}\b", "window.legacy{n}.init();"),
+    ("tsx", r"<Legacy{n}Component\b", "return <Legacy{n}Component open />;"),
+)
+
+FILLER = {
+    ".cs": (
+        "        var total{i} = items.Where(x => x.Id > {i}).Sum(x => x.Value);",
+        "        _logger.LogInformation(\"Processed {{Count}} items\", {i});",
+        "    public async Task<Result{i}> HandleAsync(Request request, CancellationToken ct)",
+        "        Assert.That(result.Items, Has.Count.EqualTo({i}));",
+        "    }}",
+    ),
+    ".ts": (
+        "export const value{i} = items.filter((item) => item.id > {i}).length;",
+        "  if (response.status === {i}) {{ return undefined; }}",
+        "import {{ helper{i} }} from \"../utils/helpers\";",
+        "}}",
+    ),
+    ".tsx": (
+        "      <Box sx={{{{ padding: {i} }}}} data-testid=\"row-{i}\">",
+        "  const [state{i}, setState{i}] = useState<number>({i});",
+        "      {{items.map((item) => <Row key={{item.id}} item={{item}} />)}}",
+        "    </Box>",
+    ),
+}
+
+
+def synthetic_ledger(rule_count):
+    """Ledger markdown with ``rule_count`` LEDGER-CHECKS, plus one matching line per rule."""
+    lines = ["# Synthetic ledger", "", ledger_check.START]
+    samples = []
+    for n in range(rule_count):
+        extensions, pattern, sample = RULE_TEMPLATES[n % len(RULE_TEMPLATES)]
+        rule = f"bench:R{n}"
+        lines.append(
+            ledger_check.DELIM.join(
+                [rule, extensions, pattern.replace("{n}", str(n)), f"Fix {rule}."]
+            )
+        )
+        exts = [f".{ext}" for ext in extensions.split(",")]
+        samples.append((exts, sample.format(n=n)))
+    lines += [ledger_check.END, ""]
+    return "\n".join(lines), samples
+
+
+def synthetic_diff(line_count, samples):
+    """Unified diff lines adding ``line_count`` lines over .cs/.ts/.tsx files."""
+    suffixes = (".cs", ".ts", ".tsx")
+    diff = []
+    written = 0
+    file_number = 0
+    while written < line_count:
+        suffix = suffixes[file_number % len(suffixes)]
+        path = f"src/Module{file_number // len(suffixes)}/File{file_number}{suffix}"
+        count = min(LINES_PER_FILE, line_count - written)
+        diff += [
+            f"diff --git a/{path} b/{path}",
+            "new file mode 100644",
+            "index 0000000..1111111",
+            "--- /dev/null",
+            f"+++ b/{path}",
+            f"@@ -0,0 +1,{count} @@",
+        ]
+        hits = [sample for exts, sample in samples if suffix in exts] or [None]
+        filler = FILLER[suffix]
+        for offset in range(count):
+            i = written + offset
+            if i % HIT_EVERY == 0 and hits[0] is not None:
+                diff.append("+" + hits[(i // HIT_EVERY) % len(hits)])
+            else:
+                diff.append("+" + filler[i % len(filler)].format(i=i))
+        written += count
+        file_number += 1
+    return diff
+
+
+def _timed(function, *args):
+    import time
+
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def _peak(function, *args):
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _match_all(checks, added):
+    matcher = ledger_check.build_matcher(checks)
+    findings = 0
+    for path, lineno, content in added:
+        if ledger_check._is_scanned(matcher, path):
+            findings += len(ledger_check.scan_line(matcher, path, lineno, content))
+    return findings
+
+
+def run_case(line_count, rule_count, directory, memory=True):
+    """Timings (and peaks) for one diff size and ruleset size."""
+    text, samples = synthetic_ledger(rule_count)
+    ledger_path = os.path.join(directory, f"ledger-{rule_count}.md")
+    cache_path = os.path.join(directory, f"checks-{rule_count}.json")
+    with open(ledger_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+    checks, load_cold = _timed(ledger_check.load_checks, ledger_path, cache_path)
+    _, load_warm = _timed(ledger_check.load_checks, ledger_path, cache_path)
+    if len(checks) != rule_count:
+        raise RuntimeError(f"ledger parsed {len(checks)} of {rule_count} rules")
+
+    diff = synthetic_diff(line_count, samples)
+    added, parse_seconds = _timed(lambda: list(ledger_check.added_lines(diff)))
+    findings, match_seconds = _timed(_match_all, checks, added)
+
+    result = {
+        "lines": line_count,
+        "rules": rule_count,
+        "diff_bytes": sum(len(line) + 1 for line in diff),
+        "findings": findings,
+        "load_checks_cold_s": round(load_cold, 6),
+        "load_checks_warm_s": round(load_warm, 6),
+        "added_lines_s": round(parse_seconds, 6),
+        "added_lines_per_s": round(len(added) / parse_seconds) if parse_seconds else None,
+        "match_s": round(match_seconds, 6),
+        "match_lines_per_s": round(len(added) / match_seconds) if match_seconds else None,
+    }
+    if memory:
+        result["peak_bytes"] = {
+            "load_checks": _peak(ledger_check.load_checks, ledger_path),
+            "added_lines": _peak(lambda: list(ledger_check.added_lines(diff))),
+            "match": _peak(_match_all, checks, added),
+        }
+    return result
+
+
+def render_case(result, baseline=None):
+    line = (
+        f"{result['lines']:>8} lines {result['rules']:>4} rules  "
+        f"load {result['load_checks_cold_s'] * 1000:7.2f}/{result['load_checks_warm_s'] * 1000:5.2f} ms  "
+        f"parse {result['added_lines_s']:7.3f} s  match {result['match_s']:7.3f} s  "
+        f"({result['match_lines_per_s'] or 0:,} lines/s, {result['findings']} findings)"
+    )
+    if "peak_bytes" in result:
+        peak = max(result["peak_bytes"].values()) / (1024 * 1024)
+        line += f"  peak {peak:.1f} MiB"
+    if baseline:
+        ratios = [
+            f"{key[:-2]} x{result[key] / baseline[key]:.2f}"
+            for key in ("added_lines_s", "match_s")
+            if baseline.get(key)
+        ]
+        line += "  vs baseline: " + ", ".join(ratios)
+    return line
+
+
+def main(argv=None):
+    import argparse
+    import json
+    import platform
+    import tempfile
+    from datetime import datetime, timezone
+
+    parser = argparse.ArgumentParser(
+        description="Time ledger_check's stages on synthetic diffs and rulesets."
+    )
+    parser.add_argument("--lines", type=int, nargs="+", default=list(DEFAULT_LINES))
+    parser.add_argument("--rules", type=int, nargs="+", default=list(DEFAULT_RULES))
+    parser.add_argument(
+        "--output", default=DEFAULT_OUTPUT, help=f"Results JSON (default {DEFAULT_OUTPUT})."
+    )
+    parser.add_argument(
+        "--compare", default=None, help="Earlier results JSON to compare timings against."
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass."
+    )
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        try:
+            with open(args.compare, encoding="utf-8") as handle:
+                for case in json.load(handle)["results"]:
+                    baseline[(case["lines"], case["rules"])] = case
+        except (OSError, ValueError, KeyError) as error:
+            print(f"error: cannot read baseline {args.compare}: {error}", file=sys.stderr)
+            return 1
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rule_count in args.rules:
+            for line_count in args.lines:
+                result = run_case(line_count, rule_count, directory, not args.no_memory)
+                results.append(result)
+                print(render_case(result, baseline.get((line_count, rule_count))), flush=True)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+        handle.write("\n")
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""Select the backend test classes a change can affect, from a C# type-reference index.
+
+``path-classifier.sh`` only decides which connector *integration* categories a
+diff touches; any other backend change still runs every unit test. This tool
+indexes ``Lighthouse.Backend`` and ``Lighthouse.Backend.Tests`` — namespace,
+declared types, ``using`` lines and referenced identifiers per file — into a
+reverse dependency graph, and turns ``git diff --name-only`` into the smallest
+``dotnet test --filter`` covering the affected test classes.
+
+The index is a regex-level approximation, not a compiler: a file depends on
+every file declaring a type name it mentions (narrowed by namespace
+visibility when the name is declared more than once). It over-selects rather
+than under-selects, and anything it cannot reason about falls back to the
+full run:
+
+  - shared files: ``Program.cs``, ``*.csproj``, ``*.sln``, ``Directory.Build.props``,
+    ``GlobalUsings.cs``
+  - any non-``.cs`` file under the backend projects (settings, fixtures, certs)
+  - the migration projects, which are not indexed
+
+The index lives on disk and is refreshed incrementally: files whose size and
+mtime are unchanged are not re-read, and re-read files whose content hash is
+unchanged are not re-parsed.
+
+Output: the filter expression on stdout. When the full suite must run, or no
+test depends on the change (the mode and reason go to stderr), it is just
+``--base-filter`` — an empty line without one — so passing it straight to
+``dotnet test`` is always safe and never runs categories the base filter
+excludes. ``--json`` prints the full decision.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+import impact_cache
+from impact_cache import iter_files, load_index, save_index
+
+INDEX_VERSION = 1
+BACKEND_DIR = "Lighthouse.Backend"
+INDEXED_PROJECTS = (
+    f"{BACKEND_DIR}/Lighthouse.Backend",
+    f"{BACKEND_DIR}/Lighthouse.Backend.Tests",
+)
+TEST_PROJECT = f"{BACKEND_DIR}/Lighthouse.Backend.Tests"
+SKIPPED_DIR_NAMES = {"bin", "obj", "TestResults", "node_modules", "wwwroot"}
+SHARED_FILE_PATTERN = re.compile(
+    r"(^|/)(Program\.cs|GlobalUsings\.cs|Directory\.Build\.(props|targets))$"
+    r"|\.(csproj|sln)$"
+)
+
+COMMENT_PATTERN = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+STRING_PATTERN = re.compile(r'@"(?:[^"]|"")*"|"(?:\\.|[^"\\\n])*"')
+NAMESPACE_PATTERN = re.compile(
+    r"^\s*namespace\s+([A-Za-z_][A-Za-z0-9_.]*)\s*[;{]", re.MULTILINE
+)
+USING_PATTERN = re.compile(
+    r"^\s*(?:global\s+)?using\s+(?:static\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*;",
+    re.MULTILINE,
+)
+TYPE_MODIFIERS = (
+    "public|internal|private|protected|sealed|static|abstract|partial|readonly|file|unsafe|new"
+)
+TYPE_DECLARATION_PATTERN = re.compile(
+    rf"^[ \t]*((?:(?:{TYPE_MODIFIERS})\s+)*)"
+    r"(?:class|record(?:\s+(?:class|struct))?|struct|interface|enum)\s+"
+    r"([A-Za-z_][A-Za-z0-9_]*)(?:\s*<[^>{]*>)?(?:\s*\([^){]*\))?"
+    r"(?:\s*:\s*([A-Za-z_][A-Za-z0-9_.]*))?",
+    re.MULTILINE,
+)
+IDENTIFIER_PATTERN = re.compile(r"\b[A-Z][A-Za-z0-9_]*\b")
+TEST_ATTRIBUTE_PATTERN = re.compile(
+    r"\[\s*(?:[A-Za-z_.]+\s*,\s*)*(?:Test|TestCase|TestCaseSource|Theory)\b"
+)
+
+
+def parse_cs(content: str) -> dict[str, object]:
+    """Extract the per-file facts the graph is built from."""
+    code = STRING_PATTERN.sub('""', COMMENT_PATTERN.sub("", content))
+    namespace_match = NAMESPACE_PATTERN.search(code)
+    declarations = []
+    for match in TYPE_DECLARATION_PATTERN.finditer(code):
+        modifiers = match.group(1).split()
+        base = match.group(3)
+        declarations.append(
+            {
+                "name": match.group(2),
+                "abstract": "abstract" in modifiers or "static" in modifiers,
+                "base": base.rsplit(".", 1)[-1] if base else None,
+            }
+        )
+    declared = {d["name"] for d in declarations}
+    return {
+        "namespace": namespace_match.group(1) if namespace_match else "",
+        "usings": sorted(set(USING_PATTERN.findall(code))),
+        "declarations": declarations,
+        "references": sorted(set(IDENTIFIER_PATTERN.findall(code)) - declared),
+        "has_tests": bool(TEST_ATTRIBUTE_PATTERN.search(code)),
+    }
+
+
+def refresh_index(
+    root: Path, index: dict[str, object]
+) -> tuple[dict[str, object], int]:
+    """Bring ``index`` up to date with the tree; returns it and the number of re-parsed files."""
+    paths = iter_files(root, INDEXED_PROJECTS, (".cs",), SKIPPED_DIR_NAMES)
+    return impact_cache.refresh_index(
+        root, index, paths, lambda _path, content: parse_cs(content)
+    )
+
+
+def _visible_namespaces(entry: dict[str, object]) -> set[str]:
+    namespace = str(entry["namespace"])
+    parts = namespace.split(".") if namespace else []
+    enclosing = {".".join(parts[:i]) for i in range(1, len(parts) + 1)}
+    return enclosing | set(entry["usings"])
+
+
+def _declarers(files: dict[str, dict[str, object]]) -> dict[str, list[str]]:
+    declarers: dict[str, list[str]] = {}
+    for path, entry in files.items():
+        for declaration in entry["declarations"]:
+            declarers.setdefault(declaration["name"], []).append(path)
+    return declarers
+
+
+def _resolve(
+    name: str,
+    entry: dict[str, object],
+    files: dict[str, dict[str, object]],
+    declarers: dict[str, list[str]],
+) -> list[str]:
+    candidates = declarers.get(name) or declarers.get(f"{name}Attribute") or []
+    if len(candidates) <= 1:
+        return candidates
+    visible = _visible_namespaces(entry)
+    narrowed = [c for c in candidates if files[c]["namespace"] in visible]
+    return narrowed or candidates
+
+
+def build_reverse_graph(files: dict[str, dict[str, object]]) -> dict[str, set[str]]:
+    """``path -> files that reference a type declared in path``."""
+    declarers = _declarers(files)
+    dependents: dict[str, set[str]] = {path: set() for path in files}
+    for path, entry in files.items():
+        for name in entry["references"]:
+            for target in _resolve(name, entry, files, declarers):
+                if target != path:
+                    dependents[target].add(path)
+    return dependents
+
+
+def _test_classes(files: dict[str, dict[str, object]]) -> dict[str, list[str]]:
+    """``path -> fully-qualified concrete test classes declared there``.
+
+    A class counts when its file carries NUnit test attributes, or when it
+    derives (directly or transitively) from a class whose file does — tests
+    declared on an abstract base run under each derived fixture.
+    """
+    test_bearing: set[str] = set()
+    for entry in files.values():
+        if entry["has_tests"]:
+            test_bearing.update(d["name"] for d in entry["declarations"])
+    changed = True
+    while changed:
+        changed = False
+        for entry in files.values():
+            for declaration in entry["declarations"]:
+                if (
+                    declaration["name"] not in test_bearing
+                    and declaration["base"] in test_bearing
+                ):
+                    test_bearing.add(declaration["name"])
+                    changed = True
+
+    classes: dict[str, list[str]] = {}
+    for path, entry in files.items():
+        if not path.startswith(f"{TEST_PROJECT}/"):
+            continue
+        namespace = str(entry["namespace"])
+        names = [
+            f"{namespace}.{d['name']}" if namespace else d["name"]
+            for d in entry["declarations"]
+            if d["name"] in test_bearing and not d["abstract"]
+        ]
+        if names:
+            classes[path] = names
+    return classes
+
+
+def full_run_reason(changed_path: str) -> str | None:
+    """Why a changed path forces the full suite, or None if the index can handle it."""
+    if not changed_path.startswith(f"{BACKEND_DIR}/"):
+        return None
+    if SHARED_FILE_PATTERN.search(changed_path):
+        return f"shared file changed: {changed_path}"
+    if not any(changed_path.startswith(f"{project}/") for project in INDEXED_PROJECTS):
+        return f"change outside the indexed projects: {changed_path}"
+    if not changed_path.endswith(".cs"):
+        return f"non-C# backend file changed: {changed_path}"
+    return None
+
+
+def select_tests(
+    changed_paths: list[str],
+    previous_files: dict[str, dict[str, object]],
+    files: dict[str, dict[str, object]],
+) -> dict[str, object]:
+    """Decide ``full`` / ``none`` / ``selected`` for a list of changed paths.
+
+    ``previous_files`` is the index before the refresh, so a deleted or renamed
+    file still contributes the type names it used to declare.
+    """
+    backend_paths = [p for p in changed_paths if p.startswith(f"{BACKEND_DIR}/")]
+    for path in backend_paths:
+        reason = full_run_reason(path)
+        if reason:
+            return {"mode": "full", "reason": reason, "classes": [], "terms": []}
+    if not backend_paths:
+        return {
+            "mode": "none",
+            "reason": "no backend files changed",
+            "classes": [],
+            "terms": [],
+        }
+
+    declarers = _declarers(files)
+    dependents = build_reverse_graph(files)
+    affected: set[str] = set()
+    frontier: list[str] = []
+    for path in backend_paths:
+        if path in files:
+            frontier.append(path)
+        for source in (previous_files.get(path), files.get(path)):
+            for declaration in (source or {}).get("declarations", []):
+                frontier.extend(declarers.get(declaration["name"], []))
+                frontier.extend(
+                    referrer
+                    for referrer, entry in files.items()
+                    if declaration["name"] in entry["references"]
+                )
+    while frontier:
+        path = frontier.pop()
+        if path in affected:
+            continue
+        affected.add(path)
+        frontier.extend(dependents.get(path, ()))
+
+    test_classes = _test_classes(files)
+    classes = sorted(
+        {name for path in affected for name in test_classes.get(path, ())}
+    )
+    if not classes:
+        return {
+            "mode": "none",
+            "reason": "no test class depends on the change",
+            "classes": [],
+            "terms": [],
+        }
+    all_classes = sorted({n for names in test_classes.values() for n in names})
+    return {
+        "mode": "selected",
+        "reason": f"{len(affected)} affected file(s)",
+        "classes": classes,
+        "terms": collapse_classes(classes, all_classes),
+    }
+
+
+def _namespace_prefixes(class_name: str) -> list[str]:
+    parts = class_name.split(".")
+    return [".".join(parts[:i]) for i in range(1, len(parts))]
+
+
+def collapse_classes(selected: list[str], all_classes: list[str]) -> list[str]:
+    """Replace runs of selected classes by the shortest namespace they fully cover.
+
+    ``FullyQualifiedName~Ns.`` also matches every sub-namespace, so a prefix is
+    only used when every test class under it, at any depth, is selected.
+    """
+    totals: dict[str, int] = {}
+    for name in all_classes:
+        for prefix in _namespace_prefixes(name):
+            totals[prefix] = totals.get(prefix, 0) + 1
+    chosen: dict[str, int] = {}
+    for name in selected:
+        for prefix in _namespace_prefixes(name):
+            chosen[prefix] = chosen.get(prefix, 0) + 1
+    terms: set[str] = set()
+    for name in selected:
+        covering = next(
+            (p for p in _namespace_prefixes(name) if chosen[p] == totals.get(p)),
+            name,
+        )
+        terms.add(covering)
+    return sorted(terms)
+
+
+def build_filter(terms: list[str], base_filter: str | None = None) -> str:
+    """``dotnet test --filter`` expression selecting ``terms`` (AND ``base_filter``).
+
+    The trailing dot keeps ``Foo.BarTest`` from also matching ``Foo.BarTests``.
+    """
+    selection = "|".join(f"FullyQualifiedName~{term}." for term in terms)
+    if base_filter:
+        return f"({base_filter})&({selection})"
+    return selection
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Emit the smallest dotnet test --filter covering the backend "
+        "test classes a diff affects."
+    )
+    impact_cache.add_selector_arguments(parser, "backend.json")
+    parser.add_argument(
+        "--base-filter",
+        default=None,
+        help="Filter to AND with the selection, e.g. the category filter from ci_backend.yml.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the full decision (mode, reason, classes, filter) as JSON.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    root = (args.root or impact_cache.repo_root()).resolve()
+    index_path = args.index or root / ".cache" / "test-impact" / "backend.json"
+
+    previous = load_index(index_path, INDEX_VERSION)
+    index, reparsed = refresh_index(root, previous)
+    save_index(index, index_path)
+
+    decision = select_tests(
+        impact_cache.changed_paths(args.changed, args.base, root), previous["files"], index["files"]
+    )
+    decision["filter"] = (
+        build_filter(decision["terms"], args.base_filter)
+        if decision["mode"] == "selected"
+        else args.base_filter or ""
+    )
+    print(
+        f"backend-impact: {decision['mode']} ({decision['reason']}; "
+        f"{reparsed} file(s) re-indexed)",
+        file=sys.stderr,
+    )
+    if args.json:
+        print(json.dumps(decision, indent=2))
+    else:
+        print(decision["filter"])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
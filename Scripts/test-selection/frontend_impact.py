@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Select the Vitest files a change can affect, from the TS/TSX import graph.
+
+Frontend CI runs the whole Vitest suite on any frontend change. This tool
+indexes every file under ``Lighthouse.Frontend/src`` — the module specifiers
+each source file names in ``import``/``export ... from``, side-effect imports,
+dynamic ``import()`` (including ``typeof import()``), ``require()`` and
+``vi.mock()``-style calls — and resolves them the way Vite does: relative
+paths, tsconfig ``compilerOptions.paths`` / ``baseUrl`` aliases, extensionless
+specifiers and ``index`` files. Bare package specifiers are ignored. Given
+changed paths, it returns the test files that transitively import them.
+
+Specifiers are cached per file; resolution runs against the in-memory file
+list on every invocation, so adding a file that changes how an existing
+import resolves needs no re-parse. Like ``backend_impact.py``, it over-selects
+rather than under-selects, and falls back to the full run on anything outside
+``src`` that Vitest reads: ``package.json``, the lockfile, Vite/Vitest config,
+``setupTests.ts``, tsconfig files, or an unrecognised frontend file.
+
+Output: one test path per line, relative to ``Lighthouse.Frontend`` (ready for
+``pnpm vitest run``). Empty output means "no filter" — either the full suite
+must run or no test depends on the change (the mode and reason go to
+stderr). ``--json`` prints the full decision.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import posixpath
+import re
+import sys
+from pathlib import Path
+
+import impact_cache
+from impact_cache import iter_files, load_index, save_index
+
+INDEX_VERSION = 1
+FRONTEND_DIR = "Lighthouse.Frontend"
+SOURCE_DIR = f"{FRONTEND_DIR}/src"
+SKIPPED_DIR_NAMES = {"node_modules", "dist", "coverage", "StrykerOutput"}
+CODE_SUFFIXES = (".ts", ".tsx", ".mts", ".cts", ".js", ".jsx", ".mjs", ".cjs")
+RESOLVE_EXTENSIONS = (".ts", ".tsx", ".mts", ".js", ".jsx", ".mjs", ".json", ".d.ts")
+TEST_FILE_PATTERN = re.compile(r"\.(test|spec)\.[cm]?[jt]sx?$")
+SHARED_FILE_PATTERN = re.compile(
+    rf"^{FRONTEND_DIR}/("
+    r"package\.json|pnpm-lock\.yaml|pnpm-workspace\.yaml|\.npmrc"
+    r"|setupTests\.[jt]sx?|tsconfig[^/]*\.json|(vite|vitest)\.config\.[cm]?[jt]s"
+    r")$"
+)
+# Frontend files Vitest never reads: the Tauri shell, static assets served as-is, docs.
+IGNORED_FILE_PATTERN = re.compile(
+    rf"^{FRONTEND_DIR}/(src-tauri/|public/|\.sonarlint/|[^/]*\.md$)"
+)
+
+_STRING = r"""("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)"""
+COMMENT_PATTERN = re.compile(_STRING + r"|//[^\n]*|/\*.*?\*/", re.DOTALL)
+SPECIFIER_PATTERNS = (
+    re.compile(r"""\b(?:import|export)\b[^'"`;]*?\bfrom\s*(['"])([^'"\n]+)\1"""),
+    re.compile(r"""\bimport\s*(['"])([^'"\n]+)\1"""),
+    re.compile(r"""\bimport\s*\(\s*(['"`])([^'"`$\n]+)\1\s*\)"""),
+    re.compile(r"""\brequire\s*\(\s*(['"])([^'"\n]+)\1\s*\)"""),
+    re.compile(
+        r"""\bvi\s*\.\s*(?:mock|doMock|unmock|doUnmock|importActual|importMock)"""
+        r"""\s*(?:<[^>]*>)?\s*\(\s*(['"])([^'"\n]+)\1"""
+    ),
+)
+JSONC_COMMENT_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.DOTALL)
+JSONC_TRAILING_COMMA_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|,(?=\s*[}\]])')
+
+Aliases = dict[str, list]
+
+
+def parse_module(relative_path: str, content: str) -> dict[str, object]:
+    """The module specifiers a file names; non-code files (CSS, images) name none."""
+    if not relative_path.endswith(CODE_SUFFIXES):
+        return {"specifiers": []}
+    code = COMMENT_PATTERN.sub(lambda m: m.group(1) or "", content)
+    specifiers = {
+        match.group(2) for pattern in SPECIFIER_PATTERNS for match in pattern.finditer(code)
+    }
+    return {"specifiers": sorted(specifiers)}
+
+
+def load_jsonc(text: str) -> object:
+    """Parse tsconfig-flavoured JSON: comments and trailing commas are allowed."""
+    text = JSONC_COMMENT_PATTERN.sub(lambda m: m.group(1) or "", text)
+    text = JSONC_TRAILING_COMMA_PATTERN.sub(lambda m: m.group(1) or "", text)
+    return json.loads(text)
+
+
+def load_aliases(root: Path) -> Aliases:
+    """``baseUrl`` and ``paths`` from every ``tsconfig*.json`` in the frontend.
+
+    Paths come back repository-relative: ``{"base_urls": [dir, ...],
+    "paths": [[pattern, [target, ...]], ...]}``.
+    """
+    aliases: Aliases = {"base_urls": [], "paths": []}
+    for config_path in sorted((root / FRONTEND_DIR).glob("tsconfig*.json")):
+        try:
+            config = load_jsonc(config_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as error:
+            print(f"warning: could not read {config_path}: {error}", file=sys.stderr)
+            continue
+        options = (config.get("compilerOptions") or {}) if isinstance(config, dict) else {}
+        config_dir = config_path.parent.relative_to(root).as_posix()
+        base_url = options.get("baseUrl")
+        if base_url is not None:
+            base_url = posixpath.normpath(posixpath.join(config_dir, base_url))
+            aliases["base_urls"].append(base_url)
+        for pattern, targets in (options.get("paths") or {}).items():
+            aliases["paths"].append(
+                [
+                    pattern,
+                    [
+                        posixpath.normpath(posixpath.join(base_url or config_dir, t))
+                        for t in targets
+                    ],
+                ]
+            )
+    return aliases
+
+
+def candidate_bases(importer: str, specifier: str, aliases: Aliases) -> list[str]:
+    """Repository-relative paths ``specifier`` may name, before extension probing."""
+    specifier = specifier.split("?", 1)[0]
+    if specifier in (".", "..") or specifier.startswith(("./", "../")):
+        return [posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier))]
+    if specifier.startswith("/"):
+        return [posixpath.normpath(FRONTEND_DIR + specifier)]
+    bases = []
+    for pattern, targets in aliases["paths"]:
+        prefix, star, suffix = pattern.partition("*")
+        if not star:
+            if specifier == pattern:
+                bases.extend(targets)
+            continue
+        if (
+            specifier.startswith(prefix)
+            and specifier.endswith(suffix)
+            and len(specifier) >= len(prefix) + len(suffix)
+        ):
+            matched = specifier[len(prefix) : len(specifier) - len(suffix)]
+            bases.extend(target.replace("*", matched, 1) for target in targets)
+    for base_url in aliases["base_urls"]:
+        bases.append(posixpath.normpath(posixpath.join(base_url, specifier)))
+    return bases
+
+
+def resolve(base: str, known: set[str] | dict[str, object]) -> str | None:
+    """The indexed file ``base`` resolves to, probing extensions and ``index`` files."""
+    if base in known:
+        return base
+    stem, extension = posixpath.splitext(base)
+    probes = [base + ext for ext in RESOLVE_EXTENSIONS]
+    if extension in (".js", ".jsx", ".mjs"):
+        # TypeScript lets "./x.js" name x.ts.
+        probes[:0] = [stem + ext for ext in (".ts", ".tsx", ".mts")]
+    probes.extend(f"{base}/index{ext}" for ext in RESOLVE_EXTENSIONS)
+    return next((probe for probe in probes if probe in known), None)
+
+
+def build_reverse_graph(
+    files: dict[str, dict[str, object]], aliases: Aliases
+) -> dict[str, set[str]]:
+    """``path -> files that import path``."""
+    dependents: dict[str, set[str]] = {path: set() for path in files}
+    for path, entry in files.items():
+        for specifier in entry["specifiers"]:
+            for base in candidate_bases(path, specifier, aliases):
+                target = resolve(base, files)
+                if target is not None and target != path:
+                    dependents[target].add(path)
+                    break
+    return dependents
+
+
+def _deleted_keys(paths: list[str]) -> set[str]:
+    """Every base an import of one of ``paths`` could have been written as."""
+    keys = set()
+    for path in paths:
+        keys.add(path)
+        stem = path[: -len(".d.ts")] if path.endswith(".d.ts") else posixpath.splitext(path)[0]
+        keys.add(stem)
+        if posixpath.basename(stem) == "index":
+            keys.add(posixpath.dirname(stem))
+    return keys
+
+
+def full_run_reason(changed_path: str) -> str | None:
+    """Why a changed path forces the full suite, or None if the graph can handle it."""
+    if not changed_path.startswith(f"{FRONTEND_DIR}/"):
+        return None
+    if changed_path.startswith(f"{SOURCE_DIR}/"):
+        return None
+    if SHARED_FILE_PATTERN.search(changed_path):
+        return f"shared file changed: {changed_path}"
+    if IGNORED_FILE_PATTERN.search(changed_path):
+        return None
+    return f"frontend file outside src changed: {changed_path}"
+
+
+def select_tests(
+    changed_paths: list[str],
+    files: dict[str, dict[str, object]],
+    aliases: Aliases,
+) -> dict[str, object]:
+    """Decide ``full`` / ``none`` / ``selected`` for a list of changed paths.
+
+    A changed path missing from ``files`` was deleted or renamed away; every
+    file whose import of it no longer resolves counts as directly affected.
+    """
+    frontend_paths = [p for p in changed_paths if p.startswith(f"{FRONTEND_DIR}/")]
+    for path in frontend_paths:
+        reason = full_run_reason(path)
+        if reason:
+            return {"mode": "full", "reason": reason, "tests": []}
+    source_paths = [p for p in frontend_paths if p.startswith(f"{SOURCE_DIR}/")]
+    if not source_paths:
+        return {"mode": "none", "reason": "no frontend source files changed", "tests": []}
+
+    frontier = [p for p in source_paths if p in files]
+    gone = _deleted_keys([p for p in source_paths if p not in files])
+    if gone:
+        frontier.extend(
+            importer
+            for importer, entry in files.items()
+            if any(
+                base in gone
+                for specifier in entry["specifiers"]
+                for base in candidate_bases(importer, specifier, aliases)
+            )
+        )
+    dependents = build_reverse_graph(files, aliases)
+    affected: set[str] = set()
+    while frontier:
+        path = frontier.pop()
+        if path in affected:
+            continue
+        affected.add(path)
+        frontier.extend(dependents.get(path, ()))
+
+    tests = sorted(
+        posixpath.relpath(path, FRONTEND_DIR)
+        for path in affected
+        if TEST_FILE_PATTERN.search(path)
+    )
+    if not tests:
+        return {"mode": "none", "reason": "no test file depends on the change", "tests": []}
+    return {
+        "mode": "selected",
+        "reason": f"{len(affected)} affected file(s)",
+        "tests": tests,
+    }
+
+
+def refresh_index(
+    root: Path, index: dict[str, object]
+) -> tuple[dict[str, object], int]:
+    """Bring ``index`` up to date with the tree; returns it and the number of re-parsed files."""
+    paths = iter_files(root, (SOURCE_DIR,), ("",), SKIPPED_DIR_NAMES)
+    return impact_cache.refresh_index(root, index, paths, parse_module)
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="List the Vitest files a diff affects, from the frontend import graph."
+    )
+    impact_cache.add_selector_arguments(parser, "frontend.json")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the full decision (mode, reason, tests) as JSON.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    root = (args.root or impact_cache.repo_root()).resolve()
+    index_path = args.index or root / ".cache" / "test-impact" / "frontend.json"
+
+    index, reparsed = refresh_index(root, load_index(index_path, INDEX_VERSION))
+    save_index(index, index_path)
+
+    decision = select_tests(impact_cache.changed_paths(args.changed, args.base, root), index["files"], load_aliases(root))
+    print(
+        f"frontend-impact: {decision['mode']} ({decision['reason']}; "
+        f"{reparsed} file(s) re-indexed)",
+        file=sys.stderr,
+    )
+    if args.json:
+        print(json.dumps(decision, indent=2))
+    else:
+        for test in decision["tests"]:
+            print(test)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+"""On-disk, incrementally refreshed per-file index shared by the impact selectors.
+
+Each entry holds whatever a selector's parser extracted from one file, plus
+the file's size, mtime and content hash. On refresh, files whose size and mtime
+are unchanged are not re-read, and re-read files whose content hash is
+unchanged are not re-parsed, so a warm run costs one ``stat`` per file.
+
+The selectors' shared command line (``--changed``, ``--base``, ``--root``,
+``--index``) and how it turns into a list of changed paths live here too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable, Iterable, TextIO
+
+ParsedFile = dict[str, object]
+
+
+def repo_root() -> Path:
+    result = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True
+    )
+    if result.returncode == 0 and result.stdout.strip():
+        return Path(result.stdout.strip())
+    return Path.cwd()
+
+
+def add_selector_arguments(parser: argparse.ArgumentParser, index_name: str) -> None:
+    """Add the ``--changed``/``--base``/``--root``/``--index`` options both selectors take."""
+    parser.add_argument(
+        "--changed",
+        default=None,
+        help="File listing changed paths (git diff --name-only), or - to read them "
+        "from stdin. Defaults to `git diff --name-only <base>...HEAD`.",
+    )
+    parser.add_argument(
+        "--base",
+        default="origin/main",
+        help="Diff base when --changed is not given (default origin/main).",
+    )
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=None,
+        help="Repository root (default: git rev-parse --show-toplevel).",
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help=f"Index file (default <root>/.cache/test-impact/{index_name}).",
+    )
+
+
+def changed_paths(
+    changed: str | None, base: str, root: Path, stdin: TextIO | None = None
+) -> list[str]:
+    """Changed paths from ``--changed`` (a file, or ``-`` for stdin), else ``git diff <base>...HEAD``.
+
+    Stdin is only read when asked for: in CI and git hooks it is /dev/null or
+    carries hook input, which must not be mistaken for a path list.
+    """
+    if changed == "-":
+        lines = (stdin or sys.stdin).read().splitlines()
+    elif changed:
+        lines = Path(changed).read_text(encoding="utf-8").splitlines()
+    else:
+        result = subprocess.run(
+            ["git", "-C", str(root), "diff", "--name-only", f"{base}...HEAD"],
+            capture_output=True,
+            text=True,
+        )
+        lines = result.stdout.splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def iter_files(
+    root: Path, directories: Iterable[str], suffixes: tuple[str, ...], skipped: set[str]
+) -> list[str]:
+    """Repository-relative POSIX paths under ``directories`` ending in ``suffixes``."""
+    paths = []
+    for relative_dir in directories:
+        for directory, dir_names, file_names in os.walk(root / relative_dir):
+            dir_names[:] = [d for d in dir_names if d not in skipped]
+            for file_name in file_names:
+                if file_name.endswith(suffixes):
+                    paths.append(
+                        Path(directory, file_name).relative_to(root).as_posix()
+                    )
+    return sorted(paths)
+
+
+def load_index(index_path: Path, version: int) -> dict[str, object]:
+    """The stored index, or an empty one when missing, unreadable or from another version."""
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": version, "files": {}}
+    if not isinstance(index, dict) or index.get("version") != version:
+        return {"version": version, "files": {}}
+    return index
+
+
+def save_index(index: dict[str, object], index_path: Path) -> None:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = index_path.with_suffix(index_path.suffix + ".tmp")
+    temporary.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    temporary.replace(index_path)
+
+
+def refresh_index(
+    root: Path,
+    index: dict[str, object],
+    relative_paths: Iterable[str],
+    parse: Callable[[str, str], ParsedFile],
+) -> tuple[dict[str, object], int]:
+    """Bring ``index`` up to date for ``relative_paths``.
+
+    ``parse(relative_path, content)`` produces a file's entry. Returns the new
+    index (files no longer listed are dropped) and how many files were parsed.
+    """
+    previous: dict[str, ParsedFile] = index["files"]
+    files: dict[str, ParsedFile] = {}
+    reparsed = 0
+    for relative in relative_paths:
+        path = root / relative
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        cached = previous.get(relative)
+        if (
+            cached is not None
+            and cached["size"] == stat.st_size
+            and cached["mtime_ns"] == stat.st_mtime_ns
+        ):
+            files[relative] = cached
+            continue
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            continue
+        digest = hashlib.sha1(raw).hexdigest()
+        if cached is not None and cached["hash"] == digest:
+            entry = dict(cached)
+        else:
+            entry = parse(relative, raw.decode("utf-8", errors="replace"))
+            entry["hash"] = digest
+            reparsed += 1
+        entry["size"] = stat.st_size
+        entry["mtime_ns"] = stat.st_mtime_ns
+        files[relative] = entry
+    return {"version": index["version"], "files": files}, reparsed
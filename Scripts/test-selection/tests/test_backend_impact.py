@@ -0,0 +1,229 @@
+import io
+import shutil
+import sys
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from backend_impact import (  # noqa: E402
+    build_filter,
+    collapse_classes,
+    full_run_reason,
+    main,
+    parse_cs,
+    refresh_index,
+    select_tests,
+)
+
+PROD = "Lighthouse.Backend/Lighthouse.Backend"
+TESTS = "Lighthouse.Backend/Lighthouse.Backend.Tests"
+
+SOURCES = {
+    f"{PROD}/Services/Clock.cs": """
+namespace Lighthouse.Backend.Services
+{
+    public interface IClock { }
+    public class Clock : IClock { }
+}
+""",
+    f"{PROD}/Services/Forecaster.cs": """
+namespace Lighthouse.Backend.Services;
+
+public class Forecaster
+{
+    private readonly IClock clock;
+}
+""",
+    f"{PROD}/Models/Team.cs": """
+namespace Lighthouse.Backend.Models;
+
+// Mentions Forecaster only in a comment.
+public record Team(string Name);
+""",
+    f"{TESTS}/Services/ForecasterTest.cs": """
+using Lighthouse.Backend.Services;
+
+namespace Lighthouse.Backend.Tests.Services
+{
+    public class ForecasterTest
+    {
+        [Test]
+        public void Forecasts() { var subject = new Forecaster(); }
+    }
+}
+""",
+    f"{TESTS}/Models/TeamTestBase.cs": """
+using Lighthouse.Backend.Models;
+
+namespace Lighthouse.Backend.Tests.Models
+{
+    public abstract class TeamTestBase
+    {
+        [Test]
+        public void HasName() { var team = new Team("x"); }
+    }
+}
+""",
+    f"{TESTS}/Models/TeamTest.cs": """
+namespace Lighthouse.Backend.Tests.Models
+{
+    public class TeamTest : TeamTestBase { }
+}
+""",
+}
+
+
+class ParseCsTests(unittest.TestCase):
+    def test_extracts_namespace_usings_declarations_and_references(self):
+        facts = parse_cs(SOURCES[f"{TESTS}/Services/ForecasterTest.cs"])
+        self.assertEqual(facts["namespace"], "Lighthouse.Backend.Tests.Services")
+        self.assertEqual(facts["usings"], ["Lighthouse.Backend.Services"])
+        self.assertEqual(facts["declarations"][0]["name"], "ForecasterTest")
+        self.assertIn("Forecaster", facts["references"])
+        self.assertTrue(facts["has_tests"])
+
+    def test_ignores_identifiers_in_comments_and_strings(self):
+        facts = parse_cs(SOURCES[f"{PROD}/Models/Team.cs"])
+        self.assertNotIn("Forecaster", facts["references"])
+
+    def test_records_base_class_and_abstractness(self):
+        base = parse_cs(SOURCES[f"{TESTS}/Models/TeamTestBase.cs"])["declarations"][0]
+        derived = parse_cs(SOURCES[f"{TESTS}/Models/TeamTest.cs"])["declarations"][0]
+        self.assertTrue(base["abstract"])
+        self.assertEqual(derived["base"], "TeamTestBase")
+
+
+class IndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = HERE / "_tmp_backend_impact"
+        shutil.rmtree(self.root, ignore_errors=True)
+        for relative, content in SOURCES.items():
+            path = self.root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        self.index, _ = refresh_index(self.root, {"version": 1, "files": {}})
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def select(self, *changed, previous=None):
+        return select_tests(
+            list(changed), previous or self.index["files"], self.index["files"]
+        )
+
+
+class RefreshIndexTests(IndexTestCase):
+    def test_unchanged_tree_is_not_reparsed(self):
+        _, reparsed = refresh_index(self.root, self.index)
+        self.assertEqual(reparsed, 0)
+
+    def test_only_edited_file_is_reparsed(self):
+        (self.root / f"{PROD}/Models/Team.cs").write_text(
+            "namespace Lighthouse.Backend.Models;\npublic record Team(string Name, int Size);\n",
+            encoding="utf-8",
+        )
+        _, reparsed = refresh_index(self.root, self.index)
+        self.assertEqual(reparsed, 1)
+
+    def test_deleted_file_leaves_the_index(self):
+        (self.root / f"{PROD}/Models/Team.cs").unlink()
+        refreshed, _ = refresh_index(self.root, self.index)
+        self.assertNotIn(f"{PROD}/Models/Team.cs", refreshed["files"])
+
+
+class SelectTestsTests(IndexTestCase):
+    def test_transitive_dependency_selects_test_class(self):
+        decision = self.select(f"{PROD}/Services/Clock.cs")
+        self.assertEqual(decision["mode"], "selected")
+        self.assertEqual(
+            decision["classes"], ["Lighthouse.Backend.Tests.Services.ForecasterTest"]
+        )
+
+    def test_inherited_tests_select_the_concrete_derived_fixture(self):
+        decision = self.select(f"{PROD}/Models/Team.cs")
+        self.assertEqual(
+            decision["classes"], ["Lighthouse.Backend.Tests.Models.TeamTest"]
+        )
+
+    def test_deleted_file_still_selects_its_former_dependents(self):
+        previous = dict(self.index["files"])
+        (self.root / f"{PROD}/Models/Team.cs").unlink()
+        refreshed, _ = refresh_index(self.root, self.index)
+        decision = select_tests(
+            [f"{PROD}/Models/Team.cs"], previous, refreshed["files"]
+        )
+        self.assertEqual(
+            decision["classes"], ["Lighthouse.Backend.Tests.Models.TeamTest"]
+        )
+
+    def test_shared_file_forces_full_run(self):
+        decision = self.select(f"{PROD}/Program.cs", f"{PROD}/Models/Team.cs")
+        self.assertEqual(decision["mode"], "full")
+
+    def test_non_backend_change_selects_nothing(self):
+        self.assertEqual(self.select("Lighthouse.Frontend/src/App.tsx")["mode"], "none")
+
+
+class MainTests(IndexTestCase):
+    BASE_FILTER = "Category!=Integration|Category=JiraIntegration"
+
+    def run_main(self, *changed, base_filter=BASE_FILTER):
+        listing = self.root / "changed.txt"
+        listing.write_text("\n".join(changed) + "\n", encoding="utf-8")
+        args = ["--root", str(self.root), "--changed", str(listing)]
+        if base_filter:
+            args += ["--base-filter", base_filter]
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            self.assertEqual(main(args), 0)
+        return stdout.getvalue().strip()
+
+    def test_full_run_keeps_the_base_filter(self):
+        self.assertEqual(self.run_main(f"{PROD}/Program.cs"), self.BASE_FILTER)
+
+    def test_unaffected_change_keeps_the_base_filter(self):
+        self.assertEqual(self.run_main("Lighthouse.Frontend/src/App.tsx"), self.BASE_FILTER)
+
+    def test_selection_is_anded_with_the_base_filter(self):
+        self.assertEqual(
+            self.run_main(f"{PROD}/Services/Clock.cs"),
+            f"({self.BASE_FILTER})&(FullyQualifiedName~Lighthouse.Backend.Tests.Services.)",
+        )
+
+    def test_full_run_without_base_filter_is_unfiltered(self):
+        self.assertEqual(self.run_main(f"{PROD}/Program.cs", base_filter=None), "")
+
+
+class FullRunReasonTests(unittest.TestCase):
+    def test_shared_and_unindexed_backend_paths(self):
+        for path in (
+            f"{TESTS}/Lighthouse.Backend.Tests.csproj",
+            "Lighthouse.Backend/Lighthouse.sln",
+            f"{TESTS}/GlobalUsings.cs",
+            f"{PROD}/appsettings.json",
+            "Lighthouse.Backend/Lighthouse.Migrations.Sqlite/Migrations/Init.cs",
+        ):
+            self.assertIsNotNone(full_run_reason(path), path)
+
+    def test_ordinary_source_file_is_handled_by_the_index(self):
+        self.assertIsNone(full_run_reason(f"{PROD}/Services/Clock.cs"))
+
+
+class BuildFilterTests(unittest.TestCase):
+    def test_collapses_fully_covered_namespaces_only(self):
+        all_classes = ["A.B.One", "A.B.Two", "A.C.Three"]
+        self.assertEqual(collapse_classes(["A.B.One", "A.B.Two"], all_classes), ["A.B"])
+        self.assertEqual(collapse_classes(["A.B.One"], all_classes), ["A.B.One"])
+
+    def test_ands_base_filter(self):
+        self.assertEqual(
+            build_filter(["A.B", "A.C.Three"], "Category!=Integration"),
+            "(Category!=Integration)&(FullyQualifiedName~A.B.|FullyQualifiedName~A.C.Three.)",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import shutil
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from frontend_impact import (  # noqa: E402
+    full_run_reason,
+    load_aliases,
+    load_jsonc,
+    parse_module,
+    refresh_index,
+    select_tests,
+)
+
+FRONTEND = "Lighthouse.Frontend"
+SRC = f"{FRONTEND}/src"
+
+SOURCES = {
+    f"{FRONTEND}/tsconfig.app.json": """
+{
+  "compilerOptions": {
+    /* Aliases */
+    "baseUrl": ".",
+    "paths": { "@/*": ["src/*"], },
+  },
+}
+""",
+    f"{SRC}/utils/dates.ts": "export const today = () => new Date();\n",
+    f"{SRC}/utils/index.ts": 'export * from "./dates";\n',
+    f"{SRC}/services/api.ts": """
+import { today } from "../utils";
+export const fetchTeams = () => today();
+""",
+    f"{SRC}/components/TeamList.tsx": """
+import { fetchTeams } from "@/services/api";
+import "./TeamList.css";
+export const TeamList = () => fetchTeams();
+""",
+    f"{SRC}/components/TeamList.css": ".team { color: red; }\n",
+    f"{SRC}/components/TeamList.test.tsx": """
+import { TeamList } from "./TeamList";
+test("renders", () => TeamList());
+""",
+    f"{SRC}/pages/Lazy.test.tsx": """
+// import { today } from "../utils/dates";
+vi.mock("../services/api");
+const page = () => import("./Lazy");
+""",
+    f"{SRC}/pages/Lazy.tsx": "export default () => null;\n",
+}
+
+
+class ParseModuleTests(unittest.TestCase):
+    def test_collects_static_dynamic_and_mocked_specifiers(self):
+        facts = parse_module(
+            "a.ts",
+            """
+import React from "react";
+import {
+  a,
+  b,
+} from './multi';
+export { c } from "./reexport";
+import "./side-effect.css";
+const lazy = import("./Lazy");
+type Mod = typeof import("./types");
+vi.mock("../hooks/useThing");
+const legacy = require("./legacy");
+""",
+        )
+        self.assertEqual(
+            facts["specifiers"],
+            [
+                "../hooks/useThing",
+                "./Lazy",
+                "./legacy",
+                "./multi",
+                "./reexport",
+                "./side-effect.css",
+                "./types",
+                "react",
+            ],
+        )
+
+    def test_ignores_commented_imports_but_keeps_urls_in_strings(self):
+        facts = parse_module(
+            "a.ts",
+            'const url = "http://x";\n// import "./gone";\nimport "./kept";\n',
+        )
+        self.assertEqual(facts["specifiers"], ["./kept"])
+
+    def test_non_code_files_have_no_specifiers(self):
+        self.assertEqual(parse_module("a.css", '@import "./b.css";')["specifiers"], [])
+
+
+class LoadJsoncTests(unittest.TestCase):
+    def test_accepts_comments_and_trailing_commas(self):
+        self.assertEqual(
+            load_jsonc('{\n  // c\n  "a": ["//not-a-comment",],\n}'),
+            {"a": ["//not-a-comment"]},
+        )
+
+
+class IndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = HERE / "_tmp_frontend_impact"
+        shutil.rmtree(self.root, ignore_errors=True)
+        for relative, content in SOURCES.items():
+            path = self.root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        self.index, _ = refresh_index(self.root, {"version": 1, "files": {}})
+        self.aliases = load_aliases(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def select(self, *changed):
+        return select_tests(list(changed), self.index["files"], self.aliases)
+
+
+class RefreshIndexTests(IndexTestCase):
+    def test_unchanged_tree_is_not_reparsed(self):
+        _, reparsed = refresh_index(self.root, self.index)
+        self.assertEqual(reparsed, 0)
+
+    def test_only_edited_file_is_reparsed(self):
+        (self.root / f"{SRC}/pages/Lazy.tsx").write_text(
+            "export default () => 1;\n", encoding="utf-8"
+        )
+        _, reparsed = refresh_index(self.root, self.index)
+        self.assertEqual(reparsed, 1)
+
+
+class SelectTestsTests(IndexTestCase):
+    def test_alias_barrel_and_transitive_imports_select_tests(self):
+        decision = self.select(f"{SRC}/utils/dates.ts")
+        self.assertEqual(decision["mode"], "selected")
+        self.assertEqual(
+            decision["tests"],
+            ["src/components/TeamList.test.tsx", "src/pages/Lazy.test.tsx"],
+        )
+
+    def test_dynamic_import_and_asset_edges(self):
+        self.assertEqual(
+            self.select(f"{SRC}/pages/Lazy.tsx")["tests"], ["src/pages/Lazy.test.tsx"]
+        )
+        self.assertEqual(
+            self.select(f"{SRC}/components/TeamList.css")["tests"],
+            ["src/components/TeamList.test.tsx"],
+        )
+
+    def test_changed_test_file_selects_itself(self):
+        self.assertEqual(
+            self.select(f"{SRC}/pages/Lazy.test.tsx")["tests"],
+            ["src/pages/Lazy.test.tsx"],
+        )
+
+    def test_deleted_file_selects_its_former_importers(self):
+        (self.root / f"{SRC}/pages/Lazy.tsx").unlink()
+        refreshed, _ = refresh_index(self.root, self.index)
+        decision = select_tests([f"{SRC}/pages/Lazy.tsx"], refreshed["files"], self.aliases)
+        self.assertEqual(decision["tests"], ["src/pages/Lazy.test.tsx"])
+
+    def test_shared_file_forces_full_run(self):
+        decision = self.select(f"{FRONTEND}/vitest.config.ts", f"{SRC}/pages/Lazy.tsx")
+        self.assertEqual(decision["mode"], "full")
+
+    def test_non_frontend_change_selects_nothing(self):
+        self.assertEqual(self.select("Lighthouse.Backend/Program.cs")["mode"], "none")
+
+
+class FullRunReasonTests(unittest.TestCase):
+    def test_files_vitest_reads_outside_src(self):
+        for path in (
+            f"{FRONTEND}/package.json",
+            f"{FRONTEND}/pnpm-lock.yaml",
+            f"{FRONTEND}/setupTests.ts",
+            f"{FRONTEND}/tsconfig.app.json",
+            f"{FRONTEND}/vite.config.ts",
+            f"{FRONTEND}/index.html",
+        ):
+            self.assertIsNotNone(full_run_reason(path), path)
+
+    def test_files_vitest_never_reads(self):
+        for path in (
+            f"{SRC}/App.tsx",
+            f"{FRONTEND}/src-tauri/src/main.rs",
+            f"{FRONTEND}/public/favicon.ico",
+            f"{FRONTEND}/CHANGELOG.md",
+        ):
+            self.assertIsNone(full_run_reason(path), path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import argparse
+import io
+import shutil
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from impact_cache import add_selector_arguments, changed_paths  # noqa: E402
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-C", str(root), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+class ChangedPathsTests(unittest.TestCase):
+    def setUp(self):
+        self.root = HERE / "_tmp_changed_paths"
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.root.mkdir()
+        _git(self.root, "init", "-q", "-b", "main")
+        (self.root / "a.cs").write_text("a\n", encoding="utf-8")
+        _git(self.root, "add", "a.cs")
+        _git(self.root, "commit", "-q", "-m", "base")
+        _git(self.root, "checkout", "-q", "-b", "feature")
+        (self.root / "b.cs").write_text("b\n", encoding="utf-8")
+        _git(self.root, "add", "b.cs")
+        _git(self.root, "commit", "-q", "-m", "change")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_defaults_to_git_diff_against_base(self):
+        self.assertEqual(changed_paths(None, "main", self.root), ["b.cs"])
+
+    def test_does_not_read_stdin_unless_asked(self):
+        stdin = io.StringIO("deadbeef refs/heads/feature\n")
+        with mock.patch("sys.stdin", stdin):
+            self.assertEqual(changed_paths(None, "main", self.root), ["b.cs"])
+        self.assertEqual(stdin.tell(), 0)
+
+    def test_dash_reads_paths_from_stdin(self):
+        stdin = io.StringIO("x/y.ts\n\n  z.cs  \n")
+        self.assertEqual(
+            changed_paths("-", "main", self.root, stdin=stdin), ["x/y.ts", "z.cs"]
+        )
+
+    def test_reads_paths_from_file(self):
+        listing = self.root / "changed.txt"
+        listing.write_text("one.cs\ntwo.cs\n", encoding="utf-8")
+        self.assertEqual(
+            changed_paths(str(listing), "main", self.root), ["one.cs", "two.cs"]
+        )
+
+
+class SelectorArgumentsTests(unittest.TestCase):
+    def test_changed_accepts_dash(self):
+        parser = argparse.ArgumentParser()
+        add_selector_arguments(parser, "backend.json")
+        args = parser.parse_args(["--changed", "-"])
+        self.assertEqual(args.changed, "-")
+        self.assertEqual(args.base, "origin/main")
+
+
+if __name__ == "__main__":
+    unittest.main()
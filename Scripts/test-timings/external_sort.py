@@ -0,0 +1,68 @@
+"""Bounded-memory slowest-first ordering for the timing CSV writers.
+
+A multi-GB TRX set produces more rows than a CI runner should hold at once, so
+rows are sorted in fixed-size chunks, each chunk is spilled to a temporary
+NDJSON file, and the spills are k-way merged back into one descending stream.
+Inputs that fit in a single chunk never touch the disk.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+def _duration_key(row: dict[str, object]) -> float:
+    return float(row["duration_ms"])
+
+
+def _spill(chunk: list[dict[str, object]], path: Path) -> None:
+    chunk.sort(key=_duration_key, reverse=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for row in chunk:
+            handle.write(json.dumps(row))
+            handle.write("\n")
+
+
+def _read_spill(path: Path) -> Iterator[dict[str, object]]:
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            yield json.loads(line)
+
+
+def sorted_by_duration(
+    rows: Iterable[dict[str, object]], chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[dict[str, object]]:
+    """Yield ``rows`` ordered by ``duration_ms`` descending, holding at most ``chunk_rows``.
+
+    The ordering is stable: rows with equal durations keep their input order,
+    matching ``sorted(..., reverse=True)``.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be at least 1")
+    iterator = iter(rows)
+    first_chunk = list(itertools.islice(iterator, chunk_rows))
+    if len(first_chunk) < chunk_rows:
+        first_chunk.sort(key=_duration_key, reverse=True)
+        yield from first_chunk
+        return
+
+    with tempfile.TemporaryDirectory(prefix="test-timings-sort-") as spill_dir:
+        spills: list[Path] = []
+        chunk = first_chunk
+        while chunk:
+            spill_path = Path(spill_dir) / f"chunk-{len(spills):05d}.ndjson"
+            _spill(chunk, spill_path)
+            spills.append(spill_path)
+            chunk = list(itertools.islice(iterator, chunk_rows))
+        yield from heapq.merge(
+            *(_read_spill(path) for path in spills),
+            key=_duration_key,
+            reverse=True,
+        )
@@ -0,0 +1,200 @@
+"""Estimate per-fixture one-time setup cost from TRX start-time ordering.
+
+NUnit bills ``[OneTimeSetUp]`` (container start for ``requires-docker``
+fixtures, database creation, ``WebApplicationFactory`` boot) to whichever test
+of the fixture runs first, so that test looks slow in the per-test CSV. The
+TRX records a ``startTime`` per result; ordering a class's results by it and
+comparing the first test against the median of the rest gives an estimate of
+what the fixture pays before any test body runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+
+from timing_common import (
+    TRX_NS,
+    class_name_lookup,
+    duration_to_milliseconds,
+    format_cell,
+)
+
+DOMINANT_SHARE = 0.5
+_TABLE_COLUMNS = (
+    ("setup_ms", 11),
+    ("share", 6),
+    ("tests", 6),
+    ("first_ms", 11),
+    ("median_ms", 11),
+    ("class_name", 80),
+)
+
+
+def _parse_start_time(raw: str | None) -> datetime | None:
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+
+
+def parse_trx_timeline(xml_content: str) -> list[dict[str, object]]:
+    """Parse a TRX document into rows carrying class, start time and duration.
+
+    Results without a parseable ``startTime`` are dropped: without it the first
+    test of a fixture cannot be identified.
+    """
+    root = ET.fromstring(xml_content)
+    class_by_id = class_name_lookup(root)
+    rows: list[dict[str, object]] = []
+    for result in root.iter(f"{TRX_NS}UnitTestResult"):
+        start_time = _parse_start_time(result.get("startTime"))
+        if start_time is None:
+            continue
+        rows.append(
+            {
+                "class_name": class_by_id.get(result.get("testId") or "", ""),
+                "test_name": result.get("testName", ""),
+                "start_time": start_time,
+                "duration_ms": duration_to_milliseconds(
+                    result.get("duration", "00:00:00.0000000")
+                ),
+            }
+        )
+    return rows
+
+
+def estimate_fixture_setup(
+    rows: list[dict[str, object]], min_tests: int = 2
+) -> list[dict[str, object]]:
+    """Estimate setup cost per class as the first test's excess over the median.
+
+    The median is taken over the class's remaining tests so the inflated first
+    test does not drag its own baseline up. Classes with fewer than
+    ``min_tests`` results are skipped — a lone test has no baseline to compare
+    against. Estimates are returned largest first.
+    """
+    by_class: dict[str, list[dict[str, object]]] = {}
+    for row in rows:
+        by_class.setdefault(str(row["class_name"]), []).append(row)
+
+    estimates: list[dict[str, object]] = []
+    for class_name, class_rows in by_class.items():
+        if len(class_rows) < max(min_tests, 2):
+            continue
+        ordered = sorted(class_rows, key=lambda r: r["start_time"])
+        first = ordered[0]
+        first_ms = float(first["duration_ms"])
+        median_ms = statistics.median(float(r["duration_ms"]) for r in ordered[1:])
+        setup_ms = max(first_ms - median_ms, 0.0)
+        total_ms = sum(float(r["duration_ms"]) for r in ordered)
+        estimates.append(
+            {
+                "class_name": class_name,
+                "tests": len(ordered),
+                "first_test": first["test_name"],
+                "first_ms": first_ms,
+                "median_ms": median_ms,
+                "setup_ms": setup_ms,
+                "total_ms": total_ms,
+                "setup_share": setup_ms / total_ms if total_ms else 0.0,
+            }
+        )
+    estimates.sort(key=lambda e: e["setup_ms"], reverse=True)
+    return estimates
+
+
+def render_report(
+    estimates: list[dict[str, object]],
+    n: int = 20,
+    dominant_share: float = DOMINANT_SHARE,
+) -> str:
+    if not estimates:
+        return "No fixture with two or more timed tests found."
+
+    header = " ".join(format_cell(name, width) for name, width in _TABLE_COLUMNS)
+    body_lines = []
+    for estimate in estimates[:n]:
+        cells = [
+            f"{float(estimate['setup_ms']):.1f}ms",
+            f"{float(estimate['setup_share']) * 100:.0f}%",
+            estimate["tests"],
+            f"{float(estimate['first_ms']):.1f}ms",
+            f"{float(estimate['median_ms']):.1f}ms",
+            estimate["class_name"],
+        ]
+        body_lines.append(
+            " ".join(
+                format_cell(cell, width)
+                for cell, (_, width) in zip(cells, _TABLE_COLUMNS)
+            )
+        )
+
+    setup_total_ms = sum(float(e["setup_ms"]) for e in estimates)
+    suite_total_ms = sum(float(e["total_ms"]) for e in estimates)
+    dominated = [e for e in estimates if float(e["setup_share"]) >= dominant_share]
+    share = setup_total_ms / suite_total_ms * 100 if suite_total_ms else 0.0
+    summary = [
+        f"Estimated fixture setup: {setup_total_ms / 1000:.2f}s of "
+        f"{suite_total_ms / 1000:.2f}s test time ({share:.1f}%) across "
+        f"{len(estimates)} fixture(s)",
+        f"Setup dominates (>= {dominant_share * 100:.0f}% of fixture time) in "
+        f"{len(dominated)} fixture(s)"
+        + (":" if dominated else "."),
+    ]
+    summary.extend(f"  {e['class_name']}" for e in dominated)
+    return "\n".join([header, "-" * len(header), *body_lines, "", *summary])
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Estimate per-fixture one-time setup cost from TRX start-time ordering."
+    )
+    parser.add_argument(
+        "--trx",
+        type=Path,
+        required=True,
+        action="append",
+        help="Path to a .trx file (repeat the flag for multiple).",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Number of fixtures to print (default 20).",
+    )
+    parser.add_argument(
+        "--dominant-share",
+        type=float,
+        default=DOMINANT_SHARE,
+        help="Share of a fixture's time above which setup is reported as dominant (default 0.5).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    rows: list[dict[str, object]] = []
+    for trx_path in args.trx:
+        if not trx_path.exists():
+            print(f"warning: TRX not found at {trx_path}", file=sys.stderr)
+            continue
+        rows.extend(parse_trx_timeline(trx_path.read_text(encoding="utf-8-sig")))
+    print(
+        render_report(
+            estimate_fixture_setup(rows),
+            n=args.top,
+            dominant_share=args.dominant_share,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
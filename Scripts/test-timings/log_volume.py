@@ -0,0 +1,159 @@
+"""Rank backend tests and classes by the log output they write into the TRX.
+
+Tests that log megabytes into ``Output/StdOut`` inflate the TRX, its parse time
+and the artifact upload, and the logging itself slows the test down. The TRX
+parser measures each result's ``StdOut``/``StdErr``/``ErrorInfo`` byte size
+(``log_bytes``); this report ranks by total volume and by log bytes per
+millisecond of runtime, which surfaces chatty fast tests the volume ranking
+buries.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+from pathlib import Path
+
+from timing_common import bare_method_name, format_cell
+from trx_to_csv import iter_trx_file
+
+_TABLE_COLUMNS = (
+    ("log_bytes", 12),
+    ("bytes_per_ms", 13),
+    ("duration_ms", 13),
+    ("tests", 6),
+    ("name", 80),
+)
+
+
+def _class_of(fully_qualified_name: str) -> str:
+    return bare_method_name(fully_qualified_name).rsplit(".", 1)[0]
+
+
+def _bytes_per_ms(log_bytes: float, duration_ms: float) -> float:
+    # Sub-millisecond tests would otherwise dominate the rate ranking.
+    return log_bytes / max(duration_ms, 1.0)
+
+
+def rank_tests(rows: list[dict[str, object]]) -> list[dict[str, object]]:
+    """Tests that wrote any log output, largest volume first."""
+    ranked = [
+        {
+            "name": row["fully_qualified_name"],
+            "tests": 1,
+            "log_bytes": int(row["log_bytes"]),
+            "duration_ms": float(row["duration_ms"]),
+            "bytes_per_ms": _bytes_per_ms(
+                int(row["log_bytes"]), float(row["duration_ms"])
+            ),
+        }
+        for row in rows
+        if int(row.get("log_bytes", 0)) > 0
+    ]
+    ranked.sort(key=lambda r: r["log_bytes"], reverse=True)
+    return ranked
+
+
+def rank_classes(rows: list[dict[str, object]]) -> list[dict[str, object]]:
+    """Per-class log volume, largest first; classes with no output are omitted."""
+    totals: dict[str, dict[str, object]] = {}
+    for row in rows:
+        entry = totals.setdefault(
+            _class_of(str(row["fully_qualified_name"])),
+            {"tests": 0, "log_bytes": 0, "duration_ms": 0.0},
+        )
+        entry["tests"] += 1
+        entry["log_bytes"] += int(row.get("log_bytes", 0))
+        entry["duration_ms"] += float(row["duration_ms"])
+    ranked = [
+        {
+            "name": name,
+            **entry,
+            "bytes_per_ms": _bytes_per_ms(entry["log_bytes"], entry["duration_ms"]),
+        }
+        for name, entry in totals.items()
+        if entry["log_bytes"] > 0
+    ]
+    ranked.sort(key=lambda r: r["log_bytes"], reverse=True)
+    return ranked
+
+
+def _render_table(title: str, entries: list[dict[str, object]], n: int) -> list[str]:
+    header = " ".join(format_cell(name, width) for name, width in _TABLE_COLUMNS)
+    lines = [title, header, "-" * len(header)]
+    for entry in entries[:n]:
+        cells = [
+            entry["log_bytes"],
+            f"{float(entry['bytes_per_ms']):.1f}",
+            f"{float(entry['duration_ms']):.1f}ms",
+            entry["tests"],
+            entry["name"],
+        ]
+        lines.append(
+            " ".join(
+                format_cell(cell, width)
+                for cell, (_, width) in zip(cells, _TABLE_COLUMNS)
+            )
+        )
+    return lines
+
+
+def render_report(rows: list[dict[str, object]], n: int = 20) -> str:
+    tests = rank_tests(rows)
+    if not tests:
+        return "No test wrote StdOut/StdErr/ErrorInfo output into the TRX."
+
+    classes = rank_classes(rows)
+    by_rate = sorted(tests, key=lambda r: r["bytes_per_ms"], reverse=True)
+    total_bytes = sum(int(t["log_bytes"]) for t in tests)
+    lines = [
+        *_render_table("Tests by log volume", tests, n),
+        "",
+        *_render_table("Tests by log bytes per ms of runtime", by_rate, n),
+        "",
+        *_render_table("Classes by log volume", classes, n),
+        "",
+        f"Log output: {total_bytes / 1024:.1f} KiB from {len(tests)} of "
+        f"{len(rows)} tests",
+    ]
+    return "\n".join(lines)
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Rank backend tests and classes by the log output they write into TRX files."
+    )
+    parser.add_argument(
+        "--trx",
+        type=Path,
+        required=True,
+        action="append",
+        help="Path to a .trx or .trx.gz file (repeat the flag for multiple).",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Number of entries per table (default 20).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    trx_paths = []
+    for trx_path in args.trx:
+        if not trx_path.exists():
+            print(f"warning: TRX not found at {trx_path}", file=sys.stderr)
+            continue
+        trx_paths.append(trx_path)
+    rows = list(
+        itertools.chain.from_iterable(iter_trx_file(path) for path in trx_paths)
+    )
+    print(render_report(rows, n=args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
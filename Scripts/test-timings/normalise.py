@@ -0,0 +1,203 @@
+"""Normalise per-test durations across runs for runner-speed differences.
+
+GitHub-hosted runners differ enough in speed that a raw ``duration_ms`` from
+one run cannot be compared with another. Each run gets a speed factor
+estimated from a reference set of tests — those whose run-relative duration
+varies least across the supplied history — and every duration is divided by
+its run's factor. A factor of 1.25 means the run was 25% slower than the
+history's typical runner.
+
+Runs are anything ``summarise.gather`` reads: TestResults/ directories, raw
+TRX / Vitest JSON, or downloaded ``test-timings-*`` CSV/NDJSON artifacts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import statistics
+import sys
+from pathlib import Path
+
+from summarise import gather
+from timing_io import strip_compression_suffix
+
+DEFAULT_REFERENCE_COUNT = 50
+MIN_REFERENCE_DURATION_MS = 5.0
+OUTPUT_COLUMNS = (
+    "stack",
+    "name",
+    "category_or_file",
+    "outcome",
+    "duration_ms",
+    "normalised_duration_ms",
+)
+
+RunKey = tuple[str, str]
+
+
+def _run_durations(rows: list[dict[str, object]]) -> dict[RunKey, float]:
+    """Passed tests long enough to time reliably, keyed by ``(stack, name)``.
+
+    Parametrized cases that share a name keep their first duration only.
+    """
+    durations: dict[RunKey, float] = {}
+    for row in rows:
+        duration = float(row["duration_ms"])
+        if row["outcome"] != "Passed" or duration < MIN_REFERENCE_DURATION_MS:
+            continue
+        durations.setdefault((str(row["stack"]), str(row["name"])), duration)
+    return durations
+
+
+def _log_offsets(
+    runs: list[dict[RunKey, float]], keys: list[RunKey], factors: list[float]
+) -> dict[RunKey, list[float]]:
+    """Per test, each run's log-duration (after dividing by its factor) minus the test's mean."""
+    offsets: dict[RunKey, list[float]] = {}
+    for key in keys:
+        logs = [math.log(run[key] / factor) for run, factor in zip(runs, factors)]
+        mean = statistics.fmean(logs)
+        offsets[key] = [value - mean for value in logs]
+    return offsets
+
+
+def _factors_from(
+    runs: list[dict[RunKey, float]], keys: list[RunKey]
+) -> list[float]:
+    offsets = _log_offsets(runs, keys, [1.0] * len(runs))
+    factors = [
+        math.exp(statistics.median(offsets[key][index] for key in keys))
+        for index in range(len(runs))
+    ]
+    # Anchor the geometric mean at 1.0 so factors read as "relative to typical".
+    anchor = math.exp(statistics.fmean(math.log(f) for f in factors))
+    return [factor / anchor for factor in factors]
+
+
+def calibrate(
+    runs_rows: list[list[dict[str, object]]],
+    reference_count: int = DEFAULT_REFERENCE_COUNT,
+) -> dict[str, object]:
+    """Choose the reference tests and estimate one speed factor per run.
+
+    Candidates are tests that passed in every run. A first factor estimate
+    from all candidates removes the runner effect; the ``reference_count``
+    candidates whose remaining log-duration spread is smallest become the
+    reference set, and the final factors are the median log-ratio over that
+    set. Fewer than two runs, or no common tests, yields factors of 1.0.
+    """
+    runs = [_run_durations(rows) for rows in runs_rows]
+    common = sorted(set.intersection(*(set(run) for run in runs))) if runs else []
+    if len(runs) < 2 or not common:
+        return {"factors": [1.0] * len(runs), "reference": []}
+
+    first_pass = _factors_from(runs, common)
+    spread = {
+        key: statistics.pstdev(values)
+        for key, values in _log_offsets(runs, common, first_pass).items()
+    }
+    reference = sorted(common, key=lambda key: (spread[key], key))[:reference_count]
+    return {"factors": _factors_from(runs, reference), "reference": reference}
+
+
+def normalise_rows(
+    rows: list[dict[str, object]], factor: float
+) -> list[dict[str, object]]:
+    """Copy rows with ``normalised_duration_ms`` next to the raw ``duration_ms``."""
+    return [
+        {**row, "normalised_duration_ms": float(row["duration_ms"]) / factor}
+        for row in rows
+    ]
+
+
+def _run_label(index: int, path: Path) -> str:
+    stem = strip_compression_suffix(path).stem if path.is_file() else path.name
+    return f"{index:02d}-{stem or 'run'}"
+
+
+def _write_run(rows: list[dict[str, object]], output: Path) -> None:
+    ordered = sorted(rows, key=lambda r: r["normalised_duration_ms"], reverse=True)
+    with output.open("w", encoding="utf-8", newline="") as stream:
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(OUTPUT_COLUMNS)
+        for row in ordered:
+            writer.writerow(
+                [
+                    row["stack"],
+                    row["name"],
+                    row["category_or_file"],
+                    row["outcome"],
+                    f"{float(row['duration_ms']):.3f}",
+                    f"{float(row['normalised_duration_ms']):.3f}",
+                ]
+            )
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Normalise per-test durations across runs for runner-speed differences."
+    )
+    parser.add_argument(
+        "runs",
+        nargs="+",
+        type=Path,
+        help="One entry per run: a TestResults/ directory, raw results file, or "
+        "test-timings CSV/NDJSON artifact.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        required=True,
+        help="Directory for one normalised CSV per run plus calibration.json.",
+    )
+    parser.add_argument(
+        "--reference-count",
+        type=int,
+        default=DEFAULT_REFERENCE_COUNT,
+        help=f"Size of the low-variance reference set (default {DEFAULT_REFERENCE_COUNT}).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    runs_rows = []
+    for run_path in args.runs:
+        if not run_path.exists():
+            print(f"error: run not found at {run_path}", file=sys.stderr)
+            return 1
+        runs_rows.append(gather([run_path]))
+
+    calibration = calibrate(runs_rows, reference_count=args.reference_count)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    runs_summary = []
+    for index, (run_path, rows, factor) in enumerate(
+        zip(args.runs, runs_rows, calibration["factors"])
+    ):
+        label = _run_label(index, run_path)
+        _write_run(normalise_rows(rows, factor), args.output_dir / f"{label}.csv")
+        runs_summary.append({"run": str(run_path), "label": label, "speed_factor": factor})
+        print(f"{label:<40} speed factor {factor:.3f}")
+
+    (args.output_dir / "calibration.json").write_text(
+        json.dumps(
+            {
+                "runs": runs_summary,
+                "reference_tests": [
+                    {"stack": stack, "name": name}
+                    for stack, name in calibration["reference"]
+                ],
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    print(f"Reference set: {len(calibration['reference'])} test(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,18 +7,41 @@ populated TestResults/ directory.
 from __future__ import annotations
 
 import argparse
+import csv
 import json
 import sys
 from pathlib import Path
+from typing import Iterator
 
+from timing_common import format_cell
+from timing_io import data_suffix, open_text
 from trx_to_csv import (
-    discover_integration_class_names,
-    discover_integration_method_fqns,
-    parse_trx,
+    build_category_index,
+    categories_for,
+    iter_trx_file,
 )
-from vitest_to_csv import parse_vitest
+from vitest_to_csv import CSV_COLUMNS as VITEST_CSV_COLUMNS
+from vitest_to_csv import iter_vitest
 
 _VITEST_REQUIRED_KEYS = {"testResults", "numTotalTests"}
+_BACKEND_EXPORT_KEYS = {"fully_qualified_name", "category", "duration_ms", "outcome"}
+_FRONTEND_EXPORT_KEYS = set(VITEST_CSV_COLUMNS)
+_CANDIDATE_SUFFIXES = {
+    ".trx": "trx",
+    ".json": "json",
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+_CATEGORY_GROUPS = (
+    (
+        "Connector suites",
+        lambda name: name.endswith("Integration") and name != "Integration",
+    ),
+    ("Epics", lambda name: name.startswith("epic-")),
+    ("Slices", lambda name: name.startswith("slice-")),
+    ("Other", lambda name: True),
+)
 _TABLE_COLUMNS = (
     ("stack", 9),
     ("duration_ms", 13),
@@ -28,83 +51,127 @@ _TABLE_COLUMNS = (
 )
 
 
-def _iter_candidate_files(paths: list[Path]) -> tuple[list[Path], list[Path]]:
-    trx: list[Path] = []
-    json_files: list[Path] = []
+def _candidate_kind(path: Path) -> str | None:
+    return _CANDIDATE_SUFFIXES.get(data_suffix(path))
+
+
+def _iter_candidate_files(paths: list[Path]) -> list[tuple[str, Path]]:
+    candidates: list[tuple[str, Path]] = []
     for path in paths:
         if path.is_file():
-            (trx if path.suffix == ".trx" else json_files).append(path)
+            kind = _candidate_kind(path)
+            candidates.append((kind or "json", path))
             continue
         if path.is_dir():
-            trx.extend(sorted(path.rglob("*.trx")))
-            json_files.extend(sorted(path.rglob("*.json")))
-    return trx, json_files
+            found = [
+                (kind, candidate)
+                for candidate in sorted(path.rglob("*"))
+                if candidate.is_file()
+                and (kind := _candidate_kind(candidate)) is not None
+            ]
+            candidates.extend(c for c in found if c[0] == "trx")
+            candidates.extend(c for c in found if c[0] != "trx")
+    return candidates
+
+
+def _load_vitest_report(path: Path) -> dict[str, object] | None:
+    try:
+        with open_text(path) as handle:
+            payload = json.load(handle)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError, EOFError):
+        return None
+    if isinstance(payload, dict) and _VITEST_REQUIRED_KEYS.issubset(payload):
+        return payload
+    return None
+
 
+def _iter_export_records(kind: str, path: Path) -> Iterator[dict[str, object]]:
+    """Read a converter's own CSV/NDJSON output (compressed or not)."""
+    with open_text(path, newline="") as handle:
+        if kind == "csv":
+            yield from csv.DictReader(handle)
+            return
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
 
-def _is_vitest_report(path: Path) -> bool:
+
+def _backend_row(parsed: dict[str, object]) -> dict[str, object]:
+    return {
+        "stack": "Backend",
+        "name": parsed["fully_qualified_name"],
+        "category_or_file": parsed["category"],
+        "duration_ms": float(parsed["duration_ms"]),
+        "outcome": parsed["outcome"],
+    }
+
+
+def _frontend_row(parsed: dict[str, object]) -> dict[str, object]:
+    return {
+        "stack": "Frontend",
+        "name": parsed["test_name"],
+        "category_or_file": parsed["file"],
+        "duration_ms": float(parsed["duration_ms"]),
+        "outcome": parsed["outcome"],
+    }
+
+
+def _rows_from_export(kind: str, path: Path) -> list[dict[str, object]]:
+    rows: list[dict[str, object]] = []
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
-        return False
-    return isinstance(payload, dict) and _VITEST_REQUIRED_KEYS.issubset(payload)
+        for record in _iter_export_records(kind, path):
+            if _BACKEND_EXPORT_KEYS.issubset(record):
+                rows.append(_backend_row(record))
+            elif _FRONTEND_EXPORT_KEYS.issubset(record):
+                rows.append(_frontend_row(record))
+            else:
+                break
+    except (OSError, UnicodeDecodeError, ValueError, EOFError, csv.Error):
+        return []
+    return rows
 
 
 def gather(
     paths: list[Path], source_root: Path | None = None
 ) -> list[dict[str, object]]:
-    """Walk paths and produce normalised rows tagged with their stack."""
-    trx_files, json_files = _iter_candidate_files(paths)
-    integration_classes: set[str] = set()
-    integration_methods: set[str] = set()
+    """Walk paths and produce normalised rows tagged with their stack.
+
+    Accepts raw TRX and Vitest JSON (``.gz``/``.zst`` too) as well as the
+    converters' own CSV/NDJSON exports, which skip XML parsing entirely. With
+    ``source_root``, backend rows also carry every NUnit category that applies
+    to them (``categories``), from a single scan of the tree; the same index
+    marks tests in the ``Integration`` category as Integration.
+    """
+    candidates = _iter_candidate_files(paths)
+    category_index: dict[str, dict[str, set[str]]] | None = None
     if source_root is not None:
-        integration_classes = discover_integration_class_names(source_root)
-        integration_methods = discover_integration_method_fqns(source_root)
+        category_index = build_category_index(source_root)
 
     rows: list[dict[str, object]] = []
-    for trx_path in trx_files:
-        for parsed in parse_trx(
-            trx_path.read_text(encoding="utf-8-sig"),
-            integration_class_names=integration_classes,
-            integration_method_fqns=integration_methods,
-        ):
-            rows.append(
-                {
-                    "stack": "Backend",
-                    "name": parsed["fully_qualified_name"],
-                    "category_or_file": parsed["category"],
-                    "duration_ms": parsed["duration_ms"],
-                    "outcome": parsed["outcome"],
-                }
-            )
-
-    for json_path in json_files:
-        if not _is_vitest_report(json_path):
-            continue
-        for parsed in parse_vitest(json_path.read_text(encoding="utf-8")):
-            rows.append(
-                {
-                    "stack": "Frontend",
-                    "name": parsed["test_name"],
-                    "category_or_file": parsed["file"],
-                    "duration_ms": parsed["duration_ms"],
-                    "outcome": parsed["outcome"],
-                }
-            )
+    for kind, path in candidates:
+        if kind == "trx":
+            rows.extend(_backend_row(parsed) for parsed in iter_trx_file(path))
+        elif kind == "json":
+            payload = _load_vitest_report(path)
+            if payload is not None:
+                rows.extend(_frontend_row(parsed) for parsed in iter_vitest(payload))
+        else:
+            rows.extend(_rows_from_export(kind, path))
+    if category_index is not None:
+        for row in rows:
+            if row["stack"] == "Backend":
+                categories = categories_for(str(row["name"]), category_index)
+                row["categories"] = sorted(categories)
+                if "Integration" in categories:
+                    row["category_or_file"] = "Integration"
     return rows
 
 
-def _format_cell(value: object, width: int) -> str:
-    text = str(value)
-    if len(text) <= width:
-        return text.ljust(width)
-    return text[: max(width - 1, 1)] + "…"
-
-
 def render_top_n(rows: list[dict[str, object]], n: int = 20) -> str:
     if not rows:
         return "No timing data found. Pass one or more TestResults/ directories or files."
 
-    header = " ".join(_format_cell(name, width) for name, width in _TABLE_COLUMNS)
+    header = " ".join(format_cell(name, width) for name, width in _TABLE_COLUMNS)
     rule = "-" * len(header)
 
     ordered = sorted(rows, key=lambda r: r["duration_ms"], reverse=True)[:n]
@@ -112,11 +179,11 @@ def render_top_n(rows: list[dict[str, object]], n: int = 20) -> str:
     for row in ordered:
         duration = f"{float(row['duration_ms']):.1f}ms"
         cells = [
-            _format_cell(row["stack"], _TABLE_COLUMNS[0][1]),
-            _format_cell(duration, _TABLE_COLUMNS[1][1]),
-            _format_cell(row["outcome"], _TABLE_COLUMNS[2][1]),
-            _format_cell(row["category_or_file"], _TABLE_COLUMNS[3][1]),
-            _format_cell(row["name"], _TABLE_COLUMNS[4][1]),
+            format_cell(row["stack"], _TABLE_COLUMNS[0][1]),
+            format_cell(duration, _TABLE_COLUMNS[1][1]),
+            format_cell(row["outcome"], _TABLE_COLUMNS[2][1]),
+            format_cell(row["category_or_file"], _TABLE_COLUMNS[3][1]),
+            format_cell(row["name"], _TABLE_COLUMNS[4][1]),
         ]
         body_lines.append(" ".join(cells))
 
@@ -139,9 +206,55 @@ def _render_summary(rows: list[dict[str, object]]) -> str:
         f"({len(integration)} integration, {integration_ms / 1000:.2f}s)",
         f"Frontend : {len(frontend):>5} tests, {frontend_total_ms / 1000:>8.2f}s wall-clock",
     ]
+    if any("categories" in row for row in backend):
+        lines.extend(["", *_render_category_summary(backend)])
     return "\n".join(lines)
 
 
+def category_totals(rows: list[dict[str, object]]) -> dict[str, tuple[int, float]]:
+    """``category -> (tests, total duration_ms)``; a test counts towards each of its categories."""
+    totals: dict[str, tuple[int, float]] = {}
+    for row in rows:
+        for category in row.get("categories", ()):
+            count, total_ms = totals.get(category, (0, 0.0))
+            totals[category] = (count + 1, total_ms + float(row["duration_ms"]))
+    return totals
+
+
+def _render_category_summary(backend: list[dict[str, object]]) -> list[str]:
+    totals = category_totals(backend)
+    if not totals:
+        return ["Backend categories: none found under --source-root"]
+
+    grouped: dict[str, list[tuple[str, int, float]]] = {}
+    for category, (count, total_ms) in totals.items():
+        group = next(label for label, matches in _CATEGORY_GROUPS if matches(category))
+        grouped.setdefault(group, []).append((category, count, total_ms))
+
+    lines = ["Backend time per category (a test counts towards each of its categories):"]
+    for label, _ in _CATEGORY_GROUPS:
+        entries = sorted(grouped.get(label, []), key=lambda e: e[2], reverse=True)
+        if not entries:
+            continue
+        lines.append(f"  {label}:")
+        lines.extend(
+            f"    {category:<40} {count:>5} tests, {total_ms / 1000:>8.2f}s"
+            for category, count, total_ms in entries
+        )
+    connectors = grouped.get("Connector suites")
+    if connectors:
+        category, _, total_ms = max(connectors, key=lambda e: e[2])
+        lines.append(
+            f"  Most expensive connector suite: {category} ({total_ms / 1000:.2f}s)"
+        )
+    uncategorised = [row for row in backend if not row.get("categories")]
+    lines.append(
+        f"  Uncategorised: {len(uncategorised)} tests, "
+        f"{sum(float(r['duration_ms']) for r in uncategorised) / 1000:.2f}s"
+    )
+    return lines
+
+
 def _build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Print the slowest tests across backend (TRX) and frontend (Vitest JSON) results."
@@ -150,13 +263,15 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         "paths",
         nargs="+",
         type=Path,
-        help="One or more TestResults/ directories or individual .trx / Vitest-JSON files.",
+        help="One or more TestResults/ directories or individual .trx / Vitest-JSON files, "
+        "or test-timings CSV/NDJSON exports (any of them may be .gz/.zst-compressed).",
     )
     parser.add_argument(
         "--source-root",
         type=Path,
         default=None,
-        help="C# source tree root to classify Integration tests (e.g. Lighthouse.Backend/Lighthouse.Backend.Tests).",
+        help="C# source tree root to classify Integration tests and index NUnit categories "
+        "(e.g. Lighthouse.Backend/Lighthouse.Backend.Tests).",
     )
     parser.add_argument(
         "--top",
@@ -169,7 +284,11 @@ def _build_arg_parser() -> argparse.ArgumentParser:
 
 def main(argv: list[str] | None = None) -> int:
     args = _build_arg_parser().parse_args(argv)
-    rows = gather(args.paths, source_root=args.source_root)
+    try:
+        rows = gather(args.paths, source_root=args.source_root)
+    except RuntimeError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
     print(render_top_n(rows, n=args.top))
     return 0
 
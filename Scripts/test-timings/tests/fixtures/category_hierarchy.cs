@@ -0,0 +1,27 @@
+using NUnit.Framework;
+
+namespace Lighthouse.Backend.Tests.Connectors
+{
+    [Category("requires-docker")]
+    public abstract class ConnectorTestBase
+    {
+        [Test]
+        [Category("slice-03")]
+        public void SharedContract() { }
+    }
+
+    [TestFixture, Category("JiraIntegration")]
+    [Category("epic-5687-faster-updates")]
+    public class JiraConnectorTest : ConnectorTestBase
+    {
+        [Test]
+        public void ReadsIssues() { }
+    }
+
+    [Category("AdoIntegration")]
+    public class AdoConnectorTest : ConnectorTestBase
+    {
+        [Test, Category("acceptance")]
+        public void WritesBack() { }
+    }
+}
@@ -0,0 +1,11 @@
+using NUnit.Framework;
+
+namespace Lighthouse.Backend.Tests.Split
+{
+    [Category("Nightly")]
+    public partial class SplitFixtureTest
+    {
+        [Test]
+        public void DeclaredInFirstFile() { }
+    }
+}
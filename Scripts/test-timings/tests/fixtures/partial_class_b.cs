@@ -0,0 +1,10 @@
+using NUnit.Framework;
+
+namespace Lighthouse.Backend.Tests.Split
+{
+    public partial class SplitFixtureTest
+    {
+        [Test]
+        public void DeclaredInSecondFile() { }
+    }
+}
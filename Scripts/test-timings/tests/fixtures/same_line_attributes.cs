@@ -0,0 +1,22 @@
+using NUnit.Framework;
+
+namespace Lighthouse.Backend.Tests.Inline
+{
+    [TestFixture] [Category("Integration")] public class InlineIntegrationTest
+    {
+        [Test, Category("Slow")] public void SlowInline() { }
+
+        [Test, Timeout(500)] public void LimitedInline() { }
+
+        [Test]
+        public void Plain() { }
+    }
+
+    public class NextFixture
+    {
+        [TestCase(new[] { 1, 2 }), Category("Array")] public void TakesArray(int[] values) { }
+
+        [Test]
+        public void Unrelated() { }
+    }
+}
@@ -0,0 +1,19 @@
+using NUnit.Framework;
+
+namespace Lighthouse.Backend.Tests.Slow
+{
+    [TestFixture]
+    [Timeout(2000)]
+    public class TimeoutFixtureTest
+    {
+        [Test]
+        public void InheritsFixtureLimit() { }
+
+        [Test]
+        [CancelAfter(1000)]
+        public async Task HasOwnLimit(CancellationToken token) { }
+
+        [Test, Timeout(100000)]
+        public void FarTooGenerous() { }
+    }
+}
@@ -0,0 +1,27 @@
+using NUnit.Framework;
+
+namespace Lighthouse.Backend.Tests.Slow
+{
+    [Timeout(5000)]
+    public abstract class SlowFixtureBase
+    {
+        [Test]
+        [CancelAfter(3000)]
+        public void SharedSlowContract() { }
+    }
+
+    [TestFixture]
+    public class DerivedSlowTest : SlowFixtureBase
+    {
+        [Test]
+        public void UsesBaseFixtureLimit() { }
+    }
+
+    [TestFixture]
+    [Timeout(8000)]
+    public class OverridingSlowTest : SlowFixtureBase
+    {
+        [Test]
+        public void UsesOwnFixtureLimit() { }
+    }
+}
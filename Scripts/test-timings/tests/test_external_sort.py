@@ -0,0 +1,45 @@
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from external_sort import sorted_by_duration  # noqa: E402
+
+
+def _rows(durations):
+    return [
+        {"name": f"T{index}", "duration_ms": duration}
+        for index, duration in enumerate(durations)
+    ]
+
+
+class SortedByDurationTests(unittest.TestCase):
+    def test_orders_rows_slowest_first_within_one_chunk(self):
+        ordered = list(sorted_by_duration(_rows([1.0, 9.0, 5.0])))
+        self.assertEqual([r["duration_ms"] for r in ordered], [9.0, 5.0, 1.0])
+
+    def test_merges_spilled_chunks_into_one_descending_stream(self):
+        durations = [float((index * 37) % 101) for index in range(250)]
+        ordered = list(sorted_by_duration(_rows(durations), chunk_rows=16))
+        self.assertEqual(
+            [r["duration_ms"] for r in ordered], sorted(durations, reverse=True)
+        )
+
+    def test_matches_builtin_sort_for_equal_durations(self):
+        rows = _rows([3.0, 1.0, 3.0, 2.0, 3.0, 1.0, 2.0])
+        expected = sorted(rows, key=lambda r: r["duration_ms"], reverse=True)
+        self.assertEqual(list(sorted_by_duration(rows, chunk_rows=2)), expected)
+
+    def test_accepts_a_generator(self):
+        ordered = list(sorted_by_duration(iter(_rows([2.0, 4.0])), chunk_rows=1))
+        self.assertEqual([r["name"] for r in ordered], ["T1", "T0"])
+
+    def test_rejects_non_positive_chunk_size(self):
+        with self.assertRaises(ValueError):
+            list(sorted_by_duration(_rows([1.0]), chunk_rows=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from fixture_setup import (  # noqa: E402
+    estimate_fixture_setup,
+    parse_trx_timeline,
+    render_report,
+)
+
+FIXTURES = HERE / "fixtures"
+SAMPLE = (FIXTURES / "fixture-setup.trx").read_text(encoding="utf-8")
+POSTGRES = "Lighthouse.Backend.Tests.Containers.PostgresFixtureTest"
+CALCULATOR = "Lighthouse.Backend.Tests.Foo.CalculatorTest"
+
+
+class ParseTrxTimelineTests(unittest.TestCase):
+    def test_extracts_one_row_per_result_with_start_time(self):
+        rows = parse_trx_timeline(SAMPLE)
+        self.assertEqual(len(rows), 7)
+
+    def test_drops_results_without_start_time(self):
+        rows = parse_trx_timeline(
+            (FIXTURES / "sample.trx").read_text(encoding="utf-8")
+        )
+        self.assertEqual(rows, [])
+
+
+class EstimateFixtureSetupTests(unittest.TestCase):
+    def setUp(self):
+        self.by_class = {
+            e["class_name"]: e
+            for e in estimate_fixture_setup(parse_trx_timeline(SAMPLE))
+        }
+
+    def test_first_test_is_chosen_by_start_time_not_document_order(self):
+        self.assertEqual(self.by_class[POSTGRES]["first_test"], "FirstQuery")
+
+    def test_setup_is_first_test_excess_over_median_of_the_rest(self):
+        self.assertAlmostEqual(self.by_class[POSTGRES]["setup_ms"], 2975.0, places=3)
+
+    def test_setup_never_negative(self):
+        self.assertEqual(self.by_class[CALCULATOR]["setup_ms"], 0.0)
+
+    def test_skips_single_test_fixtures(self):
+        self.assertNotIn("Lighthouse.Backend.Tests.Foo.LoneTest", self.by_class)
+
+    def test_sorted_by_setup_cost_descending(self):
+        estimates = estimate_fixture_setup(parse_trx_timeline(SAMPLE))
+        self.assertEqual(estimates[0]["class_name"], POSTGRES)
+
+
+class RenderReportTests(unittest.TestCase):
+    def test_reports_suite_total_and_dominated_fixtures(self):
+        output = render_report(estimate_fixture_setup(parse_trx_timeline(SAMPLE)))
+        self.assertIn("Estimated fixture setup: 2.98s", output)
+        self.assertIn("Setup dominates (>= 50% of fixture time) in 1 fixture(s):", output)
+        self.assertIn(f"  {POSTGRES}", output)
+
+    def test_renders_empty_message_when_no_estimates(self):
+        self.assertIn("No fixture", render_report([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from log_volume import rank_classes, rank_tests, render_report  # noqa: E402
+from trx_to_csv import iter_trx_file, parse_trx  # noqa: E402
+
+FIXTURES = HERE / "fixtures"
+CHATTY = "Lighthouse.Backend.Tests.Chatty.ChattyTest"
+
+
+class LogBytesParsingTests(unittest.TestCase):
+    def setUp(self):
+        self.by_name = {
+            row["fully_qualified_name"]: row
+            for row in iter_trx_file(FIXTURES / "log-output.trx")
+        }
+
+    def test_measures_stdout_bytes(self):
+        self.assertEqual(self.by_name[f"{CHATTY}.LogsALot"]["log_bytes"], 1000)
+
+    def test_sums_stderr_and_error_info_as_utf8_bytes(self):
+        self.assertEqual(self.by_name[f"{CHATTY}.FailsNoisily"]["log_bytes"], 28)
+
+    def test_results_without_output_have_zero_bytes(self):
+        self.assertEqual(
+            self.by_name["Lighthouse.Backend.Tests.Quiet.QuietTest.Silent"]["log_bytes"],
+            0,
+        )
+
+
+class RankingTests(unittest.TestCase):
+    def setUp(self):
+        self.rows = list(iter_trx_file(FIXTURES / "log-output.trx"))
+
+    def test_ranks_tests_by_volume_and_skips_silent_ones(self):
+        ranked = rank_tests(self.rows)
+        self.assertEqual(
+            [r["name"] for r in ranked],
+            [f"{CHATTY}.LogsALot", f"{CHATTY}.FailsNoisily"],
+        )
+        self.assertAlmostEqual(ranked[0]["bytes_per_ms"], 100.0)
+
+    def test_rolls_up_per_class(self):
+        ranked = rank_classes(self.rows)
+        self.assertEqual(len(ranked), 1)
+        self.assertEqual(ranked[0]["name"], CHATTY)
+        self.assertEqual(ranked[0]["log_bytes"], 1028)
+        self.assertEqual(ranked[0]["tests"], 2)
+
+    def test_report_totals_log_output(self):
+        output = render_report(self.rows)
+        self.assertIn("Classes by log volume", output)
+        self.assertIn("from 2 of 3 tests", output)
+
+    def test_report_says_so_when_nothing_logged(self):
+        rows = parse_trx((FIXTURES / "sample.trx").read_text(encoding="utf-8"))
+        self.assertIn("No test wrote", render_report(rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from normalise import calibrate, normalise_rows  # noqa: E402
+
+SPEEDS = (1.0, 1.5, 0.8)
+NOISE = (1.0, 3.0, 0.4)
+
+
+def _row(name, duration, outcome="Passed"):
+    return {
+        "stack": "Backend",
+        "name": name,
+        "category_or_file": "Unit",
+        "duration_ms": duration,
+        "outcome": outcome,
+    }
+
+
+def _runs():
+    runs = []
+    for run_index, speed in enumerate(SPEEDS):
+        rows = [_row(f"Stable.T{i}", (10.0 + i) * speed) for i in range(10)]
+        rows += [
+            _row(f"Noisy.T{i}", 50.0 * speed * NOISE[(run_index + i) % 3])
+            for i in range(10)
+        ]
+        rows.append(_row("Flaky.T", 40.0 * speed, "Failed" if run_index else "Passed"))
+        runs.append(rows)
+    return runs
+
+
+class CalibrateTests(unittest.TestCase):
+    def test_factors_track_relative_runner_speed(self):
+        factors = calibrate(_runs(), reference_count=10)["factors"]
+        self.assertAlmostEqual(factors[1] / factors[0], 1.5, places=6)
+        self.assertAlmostEqual(factors[2] / factors[0], 0.8, places=6)
+
+    def test_factors_are_anchored_around_one(self):
+        factors = calibrate(_runs(), reference_count=10)["factors"]
+        self.assertAlmostEqual(factors[0] * factors[1] * factors[2], 1.0, places=6)
+
+    def test_reference_set_prefers_low_variance_tests(self):
+        reference = calibrate(_runs(), reference_count=10)["reference"]
+        self.assertEqual(len(reference), 10)
+        self.assertTrue(all(name.startswith("Stable.") for _, name in reference))
+
+    def test_tests_not_passing_in_every_run_are_never_reference(self):
+        reference = calibrate(_runs(), reference_count=100)["reference"]
+        self.assertNotIn(("Backend", "Flaky.T"), reference)
+
+    def test_single_run_is_left_unscaled(self):
+        self.assertEqual(calibrate(_runs()[:1])["factors"], [1.0])
+
+
+class NormaliseRowsTests(unittest.TestCase):
+    def test_keeps_raw_duration_next_to_normalised(self):
+        rows = normalise_rows([_row("A", 30.0)], 1.5)
+        self.assertEqual(rows[0]["duration_ms"], 30.0)
+        self.assertAlmostEqual(rows[0]["normalised_duration_ms"], 20.0)
+
+    def test_normalised_stable_durations_agree_across_runs(self):
+        runs = _runs()
+        factors = calibrate(runs, reference_count=10)["factors"]
+        normalised = [
+            {r["name"]: r["normalised_duration_ms"] for r in normalise_rows(rows, f)}
+            for rows, f in zip(runs, factors)
+        ]
+        for run in normalised[1:]:
+            self.assertAlmostEqual(run["Stable.T3"], normalised[0]["Stable.T3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
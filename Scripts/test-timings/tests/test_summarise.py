@@ -1,14 +1,19 @@
+import gzip
 import io
 import json
 import shutil
 import sys
 import unittest
 from pathlib import Path
+from unittest import mock
 
 HERE = Path(__file__).resolve().parent
 sys.path.insert(0, str(HERE.parent))
 
-from summarise import gather, render_top_n  # noqa: E402
+import summarise  # noqa: E402
+from summarise import category_totals, gather, render_top_n  # noqa: E402
+from trx_to_csv import _read_cs_file, parse_trx, write_rows as write_trx_rows  # noqa: E402
+from vitest_to_csv import parse_vitest, write_rows as write_vitest_rows  # noqa: E402
 
 FIXTURES = HERE / "fixtures"
 
@@ -48,6 +53,100 @@ class GatherTests(unittest.TestCase):
             self.assertNotEqual(row["name"], "")
 
 
+class GatherExportTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = HERE / "_tmp_summarise_exports"
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        self.tmp.mkdir()
+        self.expected = gather(
+            [FIXTURES / "sample.trx", FIXTURES / "sample-vitest.json"]
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _key(self, rows):
+        return sorted(
+            (r["stack"], r["name"], round(float(r["duration_ms"]), 3), r["outcome"])
+            for r in rows
+        )
+
+    def test_reads_compressed_raw_inputs(self):
+        (self.tmp / "sample.trx.gz").write_bytes(
+            gzip.compress((FIXTURES / "sample.trx").read_bytes())
+        )
+        (self.tmp / "vitest-results.json.gz").write_bytes(
+            gzip.compress((FIXTURES / "sample-vitest.json").read_bytes())
+        )
+        self.assertEqual(self._key(gather([self.tmp])), self._key(self.expected))
+
+    def test_reads_converter_csv_and_ndjson_exports(self):
+        write_trx_rows(
+            parse_trx((FIXTURES / "sample.trx").read_text(encoding="utf-8")),
+            self.tmp / "test-timings-backend.csv.gz",
+        )
+        write_vitest_rows(
+            parse_vitest((FIXTURES / "sample-vitest.json").read_text(encoding="utf-8")),
+            self.tmp / "test-timings-frontend.ndjson",
+        )
+        self.assertEqual(self._key(gather([self.tmp])), self._key(self.expected))
+
+    def test_ignores_unrelated_csv_files(self):
+        (self.tmp / "other.csv").write_text("a,b\n1,2\n", encoding="utf-8")
+        self.assertEqual(gather([self.tmp]), [])
+
+
+class CategorySummaryTests(unittest.TestCase):
+    def setUp(self):
+        self.rows = gather([FIXTURES / "categories.trx"], source_root=FIXTURES)
+
+    def test_backend_rows_carry_categories_when_source_root_given(self):
+        by_name = {row["name"]: row for row in self.rows}
+        self.assertEqual(
+            by_name["Lighthouse.Backend.Tests.Connectors.AdoConnectorTest.WritesBack"][
+                "categories"
+            ],
+            ["AdoIntegration", "acceptance", "requires-docker"],
+        )
+
+    def test_category_totals_count_a_test_towards_each_category(self):
+        totals = category_totals(self.rows)
+        self.assertEqual(totals["requires-docker"], (3, 4500.0))
+        self.assertEqual(totals["JiraIntegration"], (2, 4000.0))
+
+    def test_summary_names_most_expensive_connector_suite(self):
+        output = render_top_n(self.rows)
+        self.assertIn("Most expensive connector suite: JiraIntegration (4.00s)", output)
+        self.assertIn("Uncategorised: 1 tests", output)
+
+    def test_integration_category_marks_trx_rows_from_the_same_index(self):
+        rows = gather([FIXTURES / "sample.trx"], source_root=FIXTURES)
+        by_name = {row["name"]: row["category_or_file"] for row in rows}
+        self.assertEqual(
+            by_name["Lighthouse.Backend.Tests.Bar.JiraIntegrationTest.SlowIntegrationTest"],
+            "Integration",
+        )
+        self.assertEqual(
+            by_name['Lighthouse.Backend.Tests.Mixed.MixedTest.IntegrationParametrized("a")'],
+            "Integration",
+        )
+        self.assertEqual(
+            by_name["Lighthouse.Backend.Tests.Foo.FastUnitTestClass.FastUnitTest"], "Unit"
+        )
+
+    def test_source_tree_is_scanned_once(self):
+        with mock.patch(
+            "summarise.build_category_index", wraps=summarise.build_category_index
+        ) as index, mock.patch("trx_to_csv._read_cs_file", wraps=_read_cs_file) as reads:
+            gather([FIXTURES / "sample.trx"], source_root=FIXTURES)
+        self.assertEqual(index.call_count, 1)
+        self.assertEqual(reads.call_count, len(list(FIXTURES.rglob("*.cs"))))
+
+    def test_no_category_section_without_source_root(self):
+        output = render_top_n(gather([FIXTURES / "categories.trx"]))
+        self.assertNotIn("per category", output)
+
+
 class RenderTopNTests(unittest.TestCase):
     def test_renders_a_table_sorted_by_duration_descending(self):
         rows = [
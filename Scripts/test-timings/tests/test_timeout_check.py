@@ -0,0 +1,97 @@
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from timeout_check import classify_timeouts, render_report  # noqa: E402
+from trx_to_csv import discover_test_timeouts, iter_trx_file  # noqa: E402
+
+FIXTURES = HERE / "fixtures"
+SLOW_NAMESPACE = "Lighthouse.Backend.Tests.Slow"
+FIXTURE_CLASS = f"{SLOW_NAMESPACE}.TimeoutFixtureTest"
+
+
+class DiscoverTestTimeoutsTests(unittest.TestCase):
+    def setUp(self):
+        self.limits = discover_test_timeouts(FIXTURES)
+
+    def test_collects_fixture_level_timeout(self):
+        self.assertEqual(self.limits[FIXTURE_CLASS], 2000.0)
+
+    def test_collects_method_level_cancel_after(self):
+        self.assertEqual(self.limits[f"{FIXTURE_CLASS}.HasOwnLimit"], 1000.0)
+
+    def test_collects_timeout_combined_with_other_attributes(self):
+        self.assertEqual(self.limits[f"{FIXTURE_CLASS}.FarTooGenerous"], 100000.0)
+
+    def test_collects_timeout_declared_on_the_attribute_line(self):
+        inline = "Lighthouse.Backend.Tests.Inline.InlineIntegrationTest"
+        self.assertEqual(self.limits[f"{inline}.LimitedInline"], 500.0)
+        self.assertNotIn(f"{inline}.Plain", self.limits)
+
+    def test_methods_without_own_attribute_are_not_listed(self):
+        self.assertNotIn(f"{FIXTURE_CLASS}.InheritsFixtureLimit", self.limits)
+
+    def test_fixture_limit_is_inherited_from_base_class(self):
+        self.assertEqual(self.limits[f"{SLOW_NAMESPACE}.DerivedSlowTest"], 5000.0)
+
+    def test_own_fixture_limit_overrides_inherited_one(self):
+        self.assertEqual(self.limits[f"{SLOW_NAMESPACE}.OverridingSlowTest"], 8000.0)
+
+    def test_inherited_test_method_keeps_base_method_limit(self):
+        for derived in ("DerivedSlowTest", "OverridingSlowTest"):
+            self.assertEqual(
+                self.limits[f"{SLOW_NAMESPACE}.{derived}.SharedSlowContract"], 3000.0
+            )
+
+    def test_inherited_fixture_limit_applies_to_derived_tests(self):
+        findings = classify_timeouts(
+            [
+                {
+                    "fully_qualified_name": f"{SLOW_NAMESPACE}.DerivedSlowTest.UsesBaseFixtureLimit",
+                    "duration_ms": 4500.0,
+                    "outcome": "Passed",
+                }
+            ],
+            self.limits,
+        )
+        self.assertEqual(findings[0]["limit_ms"], 5000.0)
+        self.assertEqual(findings[0]["verdict"], "near-miss")
+
+
+class ClassifyTimeoutsTests(unittest.TestCase):
+    def setUp(self):
+        self.findings = classify_timeouts(
+            list(iter_trx_file(FIXTURES / "timeouts.trx")),
+            discover_test_timeouts(FIXTURES),
+        )
+        self.by_name = {f["name"]: f for f in self.findings}
+
+    def test_flags_test_that_reached_its_limit(self):
+        self.assertEqual(self.by_name[f"{FIXTURE_CLASS}.HasOwnLimit"]["verdict"], "hit")
+
+    def test_flags_near_miss_against_inherited_fixture_limit(self):
+        finding = self.by_name[f"{FIXTURE_CLASS}.InheritsFixtureLimit"]
+        self.assertEqual(finding["verdict"], "near-miss")
+        self.assertEqual(finding["limit_ms"], 2000.0)
+
+    def test_flags_generous_limit(self):
+        self.assertEqual(
+            self.by_name[f"{FIXTURE_CLASS}.FarTooGenerous"]["verdict"], "generous"
+        )
+
+    def test_skips_tests_without_a_limit(self):
+        self.assertEqual(len(self.findings), 3)
+
+    def test_ordered_by_share_of_limit_used(self):
+        self.assertEqual(self.findings[0]["name"], f"{FIXTURE_CLASS}.HasOwnLimit")
+
+    def test_report_summarises_counts(self):
+        output = render_report(self.findings)
+        self.assertIn("1 hit the limit, 1 at >= 80% of it, 1 generous, 0 ok", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
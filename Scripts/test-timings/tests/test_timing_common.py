@@ -0,0 +1,47 @@
+import sys
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from timing_common import (  # noqa: E402
+    TRX_NS,
+    bare_method_name,
+    class_name_lookup,
+    duration_to_milliseconds,
+    format_cell,
+)
+
+
+class TrxHelperTests(unittest.TestCase):
+    def test_duration_to_milliseconds(self):
+        self.assertAlmostEqual(duration_to_milliseconds("01:02:03.5000000"), 3723500.0)
+        self.assertEqual(duration_to_milliseconds("00:00:00.0000000"), 0.0)
+
+    def test_bare_method_name_drops_arguments(self):
+        self.assertEqual(bare_method_name("Ns.C.Test(1,\"a\")"), "Ns.C.Test")
+        self.assertEqual(bare_method_name("Ns.C.Test"), "Ns.C.Test")
+
+    def test_class_name_lookup_maps_test_ids(self):
+        ns = TRX_NS.strip("{}")
+        root = ET.fromstring(
+            f'<TestRun xmlns="{ns}"><TestDefinitions>'
+            '<UnitTest id="a"><TestMethod className="Ns.A" name="T" /></UnitTest>'
+            '<UnitTest id="b"><TestMethod name="T" /></UnitTest>'
+            "</TestDefinitions></TestRun>"
+        )
+        self.assertEqual(class_name_lookup(root), {"a": "Ns.A"})
+
+
+class FormatCellTests(unittest.TestCase):
+    def test_pads_short_values(self):
+        self.assertEqual(format_cell(12, 5), "12   ")
+
+    def test_truncates_long_values_with_ellipsis(self):
+        self.assertEqual(format_cell("abcdefgh", 5), "abcd…")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import gzip
+import shutil
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from timing_io import (  # noqa: E402
+    data_suffix,
+    open_text,
+    output_format,
+    strip_compression_suffix,
+)
+
+
+class SuffixTests(unittest.TestCase):
+    def test_strips_only_compression_suffixes(self):
+        self.assertEqual(strip_compression_suffix(Path("a.csv.gz")), Path("a.csv"))
+        self.assertEqual(strip_compression_suffix(Path("a.csv.zst")), Path("a.csv"))
+        self.assertEqual(strip_compression_suffix(Path("a.csv")), Path("a.csv"))
+
+    def test_data_suffix_ignores_compression(self):
+        self.assertEqual(data_suffix(Path("run.trx.gz")), ".trx")
+        self.assertEqual(data_suffix(Path("vitest.json")), ".json")
+
+    def test_output_format_follows_data_suffix(self):
+        self.assertEqual(output_format(Path("t.ndjson.gz")), "ndjson")
+        self.assertEqual(output_format(Path("t.jsonl")), "ndjson")
+        self.assertEqual(output_format(Path("t.csv.zst")), "csv")
+        self.assertEqual(output_format(Path("t.csv")), "csv")
+
+
+class OpenTextTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = HERE / "_tmp_timing_io"
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        self.tmp.mkdir()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_gzip_round_trip(self):
+        path = self.tmp / "rows.csv.gz"
+        with open_text(path, "w") as handle:
+            handle.write("a,b\n1,2\n")
+        with gzip.open(path, "rt", encoding="utf-8") as raw:
+            self.assertEqual(raw.read(), "a,b\n1,2\n")
+        with open_text(path) as handle:
+            self.assertEqual(handle.read(), "a,b\n1,2\n")
+
+    def test_plain_files_pass_through(self):
+        path = self.tmp / "rows.csv"
+        with open_text(path, "w") as handle:
+            handle.write("x\n")
+        self.assertEqual(path.read_text(encoding="utf-8"), "x\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 import csv
+import gzip
 import io
+import json
+import shutil
 import unittest
 from pathlib import Path
 
@@ -9,13 +12,18 @@ HERE = Path(__file__).resolve().parent
 sys.path.insert(0, str(HERE.parent))
 
 from trx_to_csv import (
+    build_category_index,
+    categories_for,
+    iter_trx_file,
+    main,
     parse_trx,
-    discover_integration_class_names,
-    discover_integration_method_fqns,
     rows_to_csv,
+    rows_to_ndjson,
+    write_rows,
 )
 
 FIXTURES = HERE / "fixtures"
+SAMPLE_INDEX = build_category_index(FIXTURES)
 
 
 class ParseTrxTests(unittest.TestCase):
@@ -28,7 +36,13 @@ class ParseTrxTests(unittest.TestCase):
         row = rows[0]
         self.assertEqual(
             set(row.keys()),
-            {"fully_qualified_name", "category", "duration_ms", "outcome"},
+            {
+                "fully_qualified_name",
+                "category",
+                "duration_ms",
+                "outcome",
+                "log_bytes",
+            },
         )
 
     def test_fully_qualified_name_combines_class_and_method(self):
@@ -84,9 +98,7 @@ class ParseTrxTests(unittest.TestCase):
     def test_category_marked_integration_when_class_classified(self):
         rows = parse_trx(
             (FIXTURES / "sample.trx").read_text(encoding="utf-8"),
-            integration_class_names={
-                "Lighthouse.Backend.Tests.Bar.JiraIntegrationTest"
-            },
+            category_index=SAMPLE_INDEX,
         )
         by_class = {row["fully_qualified_name"]: row for row in rows}
         self.assertEqual(
@@ -105,10 +117,7 @@ class ParseTrxTests(unittest.TestCase):
     def test_category_marked_integration_when_method_classified(self):
         rows = parse_trx(
             (FIXTURES / "sample.trx").read_text(encoding="utf-8"),
-            integration_method_fqns={
-                "Lighthouse.Backend.Tests.Mixed.MixedTest.IntegrationMethod",
-                "Lighthouse.Backend.Tests.Mixed.MixedTest.IntegrationParametrized",
-            },
+            category_index=SAMPLE_INDEX,
         )
         by_name = {row["fully_qualified_name"]: row for row in rows}
         self.assertEqual(
@@ -127,9 +136,7 @@ class ParseTrxTests(unittest.TestCase):
     def test_method_classification_matches_parametrized_test_names(self):
         rows = parse_trx(
             (FIXTURES / "sample.trx").read_text(encoding="utf-8"),
-            integration_method_fqns={
-                "Lighthouse.Backend.Tests.Mixed.MixedTest.IntegrationParametrized",
-            },
+            category_index=SAMPLE_INDEX,
         )
         parametrized = [
             row
@@ -143,39 +150,148 @@ class ParseTrxTests(unittest.TestCase):
             self.assertEqual(row["category"], "Integration")
 
 
-class DiscoverIntegrationClassNamesTests(unittest.TestCase):
-    def test_detects_class_level_integration_attribute(self):
-        names = discover_integration_class_names(FIXTURES)
-        self.assertIn("Lighthouse.Backend.Tests.Bar.JiraIntegrationTest", names)
+class IterTrxFileTests(unittest.TestCase):
+    def test_streams_the_same_rows_as_parse_trx(self):
+        streamed = list(
+            iter_trx_file(FIXTURES / "sample.trx", category_index=SAMPLE_INDEX)
+        )
+        parsed = parse_trx(
+            (FIXTURES / "sample.trx").read_text(encoding="utf-8"),
+            category_index=SAMPLE_INDEX,
+        )
+        self.assertEqual(streamed, parsed)
 
-    def test_ignores_classes_without_integration_attribute(self):
-        names = discover_integration_class_names(FIXTURES)
-        self.assertNotIn(
-            "Lighthouse.Backend.Tests.Foo.FastUnitTestClass", names
+    def test_reads_gzip_compressed_trx(self):
+        tmp = HERE / "_tmp_trx_gz"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        try:
+            compressed = tmp / "sample.trx.gz"
+            compressed.write_bytes(
+                gzip.compress((FIXTURES / "sample.trx").read_bytes())
+            )
+            self.assertEqual(len(list(iter_trx_file(compressed))), 8)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+class BuildCategoryIndexTests(unittest.TestCase):
+    JIRA = "Lighthouse.Backend.Tests.Connectors.JiraConnectorTest"
+    ADO = "Lighthouse.Backend.Tests.Connectors.AdoConnectorTest"
+
+    def setUp(self):
+        self.index = build_category_index(FIXTURES)
+
+    def test_collects_every_class_level_category(self):
+        self.assertEqual(
+            self.index["classes"]["Lighthouse.Backend.Tests.Bar.JiraIntegrationTest"],
+            {"Integration"},
         )
 
-    def test_does_not_treat_method_level_decoration_as_class_level(self):
-        names = discover_integration_class_names(FIXTURES)
-        self.assertNotIn("Lighthouse.Backend.Tests.Mixed.MixedTest", names)
+    def test_combines_categories_from_several_attribute_lines(self):
+        self.assertTrue(
+            {"JiraIntegration", "epic-5687-faster-updates"}
+            <= self.index["classes"][self.JIRA]
+        )
 
+    def test_inherits_categories_from_base_class(self):
+        self.assertIn("requires-docker", self.index["classes"][self.JIRA])
+        self.assertIn("requires-docker", self.index["classes"][self.ADO])
 
-class DiscoverIntegrationMethodFqnsTests(unittest.TestCase):
-    def test_collects_method_decorated_with_integration_attribute(self):
-        fqns = discover_integration_method_fqns(FIXTURES)
-        self.assertIn(
-            "Lighthouse.Backend.Tests.Mixed.MixedTest.IntegrationMethod", fqns
+    def test_method_categories_combine_with_class_categories(self):
+        self.assertEqual(
+            categories_for(f"{self.ADO}.WritesBack", self.index),
+            {"AdoIntegration", "requires-docker", "acceptance"},
         )
+
+    def test_inherited_method_keeps_its_categories_under_derived_class(self):
         self.assertIn(
-            "Lighthouse.Backend.Tests.Mixed.MixedTest.IntegrationParametrized",
-            fqns,
+            "slice-03", categories_for(f"{self.JIRA}.SharedContract", self.index)
         )
-
-    def test_ignores_methods_without_integration_attribute(self):
-        fqns = discover_integration_method_fqns(FIXTURES)
         self.assertNotIn(
-            "Lighthouse.Backend.Tests.Mixed.MixedTest.UnitOnlyMethod", fqns
+            "slice-03", categories_for(f"{self.JIRA}.ReadsIssues", self.index)
+        )
+
+    def test_partial_class_keeps_categories_from_every_declaration(self):
+        self.assertEqual(
+            self.index["classes"]["Lighthouse.Backend.Tests.Split.SplitFixtureTest"],
+            {"Nightly"},
         )
 
+    def test_method_level_category_is_not_class_level(self):
+        self.assertNotIn("Lighthouse.Backend.Tests.Mixed.MixedTest", self.index["classes"])
+        self.assertEqual(
+            self.index["methods"]["Lighthouse.Backend.Tests.Mixed.MixedTest.IntegrationMethod"],
+            {"Integration"},
+        )
+
+    def test_declaration_on_the_attribute_line_takes_its_categories(self):
+        inline = "Lighthouse.Backend.Tests.Inline"
+        self.assertEqual(
+            self.index["classes"][f"{inline}.InlineIntegrationTest"], {"Integration"}
+        )
+        self.assertEqual(
+            categories_for(f"{inline}.InlineIntegrationTest.SlowInline", self.index),
+            {"Integration", "Slow"},
+        )
+        self.assertEqual(
+            categories_for(f"{inline}.InlineIntegrationTest.Plain", self.index),
+            {"Integration"},
+        )
+        self.assertNotIn(f"{inline}.NextFixture", self.index["classes"])
+        self.assertEqual(
+            categories_for(f"{inline}.NextFixture.TakesArray", self.index), {"Array"}
+        )
+        self.assertEqual(
+            categories_for(f"{inline}.NextFixture.Unrelated", self.index), set()
+        )
+
+    def test_uncategorised_test_has_no_categories(self):
+        self.assertEqual(
+            categories_for(
+                "Lighthouse.Backend.Tests.Foo.FastUnitTestClass.FastUnitTest",
+                self.index,
+            ),
+            set(),
+        )
+
+
+class MainTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = HERE / "_tmp_trx_main"
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        self.tmp.mkdir()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_classifies_with_the_category_index(self):
+        output = self.tmp / "timings.csv"
+        status = main(
+            [
+                "--trx", str(FIXTURES / "sample.trx"),
+                "--source-root", str(FIXTURES),
+                "--output", str(output),
+            ]
+        )
+        self.assertEqual(status, 0)
+        with output.open(encoding="utf-8") as stream:
+            categories = {
+                row["fully_qualified_name"]: row["category"]
+                for row in csv.DictReader(stream)
+            }
+        self.assertEqual(
+            categories,
+            {
+                row["fully_qualified_name"]: row["category"]
+                for row in parse_trx(
+                    (FIXTURES / "sample.trx").read_text(encoding="utf-8"),
+                    category_index=SAMPLE_INDEX,
+                )
+            },
+        )
+        self.assertIn("Integration", categories.values())
+
 
 class RowsToCsvTests(unittest.TestCase):
     def test_writes_header_in_declared_order(self):
@@ -193,7 +309,8 @@ class RowsToCsvTests(unittest.TestCase):
         )
         first_line = buf.getvalue().splitlines()[0]
         self.assertEqual(
-            first_line, "fully_qualified_name,category,duration_ms,outcome"
+            first_line,
+            "fully_qualified_name,category,duration_ms,outcome,log_bytes",
         )
 
     def test_rows_sorted_by_duration_descending(self):
@@ -219,6 +336,26 @@ class RowsToCsvTests(unittest.TestCase):
         ordered = [row["fully_qualified_name"] for row in reader]
         self.assertEqual(ordered, ["B", "A"])
 
+    def test_rows_sorted_across_spilled_chunks(self):
+        buf = io.StringIO()
+        rows_to_csv(
+            (
+                {
+                    "fully_qualified_name": f"T{i}",
+                    "category": "Unit",
+                    "duration_ms": float(i % 7),
+                    "outcome": "Passed",
+                }
+                for i in range(20)
+            ),
+            buf,
+            chunk_rows=3,
+        )
+        reader = csv.DictReader(io.StringIO(buf.getvalue()))
+        durations = [float(row["duration_ms"]) for row in reader]
+        self.assertEqual(len(durations), 20)
+        self.assertEqual(durations, sorted(durations, reverse=True))
+
     def test_duration_formatted_with_three_decimals(self):
         buf = io.StringIO()
         rows_to_csv(
@@ -237,5 +374,62 @@ class RowsToCsvTests(unittest.TestCase):
         self.assertEqual(first["duration_ms"], "1.235")
 
 
+class RowsToNdjsonTests(unittest.TestCase):
+    def test_writes_one_object_per_row_slowest_first(self):
+        buf = io.StringIO()
+        rows_to_ndjson(
+            [
+                {
+                    "fully_qualified_name": "A",
+                    "category": "Unit",
+                    "duration_ms": 1.23456,
+                    "outcome": "Passed",
+                },
+                {
+                    "fully_qualified_name": "B",
+                    "category": "Integration",
+                    "duration_ms": 9.0,
+                    "outcome": "Failed",
+                },
+            ],
+            buf,
+        )
+        records = [json.loads(line) for line in buf.getvalue().splitlines()]
+        self.assertEqual([r["fully_qualified_name"] for r in records], ["B", "A"])
+        self.assertEqual(records[1]["duration_ms"], 1.235)
+        self.assertEqual(
+            list(records[0]),
+            ["fully_qualified_name", "category", "duration_ms", "outcome", "log_bytes"],
+        )
+
+
+class WriteRowsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = HERE / "_tmp_write_rows"
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        self.tmp.mkdir()
+        self.rows = parse_trx((FIXTURES / "sample.trx").read_text(encoding="utf-8"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_compressed_csv_chosen_by_suffix(self):
+        output = self.tmp / "timings.csv.gz"
+        write_rows(self.rows, output)
+        with gzip.open(output, "rt", encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+        self.assertEqual(
+            lines[0], "fully_qualified_name,category,duration_ms,outcome,log_bytes"
+        )
+        self.assertEqual(len(lines), 9)
+
+    def test_ndjson_chosen_by_suffix(self):
+        output = self.tmp / "timings.ndjson"
+        write_rows(self.rows, output)
+        lines = output.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 8)
+        self.assertEqual(json.loads(lines[0])["duration_ms"], 2500.0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,180 @@
+"""Flag backend tests running close to (or over) their NUnit timeout.
+
+``[Timeout(ms)]`` / ``[CancelAfter(ms)]`` limits are read from the C# source
+(test-level, or fixture-level on the class) and joined with TRX durations. A
+test at 85% of its limit passes today and fails the first time CI lands on a
+runner 20% slower; a test at 2% of its limit has a limit that no longer
+guards anything. Both are reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+from pathlib import Path
+
+from timing_common import bare_method_name, format_cell
+from trx_to_csv import discover_test_timeouts, iter_trx_file
+
+NEAR_MISS_RATIO = 0.8
+GENEROUS_RATIO = 0.05
+_TABLE_COLUMNS = (
+    ("verdict", 10),
+    ("used", 7),
+    ("duration_ms", 13),
+    ("limit_ms", 11),
+    ("name", 80),
+)
+
+
+def _limit_for(fully_qualified_name: str, limits: dict[str, float]) -> float | None:
+    method_fqn = bare_method_name(fully_qualified_name)
+    if method_fqn in limits:
+        return limits[method_fqn]
+    return limits.get(method_fqn.rsplit(".", 1)[0])
+
+
+def classify_timeouts(
+    rows: list[dict[str, object]],
+    limits: dict[str, float],
+    near_miss_ratio: float = NEAR_MISS_RATIO,
+    generous_ratio: float = GENEROUS_RATIO,
+) -> list[dict[str, object]]:
+    """Join rows with their timeout limit and classify each limited test.
+
+    Verdicts are ``hit`` (duration reached the limit), ``near-miss`` (at or
+    above ``near_miss_ratio``), ``generous`` (below ``generous_ratio``) or
+    ``ok``. Results are ordered by share of the limit used, highest first.
+    """
+    findings: list[dict[str, object]] = []
+    for row in rows:
+        name = str(row["fully_qualified_name"])
+        limit_ms = _limit_for(name, limits)
+        if not limit_ms:
+            continue
+        duration_ms = float(row["duration_ms"])
+        ratio = duration_ms / limit_ms
+        if ratio >= 1.0:
+            verdict = "hit"
+        elif ratio >= near_miss_ratio:
+            verdict = "near-miss"
+        elif ratio < generous_ratio:
+            verdict = "generous"
+        else:
+            verdict = "ok"
+        findings.append(
+            {
+                "name": name,
+                "duration_ms": duration_ms,
+                "limit_ms": limit_ms,
+                "ratio": ratio,
+                "verdict": verdict,
+                "outcome": row["outcome"],
+            }
+        )
+    findings.sort(key=lambda f: f["ratio"], reverse=True)
+    return findings
+
+
+def render_report(
+    findings: list[dict[str, object]], near_miss_ratio: float = NEAR_MISS_RATIO
+) -> str:
+    if not findings:
+        return "No test with a [Timeout]/[CancelAfter] limit found in the results."
+
+    header = " ".join(format_cell(name, width) for name, width in _TABLE_COLUMNS)
+    body_lines = []
+    for finding in findings:
+        if finding["verdict"] == "ok":
+            continue
+        cells = [
+            finding["verdict"],
+            f"{float(finding['ratio']) * 100:.0f}%",
+            f"{float(finding['duration_ms']):.1f}ms",
+            f"{float(finding['limit_ms']):.0f}ms",
+            finding["name"],
+        ]
+        body_lines.append(
+            " ".join(
+                format_cell(cell, width)
+                for cell, (_, width) in zip(cells, _TABLE_COLUMNS)
+            )
+        )
+
+    counts = {
+        verdict: sum(1 for f in findings if f["verdict"] == verdict)
+        for verdict in ("hit", "near-miss", "generous", "ok")
+    }
+    summary = (
+        f"Timeout-limited tests: {len(findings)} — {counts['hit']} hit the limit, "
+        f"{counts['near-miss']} at >= {near_miss_ratio * 100:.0f}% of it, "
+        f"{counts['generous']} generous, {counts['ok']} ok"
+    )
+    if not body_lines:
+        return summary
+    return "\n".join([header, "-" * len(header), *body_lines, "", summary])
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Flag backend tests running close to their [Timeout]/[CancelAfter] limit."
+    )
+    parser.add_argument(
+        "--trx",
+        type=Path,
+        required=True,
+        action="append",
+        help="Path to a .trx or .trx.gz file (repeat the flag for multiple).",
+    )
+    parser.add_argument(
+        "--source-root",
+        type=Path,
+        required=True,
+        help="C# source tree root to read timeout attributes from.",
+    )
+    parser.add_argument(
+        "--near-miss",
+        type=float,
+        default=NEAR_MISS_RATIO,
+        help=f"Share of the limit at which a test is flagged (default {NEAR_MISS_RATIO}).",
+    )
+    parser.add_argument(
+        "--generous",
+        type=float,
+        default=GENEROUS_RATIO,
+        help=f"Share of the limit below which it is reported as generous (default {GENEROUS_RATIO}).",
+    )
+    parser.add_argument(
+        "--fail-on-near-miss",
+        action="store_true",
+        help="Exit 1 when any test hit or nearly hit its limit.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    limits = discover_test_timeouts(args.source_root)
+    trx_paths = []
+    for trx_path in args.trx:
+        if not trx_path.exists():
+            print(f"warning: TRX not found at {trx_path}", file=sys.stderr)
+            continue
+        trx_paths.append(trx_path)
+    rows = list(
+        itertools.chain.from_iterable(iter_trx_file(path) for path in trx_paths)
+    )
+    findings = classify_timeouts(
+        rows, limits, near_miss_ratio=args.near_miss, generous_ratio=args.generous
+    )
+    print(render_report(findings, near_miss_ratio=args.near_miss))
+    if args.fail_on_near_miss and any(
+        f["verdict"] in ("hit", "near-miss") for f in findings
+    ):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+"""TRX and report-table helpers shared by the timing tools.
+
+``trx_to_csv`` and the reports built on TRX results (``fixture_setup``,
+``log_volume``, ``timeout_check``) and ``summarise`` all import from here, so
+no module reaches into another's private functions.
+"""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+
+TRX_NS = "{http://microsoft.com/schemas/VisualStudio/TeamTest/2010}"
+
+
+def duration_to_milliseconds(raw: str) -> float:
+    """TRX ``hh:mm:ss.fffffff`` duration in milliseconds."""
+    hours_str, minutes_str, seconds_str = raw.split(":")
+    seconds = float(seconds_str)
+    return ((int(hours_str) * 60 + int(minutes_str)) * 60 + seconds) * 1000.0
+
+
+def class_name_lookup(root: ET.Element) -> dict[str, str]:
+    """Test id to ``className`` from a TRX document's ``<TestDefinitions>``."""
+    lookup: dict[str, str] = {}
+    for unit_test in root.iter(f"{TRX_NS}UnitTest"):
+        test_id = unit_test.get("id")
+        method = unit_test.find(f"{TRX_NS}TestMethod")
+        if test_id and method is not None:
+            class_name = method.get("className")
+            if class_name:
+                lookup[test_id] = class_name
+    return lookup
+
+
+def bare_method_name(test_name: str) -> str:
+    """A test name without its parametrized ``(...)`` argument tail."""
+    paren = test_name.find("(")
+    return test_name if paren < 0 else test_name[:paren]
+
+
+def format_cell(value: object, width: int) -> str:
+    """``value`` padded to ``width``, or cut with an ellipsis when longer."""
+    text = str(value)
+    if len(text) <= width:
+        return text.ljust(width)
+    return text[: max(width - 1, 1)] + "…"
@@ -0,0 +1,63 @@
+"""File helpers shared by the timing converters and ``summarise``.
+
+Compression is chosen by suffix: ``.gz`` uses the standard library, ``.zst``
+needs the optional ``zstandard`` package and fails with an install hint when
+it is missing. Everything else is opened as plain text.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+COMPRESSION_SUFFIXES = (".gz", ".zst")
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+def strip_compression_suffix(path: Path) -> Path:
+    """``results.csv.gz`` -> ``results.csv``; uncompressed paths come back unchanged."""
+    return path.with_suffix("") if path.suffix in COMPRESSION_SUFFIXES else path
+
+
+def data_suffix(path: Path) -> str:
+    """The suffix describing the content, ignoring any compression suffix."""
+    return strip_compression_suffix(path).suffix
+
+
+def output_format(path: Path) -> str:
+    """``ndjson`` for ``.ndjson``/``.jsonl`` outputs (compressed or not), else ``csv``."""
+    return "ndjson" if data_suffix(path) in NDJSON_SUFFIXES else "csv"
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as error:
+        raise RuntimeError(
+            "zstd-compressed timing files need the 'zstandard' package "
+            "(pip install zstandard), or use .gz instead."
+        ) from error
+    return zstandard
+
+
+def open_binary(path: Path, mode: str = "rb") -> BinaryIO:
+    """Open ``path`` as a binary stream, transparently (de)compressing by suffix."""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode)
+    if path.suffix == ".zst":
+        return _zstandard().open(path, mode)
+    return path.open(mode)
+
+
+def open_text(
+    path: Path, mode: str = "r", encoding: str = "utf-8", newline: str | None = None
+) -> TextIO:
+    """Open ``path`` as text, transparently (de)compressing by suffix."""
+    binary_mode = mode.replace("t", "").replace("b", "")
+    if path.suffix in COMPRESSION_SUFFIXES:
+        return io.TextIOWrapper(
+            open_binary(path, binary_mode + "b"), encoding=encoding, newline=newline
+        )
+    return path.open(binary_mode, encoding=encoding, newline=newline)
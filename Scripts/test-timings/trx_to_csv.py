@@ -1,34 +1,57 @@
 """Extract per-test timings from a TRX file into a CSV row stream.
 
 NUnit's TRX adapter does not surface ``[Category("Integration")]`` in TRX
-attributes, so integration classification is derived by scanning the C#
-source tree for class-level ``[Category("Integration")]`` and matching
-against the ``className`` recorded in ``<TestMethod>``.
+attributes, so integration classification comes from ``build_category_index``,
+a scan of the C# source tree, matched against the ``className`` recorded in
+``<TestMethod>`` and the test name.
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import itertools
+import json
 import re
 import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Iterable, TextIO
+from typing import BinaryIO, Iterable, Iterator, TextIO
 
-TRX_NS = "{http://microsoft.com/schemas/VisualStudio/TeamTest/2010}"
-CSV_COLUMNS = ("fully_qualified_name", "category", "duration_ms", "outcome")
-INTEGRATION_CATEGORY_AT_CLASS_PATTERN = re.compile(
-    r'\[Category\(\s*"Integration"\s*\)\]\s*(?:public\s+|internal\s+|sealed\s+|static\s+|partial\s+)*class\s+([A-Za-z_][A-Za-z0-9_]*)'
+from external_sort import DEFAULT_CHUNK_ROWS, sorted_by_duration
+from timing_common import (
+    TRX_NS,
+    bare_method_name,
+    class_name_lookup,
+    duration_to_milliseconds,
 )
+from timing_io import open_binary, open_text, output_format
+
+CSV_COLUMNS = (
+    "fully_qualified_name",
+    "category",
+    "duration_ms",
+    "outcome",
+    "log_bytes",
+)
+LOG_OUTPUT_ELEMENTS = ("StdOut", "StdErr", "ErrorInfo")
 NAMESPACE_PATTERN = re.compile(
     r"^\s*namespace\s+([A-Za-z_][A-Za-z0-9_.]*)\s*[;{]", re.MULTILINE
 )
 CLASS_DECLARATION_PATTERN = re.compile(
     r"^\s*(?:public\s+|internal\s+|sealed\s+|static\s+|partial\s+|abstract\s+)*class\s+([A-Za-z_][A-Za-z0-9_]*)"
 )
-INTEGRATION_ATTRIBUTE_PATTERN = re.compile(
-    r'\[Category\(\s*"Integration"\s*\)\]'
+CATEGORY_ATTRIBUTE_PATTERN = re.compile(r'\bCategory\(\s*"([^"]+)"\s*\)')
+ATTRIBUTE_LINE_PATTERN = re.compile(r"^\s*\[")
+# One ``[...]`` attribute list; strings and one level of brackets (``new[] {...}``) may nest.
+ATTRIBUTE_LIST_PATTERN = re.compile(
+    r'\s*\[(?:[^\[\]"]|"(?:[^"\\]|\\.)*"|\[[^\]]*\])*\]'
+)
+CLASS_BASE_PATTERN = re.compile(
+    r"\bclass\s+[A-Za-z_][A-Za-z0-9_]*\s*(?:<[^>]*>)?\s*:\s*([A-Za-z_][A-Za-z0-9_.]*)"
+)
+TIMEOUT_ATTRIBUTE_PATTERN = re.compile(
+    r"^\s*\[.*\b(?:Timeout|CancelAfter)\(\s*(\d+)\s*\)"
 )
 METHOD_DECLARATION_PATTERN = re.compile(
     r"^\s*(?:public\s+|internal\s+|protected\s+|private\s+|static\s+|async\s+|virtual\s+|override\s+|sealed\s+)*"
@@ -36,73 +59,191 @@ METHOD_DECLARATION_PATTERN = re.compile(
 )
 
 
-def _duration_to_milliseconds(raw: str) -> float:
-    hours_str, minutes_str, seconds_str = raw.split(":")
-    seconds = float(seconds_str)
-    return ((int(hours_str) * 60 + int(minutes_str)) * 60 + seconds) * 1000.0
+def _output_byte_size(result: ET.Element) -> int:
+    """UTF-8 byte size of a result's ``StdOut``, ``StdErr`` and ``ErrorInfo``.
 
-
-def _class_name_lookup(root: ET.Element) -> dict[str, str]:
-    lookup: dict[str, str] = {}
-    for unit_test in root.iter(f"{TRX_NS}UnitTest"):
-        test_id = unit_test.get("id")
-        method = unit_test.find(f"{TRX_NS}TestMethod")
-        if test_id and method is not None:
-            class_name = method.get("className")
-            if class_name:
-                lookup[test_id] = class_name
-    return lookup
+    Only the sizes are kept; the text itself is dropped with the element.
+    """
+    output = result.find(f"{TRX_NS}Output")
+    if output is None:
+        return 0
+    total = 0
+    for name in LOG_OUTPUT_ELEMENTS:
+        element = output.find(f"{TRX_NS}{name}")
+        if element is None:
+            continue
+        # Count leaf text only: the whitespace around ErrorInfo's Message and
+        # StackTrace children is TRX indentation, not test output.
+        total += sum(
+            len(leaf.text.encode("utf-8"))
+            for leaf in element.iter()
+            if leaf.text and len(leaf) == 0
+        )
+    return total
 
 
-def _bare_method_name(test_name: str) -> str:
-    paren = test_name.find("(")
-    return test_name if paren < 0 else test_name[:paren]
+def _result_row(
+    result: ET.Element,
+    class_by_id: dict[str, str],
+    category_index: dict[str, dict[str, set[str]]] | None,
+) -> dict[str, object]:
+    test_id = result.get("testId")
+    method_name = result.get("testName", "")
+    class_name = class_by_id.get(test_id or "", "")
+    fqn = (
+        f"{class_name}.{method_name}".lstrip(".")
+        if method_name
+        else class_name
+    )
+    category = (
+        "Integration"
+        if category_index is not None
+        and "Integration" in categories_for(f"{class_name}.{method_name}", category_index)
+        else "Unit"
+    )
+    return {
+        "fully_qualified_name": fqn,
+        "category": category,
+        "duration_ms": duration_to_milliseconds(
+            result.get("duration", "00:00:00.0000000")
+        ),
+        "outcome": result.get("outcome", ""),
+        "log_bytes": _output_byte_size(result),
+    }
 
 
 def parse_trx(
     xml_content: str,
-    integration_class_names: set[str] | None = None,
-    integration_method_fqns: set[str] | None = None,
+    category_index: dict[str, dict[str, set[str]]] | None = None,
 ) -> list[dict[str, object]]:
-    """Parse a TRX document into row dicts matching ``CSV_COLUMNS``."""
-    integration_classes = integration_class_names or set()
-    integration_methods = integration_method_fqns or set()
+    """Parse a TRX document into row dicts matching ``CSV_COLUMNS``.
+
+    Without a ``build_category_index`` result every test is marked Unit.
+    """
     root = ET.fromstring(xml_content)
-    class_by_id = _class_name_lookup(root)
-
-    rows: list[dict[str, object]] = []
-    for result in root.iter(f"{TRX_NS}UnitTestResult"):
-        test_id = result.get("testId")
-        method_name = result.get("testName", "")
-        class_name = class_by_id.get(test_id or "", "")
-        fqn = (
-            f"{class_name}.{method_name}".lstrip(".")
-            if method_name
-            else class_name
-        )
-        method_fqn = f"{class_name}.{_bare_method_name(method_name)}".lstrip(".")
-        category = (
-            "Integration"
-            if class_name in integration_classes
-            or method_fqn in integration_methods
-            else "Unit"
-        )
-        rows.append(
-            {
-                "fully_qualified_name": fqn,
-                "category": category,
-                "duration_ms": _duration_to_milliseconds(
-                    result.get("duration", "00:00:00.0000000")
-                ),
-                "outcome": result.get("outcome", ""),
-            }
-        )
-    return rows
+    class_by_id = class_name_lookup(root)
+    return [
+        _result_row(result, class_by_id, category_index)
+        for result in root.iter(f"{TRX_NS}UnitTestResult")
+    ]
+
+
+def _iter_released(source: BinaryIO | Path, tag: str) -> Iterator[ET.Element]:
+    """Yield each completed ``tag`` element, detaching finished elements as it goes.
+
+    Everything outside a ``tag`` subtree is dropped from the partially-built
+    tree once parsed, so memory stays flat no matter how many results the
+    document holds.
+    """
+    parents: list[ET.Element] = []
+    open_targets = 0
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            if element.tag == tag:
+                open_targets += 1
+            continue
+        parents.pop()
+        if element.tag == tag:
+            open_targets -= 1
+            yield element
+        if open_targets == 0 and parents:
+            parents[-1].remove(element)
+
+
+def iter_trx_file(
+    trx_path: Path,
+    category_index: dict[str, dict[str, set[str]]] | None = None,
+) -> Iterator[dict[str, object]]:
+    """Stream row dicts from a (``.trx`` or ``.trx.gz``) file without materialising it.
+
+    ``<TestDefinitions>`` follows ``<Results>`` in TRX, so the file is read
+    twice: once to collect the (small) test-id to class-name map, then again
+    to stream results. Rows match ``parse_trx`` for the same content.
+    """
+    class_by_id: dict[str, str] = {}
+    with open_binary(trx_path) as handle:
+        for unit_test in _iter_released(handle, f"{TRX_NS}UnitTest"):
+            test_id = unit_test.get("id")
+            method = unit_test.find(f"{TRX_NS}TestMethod")
+            if test_id and method is not None and method.get("className"):
+                class_by_id[test_id] = method.get("className")
+    with open_binary(trx_path) as handle:
+        for result in _iter_released(handle, f"{TRX_NS}UnitTestResult"):
+            yield _result_row(result, class_by_id, category_index)
+
+
+def _split_attributes(line: str) -> tuple[str, str]:
+    """A source line's leading ``[...]`` attribute lists, and the code after them.
+
+    ``[Category("Integration")] public class X`` declares ``X`` on the same
+    line as its attribute. A line opening an attribute list that closes on a
+    later line counts as attributes throughout.
+    """
+    end = 0
+    while (match := ATTRIBUTE_LIST_PATTERN.match(line, end)) is not None:
+        end = match.end()
+    if end == 0 and ATTRIBUTE_LINE_PATTERN.match(line):
+        return line, ""
+    return line[:end], line[end:]
+
+
+def _resolve_bases(
+    class_fqns: Iterable[str], base_names: dict[str, str]
+) -> dict[str, str]:
+    """Map each class to the ``namespace.class`` of its base, where the tree declares it.
+
+    ``base_names`` holds the base as written in the declaration; it is resolved
+    as a full name, then within the derived class's namespace, then by simple
+    name when exactly one class in the tree carries it.
+    """
+    known = set(class_fqns)
+    fqns_by_simple_name: dict[str, list[str]] = {}
+    for fqn in known:
+        fqns_by_simple_name.setdefault(fqn.rsplit(".", 1)[-1], []).append(fqn)
 
+    def resolve_base(class_fqn: str) -> str | None:
+        base = base_names.get(class_fqn)
+        if base is None:
+            return None
+        if base in known:
+            return base
+        same_namespace = f"{class_fqn.rsplit('.', 1)[0]}.{base}"
+        if same_namespace in known:
+            return same_namespace
+        candidates = fqns_by_simple_name.get(base.rsplit(".", 1)[-1], [])
+        return candidates[0] if len(candidates) == 1 else None
 
-def discover_integration_class_names(source_root: Path) -> set[str]:
-    """Scan a C# source tree for classes carrying class-level ``[Category("Integration")]``."""
-    names: set[str] = set()
+    return {
+        class_fqn: base
+        for class_fqn in known
+        if (base := resolve_base(class_fqn)) is not None
+    }
+
+
+def _base_chain(class_fqn: str, bases: dict[str, str]) -> Iterator[str]:
+    """``class_fqn`` followed by its resolved bases, nearest first, stopping on cycles."""
+    seen: set[str] = set()
+    cursor: str | None = class_fqn
+    while cursor is not None and cursor not in seen:
+        seen.add(cursor)
+        yield cursor
+        cursor = bases.get(cursor)
+
+
+def build_category_index(source_root: Path) -> dict[str, dict[str, set[str]]]:
+    """Index every NUnit ``[Category("...")]`` in a C# source tree in one pass.
+
+    Returns ``{"classes": {...}, "methods": {...}, "bases": {...}}``. Class
+    entries are keyed by ``namespace.class`` and include categories inherited
+    from base classes declared in the same tree (NUnit's ``CategoryAttribute``
+    is inherited). Method entries are keyed by bare ``namespace.class.method``
+    and hold only the method's own categories; ``bases`` maps each class to its
+    resolved base. Use ``categories_for`` to combine them for a test.
+    """
+    own_class_categories: dict[str, set[str]] = {}
+    base_names: dict[str, str] = {}
+    method_categories: dict[str, set[str]] = {}
     for cs_file in source_root.rglob("*.cs"):
         content = _read_cs_file(cs_file)
         if content is None:
@@ -111,19 +252,78 @@ def discover_integration_class_names(source_root: Path) -> set[str]:
         if not namespace_match:
             continue
         namespace = namespace_match.group(1)
-        for class_match in INTEGRATION_CATEGORY_AT_CLASS_PATTERN.finditer(content):
-            names.add(f"{namespace}.{class_match.group(1)}")
-    return names
 
+        current_class: str | None = None
+        pending: set[str] = set()
+        for line in content.splitlines():
+            attributes, line = _split_attributes(line)
+            pending.update(CATEGORY_ATTRIBUTE_PATTERN.findall(attributes))
+            class_match = CLASS_DECLARATION_PATTERN.match(line)
+            if class_match:
+                current_class = f"{namespace}.{class_match.group(1)}"
+                # Partial classes: every declaration adds to the class's set.
+                own_class_categories.setdefault(current_class, set()).update(pending)
+                base_match = CLASS_BASE_PATTERN.search(line)
+                if base_match:
+                    base_names[current_class] = base_match.group(1)
+                pending = set()
+                continue
+            if pending and current_class is not None:
+                method_match = METHOD_DECLARATION_PATTERN.match(line)
+                if method_match:
+                    method_categories.setdefault(
+                        f"{current_class}.{method_match.group(1)}", set()
+                    ).update(pending)
+                    pending = set()
+
+    bases = _resolve_bases(own_class_categories, base_names)
+    class_categories: dict[str, set[str]] = {}
+    for class_fqn in own_class_categories:
+        effective: set[str] = set()
+        for ancestor in _base_chain(class_fqn, bases):
+            effective |= own_class_categories[ancestor]
+        if effective:
+            class_categories[class_fqn] = effective
+    return {
+        "classes": class_categories,
+        "methods": method_categories,
+        "bases": bases,
+    }
 
-def discover_integration_method_fqns(source_root: Path) -> set[str]:
-    """Scan a C# source tree for methods carrying ``[Category("Integration")]``.
 
-    Returns the bare ``namespace.class.method`` FQNs — parametrized-test name
-    suffixes are excluded so callers can match TRX ``testName`` after stripping
-    the ``(...)`` argument tail.
+def categories_for(
+    fully_qualified_name: str, index: dict[str, dict[str, set[str]]]
+) -> set[str]:
+    """Categories applying to a TRX test name (class, inherited and method-level).
+
+    TRX reports inherited test methods under the derived class, so the
+    method's own categories are looked up along the base-class chain.
     """
-    fqns: set[str] = set()
+    method_fqn = bare_method_name(fully_qualified_name)
+    class_fqn, _, method_name = method_fqn.rpartition(".")
+    categories = set(index["classes"].get(class_fqn, set()))
+    for ancestor in _base_chain(class_fqn, index["bases"]):
+        own = index["methods"].get(f"{ancestor}.{method_name}")
+        if own is not None:
+            categories |= own
+            break
+    return categories
+
+
+def discover_test_timeouts(source_root: Path) -> dict[str, float]:
+    """Scan a C# source tree for ``[Timeout(ms)]`` / ``[CancelAfter(ms)]`` limits.
+
+    Returns limits in milliseconds keyed by ``namespace.class`` for
+    fixture-level attributes and by bare ``namespace.class.method`` for
+    test-level ones; a method's own limit takes precedence over its class's.
+    Like categories, limits are inherited along base classes declared in the
+    same tree: a derived fixture gets its nearest base's fixture limit, and
+    TRX names of inherited test methods (reported under the derived class)
+    get the base method's limit.
+    """
+    class_limits: dict[str, float] = {}
+    method_limits: dict[str, dict[str, float]] = {}
+    base_names: dict[str, str] = {}
     for cs_file in source_root.rglob("*.cs"):
         content = _read_cs_file(cs_file)
         if content is None:
@@ -134,24 +334,44 @@ def discover_integration_method_fqns(source_root: Path) -> set[str]:
         namespace = namespace_match.group(1)
 
         current_class: str | None = None
-        pending_integration = False
+        pending_limit: float | None = None
         for line in content.splitlines():
+            attributes, line = _split_attributes(line)
+            timeout_match = TIMEOUT_ATTRIBUTE_PATTERN.match(attributes)
+            if timeout_match:
+                pending_limit = float(timeout_match.group(1))
             class_match = CLASS_DECLARATION_PATTERN.match(line)
             if class_match:
-                current_class = class_match.group(1)
-                pending_integration = False
-                continue
-            if INTEGRATION_ATTRIBUTE_PATTERN.search(line):
-                pending_integration = True
+                current_class = f"{namespace}.{class_match.group(1)}"
+                method_limits.setdefault(current_class, {})
+                if pending_limit is not None:
+                    class_limits[current_class] = pending_limit
+                base_match = CLASS_BASE_PATTERN.search(line)
+                if base_match:
+                    base_names[current_class] = base_match.group(1)
+                pending_limit = None
                 continue
-            if pending_integration and current_class is not None:
+            if pending_limit is not None and current_class is not None:
                 method_match = METHOD_DECLARATION_PATTERN.match(line)
                 if method_match:
-                    fqns.add(
-                        f"{namespace}.{current_class}.{method_match.group(1)}"
-                    )
-                    pending_integration = False
-    return fqns
+                    method_limits[current_class][method_match.group(1)] = pending_limit
+                    pending_limit = None
+
+    bases = _resolve_bases(method_limits, base_names)
+    limits: dict[str, float] = {}
+    for class_fqn in method_limits:
+        chain = list(_base_chain(class_fqn, bases))
+        class_limit = next(
+            (class_limits[ancestor] for ancestor in chain if ancestor in class_limits),
+            None,
+        )
+        if class_limit is not None:
+            limits[class_fqn] = class_limit
+        # Nearest declaration wins, so walk from the furthest base inwards.
+        for ancestor in reversed(chain):
+            for method_name, limit in method_limits[ancestor].items():
+                limits[f"{class_fqn}.{method_name}"] = limit
+    return limits
 
 
 def _read_cs_file(path: Path) -> str | None:
@@ -161,31 +381,62 @@ def _read_cs_file(path: Path) -> str | None:
         return None
 
 
-def rows_to_csv(rows: Iterable[dict[str, object]], stream: TextIO) -> None:
-    ordered = sorted(rows, key=lambda r: r["duration_ms"], reverse=True)
+def rows_to_csv(
+    rows: Iterable[dict[str, object]],
+    stream: TextIO,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> None:
+    """Write rows slowest-first, holding at most ``chunk_rows`` rows in memory."""
     writer = csv.writer(stream, lineterminator="\n")
     writer.writerow(CSV_COLUMNS)
-    for row in ordered:
+    for row in sorted_by_duration(rows, chunk_rows=chunk_rows):
         writer.writerow(
             [
                 row["fully_qualified_name"],
                 row["category"],
                 f"{float(row['duration_ms']):.3f}",
                 row["outcome"],
+                int(row.get("log_bytes", 0)),
             ]
         )
 
 
+def rows_to_ndjson(
+    rows: Iterable[dict[str, object]],
+    stream: TextIO,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> None:
+    """Write rows slowest-first as one JSON object per line, keyed by ``CSV_COLUMNS``."""
+    for row in sorted_by_duration(rows, chunk_rows=chunk_rows):
+        record = {column: row.get(column, 0) for column in CSV_COLUMNS}
+        record["duration_ms"] = round(float(row["duration_ms"]), 3)
+        record["log_bytes"] = int(record["log_bytes"])
+        stream.write(json.dumps(record))
+        stream.write("\n")
+
+
+def write_rows(
+    rows: Iterable[dict[str, object]],
+    output: Path,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> None:
+    """Write rows to ``output`` as CSV or NDJSON, compressed per its suffix."""
+    writer = rows_to_ndjson if output_format(output) == "ndjson" else rows_to_csv
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open_text(output, "w", newline="") as stream:
+        writer(rows, stream, chunk_rows=chunk_rows)
+
+
 def _build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
-        description="Extract per-test timings from one or more TRX files into a CSV."
+        description="Extract per-test timings from one or more TRX files into a CSV or NDJSON file."
     )
     parser.add_argument(
         "--trx",
         type=Path,
         required=True,
         action="append",
-        help="Path to a .trx file (repeat the flag for multiple).",
+        help="Path to a .trx or .trx.gz file (repeat the flag for multiple).",
     )
     parser.add_argument(
         "--source-root",
@@ -198,33 +449,39 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         "--output",
         type=Path,
         required=True,
-        help="Destination CSV file.",
+        help="Destination file. The suffix picks the format and compression: "
+        ".csv or .ndjson, optionally followed by .gz or .zst.",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="Rows sorted in memory before spilling to a temp file "
+        f"(default {DEFAULT_CHUNK_ROWS}). Lower it to cap RAM on small runners.",
     )
     return parser
 
 
 def main(argv: list[str] | None = None) -> int:
     args = _build_arg_parser().parse_args(argv)
-    integration_classes: set[str] = set()
-    integration_methods: set[str] = set()
+    category_index = None
     if args.source_root is not None:
-        integration_classes = discover_integration_class_names(args.source_root)
-        integration_methods = discover_integration_method_fqns(args.source_root)
-    rows: list[dict[str, object]] = []
+        category_index = build_category_index(args.source_root)
+    trx_paths: list[Path] = []
     for trx_path in args.trx:
         if not trx_path.exists():
             print(f"warning: TRX not found at {trx_path}", file=sys.stderr)
             continue
-        rows.extend(
-            parse_trx(
-                trx_path.read_text(encoding="utf-8-sig"),
-                integration_class_names=integration_classes,
-                integration_method_fqns=integration_methods,
-            )
-        )
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    with args.output.open("w", encoding="utf-8", newline="") as stream:
-        rows_to_csv(rows, stream)
+        trx_paths.append(trx_path)
+    rows = itertools.chain.from_iterable(
+        iter_trx_file(trx_path, category_index=category_index)
+        for trx_path in trx_paths
+    )
+    try:
+        write_rows(rows, args.output, chunk_rows=args.chunk_rows)
+    except RuntimeError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
     return 0
 
 
@@ -7,7 +7,10 @@ import csv
 import json
 import sys
 from pathlib import Path
-from typing import Iterable, TextIO
+from typing import Iterable, Iterator, TextIO
+
+from external_sort import DEFAULT_CHUNK_ROWS, sorted_by_duration
+from timing_io import open_text, output_format
 
 CSV_COLUMNS = ("file", "test_name", "duration_ms", "outcome")
 _OUTCOME_MAP = {
@@ -29,35 +32,41 @@ def _normalise_file(path: str, source_root: str | None) -> str:
     return path
 
 
-def parse_vitest(
-    json_content: str, source_root: str | None = None
-) -> list[dict[str, object]]:
-    """Parse a Vitest JSON reporter document into row dicts."""
-    payload = json.loads(json_content)
-    rows: list[dict[str, object]] = []
+def iter_vitest(
+    payload: dict[str, object], source_root: str | None = None
+) -> Iterator[dict[str, object]]:
+    """Yield row dicts from an already-decoded Vitest JSON reporter document."""
     for file_result in payload.get("testResults", []):
         file_path = _normalise_file(file_result.get("name", ""), source_root)
         for assertion in file_result.get("assertionResults", []):
             duration = assertion.get("duration")
-            rows.append(
-                {
-                    "file": file_path,
-                    "test_name": assertion.get("fullName")
-                    or assertion.get("title", ""),
-                    "duration_ms": float(duration) if duration else 0.0,
-                    "outcome": _OUTCOME_MAP.get(
-                        assertion.get("status", "").lower(), "Unknown"
-                    ),
-                }
-            )
-    return rows
-
-
-def rows_to_csv(rows: Iterable[dict[str, object]], stream: TextIO) -> None:
-    ordered = sorted(rows, key=lambda r: r["duration_ms"], reverse=True)
+            yield {
+                "file": file_path,
+                "test_name": assertion.get("fullName")
+                or assertion.get("title", ""),
+                "duration_ms": float(duration) if duration else 0.0,
+                "outcome": _OUTCOME_MAP.get(
+                    assertion.get("status", "").lower(), "Unknown"
+                ),
+            }
+
+
+def parse_vitest(
+    json_content: str, source_root: str | None = None
+) -> list[dict[str, object]]:
+    """Parse a Vitest JSON reporter document into row dicts."""
+    return list(iter_vitest(json.loads(json_content), source_root=source_root))
+
+
+def rows_to_csv(
+    rows: Iterable[dict[str, object]],
+    stream: TextIO,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> None:
+    """Write rows slowest-first, holding at most ``chunk_rows`` rows in memory."""
     writer = csv.writer(stream, lineterminator="\n")
     writer.writerow(CSV_COLUMNS)
-    for row in ordered:
+    for row in sorted_by_duration(rows, chunk_rows=chunk_rows):
         writer.writerow(
             [
                 row["file"],
@@ -68,15 +77,41 @@ def rows_to_csv(rows: Iterable[dict[str, object]], stream: TextIO) -> None:
         )
 
 
+def rows_to_ndjson(
+    rows: Iterable[dict[str, object]],
+    stream: TextIO,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> None:
+    """Write rows slowest-first as one JSON object per line, keyed by ``CSV_COLUMNS``."""
+    for row in sorted_by_duration(rows, chunk_rows=chunk_rows):
+        record = {column: row[column] for column in CSV_COLUMNS}
+        record["duration_ms"] = round(float(row["duration_ms"]), 3)
+        stream.write(json.dumps(record))
+        stream.write("\n")
+
+
+def write_rows(
+    rows: Iterable[dict[str, object]],
+    output: Path,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> None:
+    """Write rows to ``output`` as CSV or NDJSON, compressed per its suffix."""
+    writer = rows_to_ndjson if output_format(output) == "ndjson" else rows_to_csv
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open_text(output, "w", newline="") as stream:
+        writer(rows, stream, chunk_rows=chunk_rows)
+
+
 def _build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
-        description="Extract per-test timings from a Vitest JSON reporter file into a CSV."
+        description="Extract per-test timings from a Vitest JSON reporter file into a CSV or NDJSON file."
     )
     parser.add_argument(
         "--input",
         type=Path,
         required=True,
-        help="Vitest JSON reporter file (--reporter=json --outputFile.json=...).",
+        help="Vitest JSON reporter file (--reporter=json --outputFile.json=...), "
+        "optionally .gz/.zst-compressed.",
     )
     parser.add_argument(
         "--source-root",
@@ -88,7 +123,15 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         "--output",
         type=Path,
         required=True,
-        help="Destination CSV file.",
+        help="Destination file. The suffix picks the format and compression: "
+        ".csv or .ndjson, optionally followed by .gz or .zst.",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="Rows sorted in memory before spilling to a temp file "
+        f"(default {DEFAULT_CHUNK_ROWS}). Lower it to cap RAM on small runners.",
     )
     return parser
 
@@ -98,12 +141,17 @@ def main(argv: list[str] | None = None) -> int:
     if not args.input.exists():
         print(f"error: Vitest JSON not found at {args.input}", file=sys.stderr)
         return 1
-    rows = parse_vitest(
-        args.input.read_text(encoding="utf-8"), source_root=args.source_root
-    )
-    args.output.parent.mkdir(parents=True, exist_ok=True)
-    with args.output.open("w", encoding="utf-8", newline="") as stream:
-        rows_to_csv(rows, stream)
+    try:
+        with open_text(args.input) as handle:
+            payload = json.load(handle)
+        write_rows(
+            iter_vitest(payload, source_root=args.source_root),
+            args.output,
+            chunk_rows=args.chunk_rows,
+        )
+    except RuntimeError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
     return 0
 
 